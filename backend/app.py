@@ -3,12 +3,45 @@ Flask backend API for Breast Cancer ML Explainability Demo
 """
 
 import os
+import gzip
+import hmac
+import json
+import hashlib
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import joblib
 import numpy as np
-from flask import Flask, request, jsonify
+from flask import Flask, g, has_app_context, request, jsonify, stream_with_context
 from flask_cors import CORS
 from sklearn.datasets import load_breast_cancer
 
+import artifacts
+import columnar
+import explain
+from batching import MicroBatcher
+import inference
+import metrics
+import streaming
+from profiling import ProfileStore, StackProfiler
+from registry import ModelRegistry
+from features import (
+    COLUMN_RENAME_MAP,
+    FEATURE_LABELS,
+    FeatureSchema,
+    build_feature_lookup,
+    feature_aliases,
+    lookup_feature,
+)
+from prediction_cache import PredictionCache, prediction_key
+
+try:
+    import brotli
+except ImportError:  # optional: only used to pre-compress /api/dataset
+    brotli = None
+
 app = Flask(__name__)
 
 CORS(
@@ -18,31 +51,170 @@ CORS(
             "origins": [
                 "https://medical-dataset-ml-analysis.vercel.app",
                 "http://localhost:3000",
-            ]
+            ],
+            "expose_headers": ["X-Unknown-Features", "X-Columns", "X-Rows", "X-Profile-Id",
+                               "X-Model-Version"],
         }
     },
 )
 
+INFERENCE_ENGINE = os.environ.get("INFERENCE_ENGINE", "numpy")
+PRELOAD_MODELS = os.environ.get("PRELOAD_MODELS", "0") == "1"
+MODEL_MEMORY_BUDGET_BYTES = (
+    int(float(os.environ["MODEL_MEMORY_BUDGET_MB"]) * 1024 * 1024)
+    if os.environ.get("MODEL_MEMORY_BUDGET_MB")
+    else None
+)
+MAX_BATCH_ROWS = int(os.environ.get("MAX_BATCH_ROWS", 10000))
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", 1000))
+DEFAULT_DECISION_THRESHOLD = 0.5
+PREDICT_ALL_MODE = os.environ.get("PREDICT_ALL_MODE", "serial")
+PREDICT_ALL_TIMEOUT = float(os.environ.get("PREDICT_ALL_TIMEOUT", 2.0))
+SCORING_THREADS = int(os.environ.get("SCORING_THREADS", min(8, os.cpu_count() or 1)))
+MICRO_BATCH_WINDOW_MS = float(os.environ.get("MICRO_BATCH_WINDOW_MS", 0))
+MICRO_BATCH_MAX_ROWS = int(os.environ.get("MICRO_BATCH_MAX_ROWS", 64))
+MICRO_BATCH_TIMEOUT = float(os.environ.get("MICRO_BATCH_TIMEOUT", 10))
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 4096))
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", 3600))
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+ATTRIBUTIONS_ENABLED = os.environ.get("ATTRIBUTIONS", "1") != "0"
+# Profiling is off unless a sample rate is set or the X-Profile header is allowed.
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_HEADER_ENABLED = os.environ.get("PROFILE_HEADER", "0") == "1"
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+)
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 100))
+MODELS_DIR = os.environ.get(
+    "MODELS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+)
+# Seconds between checks of CURRENT for a newly published version (0 disables).
+MODEL_RELOAD_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", 5))
+# POST /api/admin/reload is disabled unless a token is configured.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+
+def parse_decision_thresholds(raw):
+    """Parse "model=threshold,..." into a dict of per-model cut-offs."""
+    thresholds = {}
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        model_name, _, value = item.partition("=")
+        thresholds[model_name.strip()] = float(value)
+    return thresholds
+
+
+DECISION_THRESHOLDS = parse_decision_thresholds(
+    os.environ.get("DECISION_THRESHOLDS", "")
+)
+
+# Every series carries the worker's pid: under gunicorn each scrape reaches
+# one worker, and its counters are not comparable with another worker's.
+metrics_registry = metrics.MetricsRegistry(enabled=METRICS_ENABLED, process_label="pid")
+http_requests_total = metrics_registry.counter(
+    "http_requests_total",
+    "HTTP requests by endpoint, method and status.",
+    ("endpoint", "method", "status"),
+)
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "Time until the view returns its response; excludes generating streamed bodies.",
+    ("endpoint",),
+)
+http_request_size = metrics_registry.histogram(
+    "http_request_size_bytes", "Request body sizes.", ("endpoint",), metrics.SIZE_BUCKETS
+)
+http_response_size = metrics_registry.histogram(
+    "http_response_size_bytes",
+    "Response body sizes (not recorded for streamed responses).",
+    ("endpoint",),
+    metrics.SIZE_BUCKETS,
+)
+model_inference_duration = metrics_registry.histogram(
+    "model_inference_seconds",
+    "Inference time per model by stage: assemble, predict_proba, serialize.",
+    ("model", "stage"),
+)
+model_rows_scored = metrics_registry.counter(
+    "model_rows_scored_total", "Rows passed to predict_proba.", ("model",)
+)
+model_reloads_total = metrics_registry.counter(
+    "model_reloads_total", "Model version reloads by result.", ("result",)
+)
+models_load_seconds = None
+
+# Everything served from one artifact version. Requests pin the set that was
+# live when they started (see served()), so a reload never mixes versions.
+ModelSet = namedtuple(
+    "ModelSet",
+    "models metadata feature_stats top_features feature_importance_cache explainers version",
+)
+
 models = None
 metadata = None
 feature_stats = None
 top_features = None
+feature_importance_cache = None
+explainers = {}
+model_version_id = None
+model_set_lock = threading.Lock()
+reload_lock = threading.Lock()
+reload_watcher = None
+
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+attribution_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+
+feature_schema = None
+
+micro_batcher = None
+
+scoring_pool = None
+scoring_pool_lock = threading.Lock()
+
+dataset_cache = None
+dataset_cache_lock = threading.Lock()
+DATASET_CACHE_MAX_AGE = int(os.environ.get("DATASET_CACHE_MAX_AGE", 3600))
+
+
+def load_model(models_dir, model_name):
+    """Load one model for serving with the configured inference engine.
+
+    The numpy engine memory-maps the compiled ``<name>.bundle`` export when
+    present and otherwise compiles the pickled pipeline on the fly.
+    """
+    pickle_path = os.path.join(models_dir, f"{model_name}.pkl")
+    if INFERENCE_ENGINE == "sklearn":
+        return joblib.load(pickle_path, mmap_mode="r")
 
+    compiled_path = os.path.join(models_dir, model_name + inference.COMPILED_SUFFIX)
+    if os.path.exists(compiled_path):
+        return inference.load_compiled(compiled_path)
+    return inference.CompiledModel(inference.export_pipeline(joblib.load(pickle_path)))
 
-def load_models():
-    """Load trained models and metadata from backend/models."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    models_dir = os.path.join(current_dir, "models")
 
+def load_models(models_dir=MODELS_DIR, version=None):
+    """Load one artifact version into a ModelSet without serving it.
+
+    ``version`` defaults to the one named by CURRENT; a directory without
+    published versions is loaded as it is. Published versions are checked
+    against their manifest first.
+    """
     print(f"Looking for models in: {models_dir}")
 
     if not os.path.exists(models_dir):
         raise FileNotFoundError(f"Models directory not found: {models_dir}")
 
+    if version is None:
+        version, models_dir = artifacts.resolve(models_dir)
+    else:
+        models_dir = artifacts.version_path(models_dir, version)
+        if not os.path.isdir(models_dir):
+            raise FileNotFoundError(f"Model version not found: {version}")
+    if artifacts.read_manifest(models_dir) is not None:
+        artifacts.verify(models_dir)
+
     required_files = [
-        "logistic_regression.pkl",
-        "random_forest.pkl",
-        "gradient_boosting.pkl",
         "metadata.pkl",
         "feature_stats.pkl",
     ]
@@ -55,51 +227,146 @@ def load_models():
     if missing_files:
         raise FileNotFoundError(f"Missing model files: {', '.join(missing_files)}")
 
-    loaded_models = {
-        "logistic_regression": joblib.load(
-            os.path.join(models_dir, "logistic_regression.pkl")
-        ),
-        "random_forest": joblib.load(
-            os.path.join(models_dir, "random_forest.pkl")
-        ),
-        "gradient_boosting": joblib.load(
-            os.path.join(models_dir, "gradient_boosting.pkl")
-        ),
-    }
-
     loaded_metadata = joblib.load(os.path.join(models_dir, "metadata.pkl"))
     loaded_feature_stats = joblib.load(os.path.join(models_dir, "feature_stats.pkl"))
     loaded_top_features = loaded_metadata.get("top_features", [])
+    loaded_importance_cache = {}
+    loaded_explainers = {}
+    all_features = loaded_metadata.get("feature_names", [])
+
+    def on_model_load(model_name, model):
+        loaded_importance_cache.update(
+            build_feature_importance_cache({model_name: model}, all_features)
+        )
+
+    def on_model_evict(model_name):
+        # Attribution tables are rebuilt (and counted again) on the next load.
+        loaded_explainers.pop(model_name, None)
 
-    return loaded_models, loaded_metadata, loaded_feature_stats, loaded_top_features
+    loaded_models = ModelRegistry(
+        models_dir,
+        load_model,
+        memory_budget_bytes=MODEL_MEMORY_BUDGET_BYTES,
+        on_load=on_model_load,
+        on_evict=on_model_evict,
+    )
+    if not loaded_models:
+        raise FileNotFoundError(f"No model artifacts found in {models_dir}")
+    if PRELOAD_MODELS:
+        loaded_models.warm_up()
+
+    return ModelSet(
+        loaded_models,
+        loaded_metadata,
+        loaded_feature_stats,
+        loaded_top_features,
+        loaded_importance_cache,
+        loaded_explainers,
+        version,
+    )
+
+
+def served():
+    """Return the ModelSet pinned to the current request.
+
+    Outside a request (or a task running for one, see call_pinned) this is
+    the live set.
+    """
+    if has_app_context():
+        pinned = g.get("model_set")
+        if pinned is not None:
+            return pinned
+    with model_set_lock:
+        return ModelSet(
+            models,
+            metadata,
+            feature_stats,
+            top_features,
+            feature_importance_cache,
+            explainers,
+            model_version_id,
+        )
+
+
+def call_pinned(model_set, function, *args):
+    """Run function (e.g. on a pool thread) against a given ModelSet."""
+    with app.app_context():
+        g.model_set = model_set
+        return function(*args)
+
+
+def activate(model_set):
+    """Serve model_set to new requests; running ones keep the set they pinned."""
+    global models, metadata, feature_stats, top_features, feature_importance_cache
+    global explainers, model_version_id
+
+    with model_set_lock:
+        (
+            models,
+            metadata,
+            feature_stats,
+            top_features,
+            feature_importance_cache,
+            explainers,
+            model_version_id,
+        ) = model_set
+
+
+def get_feature_schema():
+    """Return the FeatureSchema for the loaded metadata and stats.
+
+    Built once after loading and rebuilt only if metadata or feature_stats are
+    replaced.
+    """
+    global feature_schema
+
+    model_set = served()
+    cached = feature_schema
+    if (
+        cached is None
+        or cached[0] is not model_set.metadata
+        or cached[1] is not model_set.feature_stats
+    ):
+        schema = FeatureSchema(
+            model_set.metadata.get("feature_names", []),
+            model_set.feature_stats,
+            aliases=feature_aliases(model_set.metadata.get("feature_labels")),
+        )
+        cached = feature_schema = (model_set.metadata, model_set.feature_stats, schema)
+    return cached[2]
+
+
+def unknown_features(features):
+    """Return request keys that match no known feature spelling."""
+    return get_feature_schema().unknown_features(features)
 
 
 def build_input_array(feature_values):
     """Build model input in the exact training feature order."""
-    all_features = metadata.get("feature_names", [])
-    if not all_features:
-        raise ValueError("Metadata is missing feature_names")
-
-    missing_stats = [
-        feature
-        for feature in all_features
-        if feature not in feature_stats or "mean" not in feature_stats[feature]
-    ]
-    if missing_stats:
-        raise ValueError(
-            f"Feature stats missing for features: {', '.join(missing_stats)}"
-        )
+    schema = get_feature_schema()
+    return schema.build_row(feature_values), schema.feature_names
 
-    input_values = []
-    for feature in all_features:
-        raw_value = feature_values.get(feature, feature_stats[feature]["mean"])
-        input_values.append(float(raw_value))
 
-    return np.array(input_values, dtype=float).reshape(1, -1), all_features
+def build_input_matrix(rows=None, columns=None):
+    """Build an N x n_features model input from row dicts or a columnar payload.
+
+    ``rows`` is a list of feature dicts (one per case); ``columns`` maps feature
+    names to equal-length value lists. Missing features fall back to the mean.
+    """
+    schema = get_feature_schema()
+    if columns is not None:
+        return schema.build_columns(columns), schema.feature_names
+    return schema.build_rows(rows), schema.feature_names
 
 
 def build_feature_importance(model_name, model, all_features):
     """Return feature importance/coefficient map for the selected model."""
+    if isinstance(model, inference.CompiledModel):
+        return {
+            feature: float(model.feature_importance[i])
+            for i, feature in enumerate(all_features)
+        }
+
     if model_name == "logistic_regression":
         coef = model.named_steps["classifier"].coef_[0]
         return {feature: float(coef[i]) for i, feature in enumerate(all_features)}
@@ -111,29 +378,617 @@ def build_feature_importance(model_name, model, all_features):
     return None
 
 
+def build_feature_importance_cache(loaded_models, all_features):
+    """Precompute each model's importance map and its serialized JSON fragment.
+
+    Importances never change for a loaded model, so responses splice in the
+    cached fragment instead of re-walking coef_/feature_importances_.
+    """
+    cache = {}
+    for model_name, model in loaded_models.items():
+        values = build_feature_importance(model_name, model, all_features)
+        cache[model_name] = {
+            "values": values,
+            "json": json.dumps(values, separators=(",", ":")),
+        }
+    return cache
+
+
+def get_feature_importance_json(model_name, model):
+    """Return the model's cached importance JSON, building it if not cached yet."""
+    model_set = served()
+    cached = model_set.feature_importance_cache.get(model_name)
+    if cached is None:
+        model_set.feature_importance_cache.update(
+            build_feature_importance_cache(
+                {model_name: model}, model_set.metadata.get("feature_names", [])
+            )
+        )
+        cached = model_set.feature_importance_cache[model_name]
+    return cached["json"]
+
+
+def get_explainer(model_name, model):
+    """Return the per-prediction explainer for a model, or None if unsupported.
+
+    Built from the exported arrays once per load of the model: its tables are
+    counted against the registry's memory budget and dropped when the
+    registry evicts the model.
+    """
+    model_set = served()
+    explainers = model_set.explainers
+    try:
+        return explainers[model_name]
+    except KeyError:
+        pass
+
+    try:
+        arrays = (
+            model.arrays
+            if isinstance(model, inference.CompiledModel)
+            else inference.export_pipeline(model)
+        )
+        explainer = explain.build_explainer(arrays)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        print(f"⚠️ No attributions for {model_name}: {e}")
+        explainer = None
+    explainers[model_name] = explainer
+    if explainer is not None and isinstance(model_set.models, ModelRegistry):
+        if not model_set.models.attach(model_name, explainer.nbytes):
+            # Evicted while the tables were built: serve them once, keep nothing.
+            explainers.pop(model_name, None)
+    return explainer
+
+
+def render_attributions(explainer, contributions):
+    """Serialize one row's attributions as a JSON fragment."""
+    values = dict(zip(served().metadata.get("feature_names", []), contributions.tolist()))
+    return json.dumps(
+        {"output": explainer.output, "base_value": explainer.base_value, "values": values},
+        separators=(",", ":"),
+    )
+
+
+def explain_row(model_name, model, input_array):
+    """Return one row's serialized attributions, cached per input like predictions."""
+    key = cache_key(model_name, input_array)
+    cached = attribution_cache.get(key)
+    if cached is not None:
+        return cached
+
+    explainer = get_explainer(model_name, model)
+    if explainer is None:
+        return None
+    start = time.perf_counter()
+    fragment = render_attributions(explainer, explainer.explain(input_array)[0])
+    observe_stage(model_name, "attributions", start)
+    attribution_cache.put(key, fragment)
+    return fragment
+
+
+def render_prediction(
+    model_name,
+    model,
+    prediction_value,
+    probabilities,
+    timing_ms=None,
+    unknown=None,
+    attributions=None,
+):
+    """Serialize one prediction as JSON with the cached importance fragment."""
+    start = time.perf_counter()
+    extra = ""
+    if attributions is not None:
+        extra += f',"attributions":{attributions}'
+    if timing_ms is not None:
+        extra += f',"timing_ms":{round(timing_ms, 3)!r}'
+    if unknown:
+        extra += f',"unknown_features":{json.dumps(unknown)}'
+    body = (
+        f'{{"prediction":{int(prediction_value)},'
+        f'"probabilities":{{"benign":{float(probabilities[0])!r},'
+        f'"malignant":{float(probabilities[1])!r}}},'
+        f'"feature_importance":{get_feature_importance_json(model_name, model)}'
+        f"{extra}}}"
+    )
+    observe_stage(model_name, "serialize", start)
+    return body
+
+
+def observe_stage(model_name, stage, start):
+    """Record the time since start for one model inference stage."""
+    model_inference_duration.observe(time.perf_counter() - start, (model_name, stage))
+
+
+def json_response(body, unknown=None):
+    """Wrap an already-serialized JSON body in a response.
+
+    Unknown request feature keys are reported in an X-Unknown-Features header.
+    """
+    response = app.response_class(body, mimetype="application/json")
+    if unknown:
+        response.headers["X-Unknown-Features"] = json.dumps(unknown)
+    return response
+
+
+def score_matrix(model_name, model, input_matrix):
+    """Score rows with a single predict_proba pass.
+
+    The class label is derived from the malignant probability instead of a
+    second ``model.predict`` call, so tree ensembles are only walked once. A row
+    is labelled malignant when its probability is strictly greater than the
+    model's decision threshold, which matches sklearn's argmax at 0.5.
+    """
+    start = time.perf_counter()
+    probabilities = model.predict_proba(input_matrix)
+    observe_stage(model_name, "predict_proba", start)
+    model_rows_scored.inc((model_name,), len(input_matrix))
+    threshold = DECISION_THRESHOLDS.get(model_name, DEFAULT_DECISION_THRESHOLD)
+    predictions = (probabilities[:, 1] > threshold).astype(int)
+    return predictions, probabilities
+
+
+def cache_key(model_name, input_array):
+    """Key one row's cached prediction or attributions on the served version.
+
+    The version is the content hash of the pinned artifact set, so republishing
+    identical artifacts keeps cached entries valid and any change drops them.
+    """
+    return prediction_key(model_name, served().version, input_array)
+
+
+def score_row(model_name, model, input_array):
+    """Score one assembled row, serving repeated inputs from the prediction cache.
+
+    Returns (prediction, probabilities) for the row; cache hits never touch
+    the model.
+    """
+    key = cache_key(model_name, input_array)
+    cached = prediction_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if micro_batcher is not None:
+        result = micro_batcher.score(model_name, model, input_array)
+    else:
+        predictions, probabilities = score_matrix(model_name, model, input_array)
+        result = (int(predictions[0]), (float(probabilities[0, 0]), float(probabilities[0, 1])))
+    prediction_cache.put(key, result)
+    return result
+
+
+def submit_row(model_name, model, input_array):
+    """Queue one row on the micro-batcher without waiting for it.
+
+    Returns a Future of (prediction, probabilities): already resolved on a
+    prediction cache hit, otherwise resolved (and cached) when its batch is
+    scored.
+    """
+    key = cache_key(model_name, input_array)
+    cached = prediction_cache.get(key)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        return future
+
+    def cache_result(scored):
+        if not scored.cancelled() and scored.exception() is None:
+            prediction_cache.put(key, scored.result())
+
+    future = micro_batcher.submit(model_name, model, input_array)
+    future.add_done_callback(cache_result)
+    return future
+
+
+def enable_micro_batching(window_ms=2.0, max_rows=64, timeout_seconds=MICRO_BATCH_TIMEOUT):
+    """Route single-row scoring through a shared MicroBatcher.
+
+    Concurrent /api/predict and /api/predict-all requests arriving within
+    window_ms (or until max_rows are queued) are scored in one call per model.
+    A request waits at most timeout_seconds for its batch.
+    """
+    global micro_batcher
+
+    if micro_batcher is None:
+        micro_batcher = MicroBatcher(
+            score_matrix, max_rows=max_rows, window_ms=window_ms, timeout_seconds=timeout_seconds
+        )
+    return micro_batcher
+
+
+def get_scoring_pool():
+    """Return the shared thread pool used to fan out multi-model scoring."""
+    global scoring_pool
+
+    if scoring_pool is None:
+        with scoring_pool_lock:
+            if scoring_pool is None:
+                scoring_pool = ThreadPoolExecutor(
+                    max_workers=SCORING_THREADS, thread_name_prefix="scoring"
+                )
+    return scoring_pool
+
+
+def render_timed_prediction(model_name, input_array):
+    """Score and serialize one model's prediction, timing the whole step."""
+    start = time.perf_counter()
+    model = served().models[model_name]
+    prediction_value, probabilities = score_row(model_name, model, input_array)
+    attributions = explain_row(model_name, model, input_array) if ATTRIBUTIONS_ENABLED else None
+    timing_ms = (time.perf_counter() - start) * 1000
+    return render_prediction(
+        model_name, model, prediction_value, probabilities, timing_ms, attributions=attributions
+    )
+
+
+def render_timeout(start):
+    """Serialize the entry for a model that missed PREDICT_ALL_TIMEOUT."""
+    waited_ms = (time.perf_counter() - start) * 1000
+    return json.dumps(
+        {
+            "error": f"Timed out after {PREDICT_ALL_TIMEOUT:g}s",
+            "timed_out": True,
+            "timing_ms": round(waited_ms, 3),
+        }
+    )
+
+
+def predict_all_parallel(input_array):
+    """Score every model on the shared pool, returning partial results on timeout.
+
+    Models still running after PREDICT_ALL_TIMEOUT seconds are reported with
+    an error entry instead of holding up the response.
+    """
+    pool = get_scoring_pool()
+    model_set = served()
+    start = time.perf_counter()
+    futures = {
+        model_name: pool.submit(
+            call_pinned, model_set, render_timed_prediction, model_name, input_array
+        )
+        for model_name in model_set.models.keys()
+    }
+    wait(futures.values(), timeout=PREDICT_ALL_TIMEOUT)
+
+    results = {}
+    for model_name, future in futures.items():
+        if future.done():
+            results[model_name] = future.result()
+        else:
+            future.cancel()
+            results[model_name] = render_timeout(start)
+    return results
+
+
+def predict_all_batched(input_array):
+    """Queue every model's row on the micro-batcher at once and wait on them.
+
+    All models share one batching window and no pool thread is held while
+    the batch fills. Timeouts are reported as in predict_all_parallel.
+    """
+    model_set = served()
+    start = time.perf_counter()
+    pinned_models = {
+        model_name: model_set.models[model_name] for model_name in model_set.models.keys()
+    }
+    futures = {
+        model_name: submit_row(model_name, model, input_array)
+        for model_name, model in pinned_models.items()
+    }
+    wait(futures.values(), timeout=PREDICT_ALL_TIMEOUT)
+
+    results = {}
+    for model_name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            results[model_name] = render_timeout(start)
+            continue
+        model = pinned_models[model_name]
+        prediction_value, probabilities = future.result()
+        attributions = (
+            explain_row(model_name, model, input_array) if ATTRIBUTIONS_ENABLED else None
+        )
+        timing_ms = (time.perf_counter() - start) * 1000
+        results[model_name] = render_prediction(
+            model_name, model, prediction_value, probabilities, timing_ms,
+            attributions=attributions,
+        )
+    return results
+
+
+def build_explainers():
+    """Build the pinned set's TreeSHAP tables for every model."""
+    pinned_models = served().models
+    for model_name in pinned_models.keys():
+        get_explainer(model_name, pinned_models[model_name])
+
+
+def prepare_model_set(model_set):
+    """Load every model of a set and build its attribution tables and schema,
+    so its first requests pay no cold-start cost."""
+    model_set.models.warm_up()
+    if ATTRIBUTIONS_ENABLED:
+        call_pinned(model_set, build_explainers)
+    call_pinned(model_set, get_feature_schema)
+
+
+def reload_models(version=None):
+    """Load a model version next to the served one and swap it in.
+
+    ``version`` defaults to the one named by CURRENT; naming one also points
+    CURRENT at it (e.g. to roll back). Returns (version, previous version,
+    load seconds). Raises RuntimeError while another reload is running; load
+    and verification errors propagate and the served set is left in place.
+    """
+    global models_load_seconds
+
+    if not reload_lock.acquire(blocking=False):
+        raise RuntimeError("A model reload is already in progress")
+    try:
+        load_started = time.perf_counter()
+        try:
+            model_set = load_models(MODELS_DIR, version)
+            prepare_model_set(model_set)
+        except Exception:
+            model_reloads_total.inc(("error",))
+            raise
+        if version is not None:
+            artifacts.write_current(MODELS_DIR, version)
+        previous = model_version_id
+        activate(model_set)
+        models_load_seconds = time.perf_counter() - load_started
+        model_reloads_total.inc(("success",))
+        print(f"✅ Serving model version {model_set.version} (was {previous})")
+        return model_set.version, previous, models_load_seconds
+    finally:
+        reload_lock.release()
+
+
+def check_for_new_version(failed=None):
+    """Reload if CURRENT names a version other than the served one (and not
+    ``failed``). Returns the version that failed to load, if any."""
+    version = artifacts.current_version(MODELS_DIR)
+    if version is None or version in (model_version_id, failed):
+        return failed
+    try:
+        reload_models()
+    except RuntimeError:
+        pass  # an admin reload is already loading it
+    except Exception as e:
+        print(f"❌ Error loading model version {version}: {e}")
+        return version
+    return None
+
+
+def watch_model_versions(interval):
+    """Poll CURRENT forever; a version that fails to load is not retried
+    until CURRENT changes again."""
+    failed = None
+    while True:
+        time.sleep(interval)
+        failed = check_for_new_version(failed)
+
+
+def start_reload_watcher(interval=MODEL_RELOAD_INTERVAL):
+    """Start the per-process thread that picks up newly published versions."""
+    global reload_watcher
+
+    if interval > 0 and (reload_watcher is None or not reload_watcher.is_alive()):
+        reload_watcher = threading.Thread(
+            target=watch_model_versions, args=(interval,), name="model-reload", daemon=True
+        )
+        reload_watcher.start()
+    return reload_watcher
+
+
 try:
-    models, metadata, feature_stats, top_features = load_models()
-    print("✅ Models loaded successfully!")
+    load_started = time.perf_counter()
+    initial_model_set = load_models()
+    if PRELOAD_MODELS:
+        # Build the TreeSHAP tables up front (and, under gunicorn, pre-fork).
+        prepare_model_set(initial_model_set)
+    activate(initial_model_set)
+    models_load_seconds = time.perf_counter() - load_started
+    get_feature_schema()
+    if MICRO_BATCH_WINDOW_MS > 0:
+        enable_micro_batching(MICRO_BATCH_WINDOW_MS, MICRO_BATCH_MAX_ROWS)
+    print(f"✅ Models loaded successfully! (version {model_version_id})")
 except Exception as e:
     print(f"❌ Error loading models: {e}")
     models = None
     metadata = None
     feature_stats = None
     top_features = None
+    feature_importance_cache = None
+start_reload_watcher()
+
+
+@app.before_request
+def pin_model_set():
+    g.model_set = served()
+
+
+@app.after_request
+def add_model_version_header(response):
+    model_set = g.get("model_set")
+    if model_set is not None and model_set.version is not None:
+        response.headers["X-Model-Version"] = model_set.version
+    return response
+
+
+@app.before_request
+def start_request_timer():
+    if metrics_registry.enabled:
+        g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop("request_started", None)
+    if started is None:
+        return response
+
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    http_request_duration.observe(time.perf_counter() - started, (endpoint,))
+    http_requests_total.inc((endpoint, request.method, str(response.status_code)))
+    if request.content_length:
+        http_request_size.observe(request.content_length, (endpoint,))
+    if not response.is_streamed:
+        http_response_size.observe(response.content_length or 0, (endpoint,))
+    return response
+
+
+def collect_state_metrics():
+    """Scrape-time gauges read from the registry, caches and batcher."""
+    families = [
+        ("models_load_seconds", "gauge", "Duration of load_models() at startup.",
+         [({}, models_load_seconds)]),
+    ]
+
+    if isinstance(models, ModelRegistry):
+        status = models.status()
+        per_model = status["models"].items()
+        families += [
+            ("model_loaded", "gauge", "1 if the model is warm in memory.",
+             [({"model": name}, int(m["state"] == "warm")) for name, m in per_model]),
+            ("model_load_seconds", "gauge", "Duration of the model's last load.",
+             [({"model": name}, m["load_ms"] and m["load_ms"] / 1000) for name, m in per_model]),
+            ("model_size_bytes", "gauge", "Memory attributed to each loaded model.",
+             [({"model": name}, m["size_bytes"]) for name, m in per_model]),
+            ("model_loads_total", "counter", "Model loads, including reloads after eviction.",
+             [({}, status["loads"])]),
+            ("model_evictions_total", "counter", "Models evicted by the memory budget.",
+             [({}, status["evictions"])]),
+        ]
+
+    cache = prediction_cache.stats()
+    families += [
+        ("prediction_cache_hits_total", "counter", "Prediction cache hits.", [({}, cache["hits"])]),
+        ("prediction_cache_misses_total", "counter", "Prediction cache misses.", [({}, cache["misses"])]),
+        ("prediction_cache_entries", "gauge", "Entries in the prediction cache.", [({}, cache["size"])]),
+    ]
+
+    if micro_batcher is not None:
+        batching = micro_batcher.stats()
+        families += [
+            ("micro_batches_total", "counter", "Batched model calls.", [({}, batching["batches"])]),
+            ("micro_batch_rows_total", "counter", "Rows scored through the micro-batcher.",
+             [({}, batching["rows"])]),
+        ]
+    return families
+
+
+metrics_registry.add_collector(collect_state_metrics)
+
+
+profile_store = ProfileStore(PROFILE_DIR, PROFILE_KEEP)
+
+
+def profiling_enabled():
+    return PROFILE_SAMPLE_RATE > 0 or PROFILE_HEADER_ENABLED
+
+
+def should_profile():
+    if request.path.startswith("/api/profiles"):
+        return False
+    if PROFILE_HEADER_ENABLED and request.headers.get("X-Profile") == "1":
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@app.before_request
+def start_profiling():
+    if profiling_enabled() and should_profile():
+        profiler = StackProfiler()
+        profiler.start()
+        g.profiler = profiler
+
+
+@app.after_request
+def save_profile(response):
+    """Stop the request's profiler and write its collapsed stacks.
+
+    Streamed bodies are generated after this hook, so they are not covered.
+    """
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+
+    profiler.stop()
+    endpoint = request.url_rule.endpoint if request.url_rule else "unmatched"
+    try:
+        response.headers["X-Profile-Id"] = profile_store.save(profiler, endpoint)
+    except OSError as e:
+        print(f"⚠️ Could not save profile: {e}")
+    return response
+
+
+@app.teardown_request
+def stop_profiling(exc):
+    # Only reached with a profiler still set if after_request never ran.
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
+
+
+@app.route("/api/profiles", methods=["GET"])
+def list_profiles():
+    if not profiling_enabled():
+        return jsonify({"error": "Profiling is disabled"}), 404
+    try:
+        limit = query_int(request.args, "limit", 20, minimum=1)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(
+        {
+            "sample_rate": PROFILE_SAMPLE_RATE,
+            "header_enabled": PROFILE_HEADER_ENABLED,
+            "profiles": profile_store.list(limit),
+        }
+    )
+
+
+@app.route("/api/profiles/<name>", methods=["GET"])
+def get_profile(name):
+    if not profiling_enabled():
+        return jsonify({"error": "Profiling is disabled"}), 404
+    path = profile_store.path(name)
+    if path is None:
+        return jsonify({"error": f"Profile '{name}' not found"}), 404
+    with open(path) as profile_file:
+        return app.response_class(profile_file.read(), content_type="text/plain; charset=utf-8")
+
+
+@app.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    if not metrics_registry.enabled:
+        return jsonify({"error": "Metrics are disabled"}), 404
+    return app.response_class(metrics_registry.render(), content_type=metrics.TEXT_MIMETYPE)
 
 
 @app.route("/api/health", methods=["GET"])
 def health():
+    model_set = served()
     return jsonify(
         {
-            "status": "healthy" if models else "error",
-            "message": "ok" if models else "Models not loaded",
+            "status": "healthy" if model_set.models else "error",
+            "message": "ok" if model_set.models else "Models not loaded",
+            "engine": INFERENCE_ENGINE,
+            "model_version": model_set.version,
+            "registry": (
+                model_set.models.status()
+                if isinstance(model_set.models, ModelRegistry)
+                else None
+            ),
+            "micro_batching": micro_batcher.stats() if micro_batcher else None,
         }
     )
 
 
 @app.route("/api/metadata", methods=["GET"])
 def get_metadata():
+    model_set = served()
+    metadata = model_set.metadata
     if not metadata:
         return jsonify({"error": "Models not loaded"}), 503
 
@@ -144,21 +999,87 @@ def get_metadata():
             "n_features": metadata.get("n_features", 0),
             "n_samples": metadata.get("n_samples", 0),
             "class_distribution": metadata.get("class_distribution", {}),
-            "top_features": metadata.get("top_features", top_features or []),
+            "top_features": metadata.get("top_features", model_set.top_features or []),
             "feature_labels": metadata.get("feature_labels", {}),
+            "model_version": model_set.version,
         }
     )
 
 
 @app.route("/api/feature-stats", methods=["GET"])
 def get_feature_stats():
+    feature_stats = served().feature_stats
     if not feature_stats:
         return jsonify({"error": "Models not loaded"}), 503
     return jsonify(feature_stats)
 
 
+@app.route("/api/cache-stats", methods=["GET"])
+def get_cache_stats():
+    return jsonify(
+        {
+            "prediction_cache": prediction_cache.stats(),
+            "attribution_cache": attribution_cache.stats(),
+        }
+    )
+
+
+def admin_error():
+    """Return an error response unless the request carries the admin token."""
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Not found"}), 404
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        return jsonify({"error": "Unauthorized"}), 401
+    return None
+
+
+@app.route("/api/admin/versions", methods=["GET"])
+def list_model_versions():
+    error = admin_error()
+    if error is not None:
+        return error
+    return jsonify(
+        {"current": model_version_id, "versions": artifacts.list_versions(MODELS_DIR)}
+    )
+
+
+@app.route("/api/admin/reload", methods=["POST"])
+def admin_reload():
+    """Load and serve the current (or a given) model version without a restart."""
+    error = admin_error()
+    if error is not None:
+        return error
+
+    data = request.get_json(silent=True) or {}
+    version = data.get("version")
+    if version is not None and not isinstance(version, str):
+        return jsonify({"error": "version must be a string"}), 400
+
+    try:
+        version, previous, load_seconds = reload_models(version)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 409
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print("RELOAD ERROR:", repr(e))
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify(
+        {
+            "version": version,
+            "previous_version": previous,
+            "load_ms": round(load_seconds * 1000, 3),
+        }
+    )
+
+
 @app.route("/api/predict", methods=["POST"])
 def predict():
+    models = served().models
     if not models:
         return jsonify({"error": "Models not loaded"}), 503
 
@@ -173,22 +1094,27 @@ def predict():
         if model_name not in models:
             return jsonify({"error": f"Model {model_name} not found"}), 400
 
-        input_array, all_features = build_input_array(feature_values)
+        start = time.perf_counter()
+        input_array, _ = build_input_array(feature_values)
+        unknown = unknown_features(feature_values)
+        observe_stage(model_name, "assemble", start)
 
         model = models[model_name]
-        prediction_value = int(model.predict(input_array)[0])
-        probabilities = model.predict_proba(input_array)[0]
-        feature_importance = build_feature_importance(model_name, model, all_features)
+        prediction_value, probabilities = score_row(model_name, model, input_array)
+        attributions = (
+            explain_row(model_name, model, input_array) if ATTRIBUTIONS_ENABLED else None
+        )
 
-        return jsonify(
-            {
-                "prediction": prediction_value,
-                "probabilities": {
-                    "benign": float(probabilities[0]),
-                    "malignant": float(probabilities[1]),
-                },
-                "feature_importance": feature_importance,
-            }
+        return json_response(
+            render_prediction(
+                model_name,
+                model,
+                prediction_value,
+                probabilities,
+                unknown=unknown,
+                attributions=attributions,
+            ),
+            unknown,
         )
 
     except Exception as e:
@@ -198,6 +1124,7 @@ def predict():
 
 @app.route("/api/predict-all", methods=["POST"])
 def predict_all():
+    models = served().models
     if not models:
         return jsonify({"error": "Models not loaded"}), 503
 
@@ -208,42 +1135,434 @@ def predict_all():
         if not isinstance(feature_values, dict):
             return jsonify({"error": "features must be an object"}), 400
 
-        input_array, all_features = build_input_array(feature_values)
+        start = time.perf_counter()
+        input_array, _ = build_input_array(feature_values)
+        observe_stage("all", "assemble", start)
 
-        results = {}
-        for model_name, model in models.items():
-            prediction_value = int(model.predict(input_array)[0])
-            probabilities = model.predict_proba(input_array)[0]
-            feature_importance = build_feature_importance(
-                model_name, model, all_features
+        if micro_batcher is not None:
+            results = predict_all_batched(input_array)
+        elif PREDICT_ALL_MODE == "parallel":
+            results = predict_all_parallel(input_array)
+        else:
+            results = {
+                model_name: render_timed_prediction(model_name, input_array)
+                for model_name in models.keys()
+            }
+
+        return json_response(
+            "{"
+            + ",".join(
+                f"{json.dumps(model_name)}:{result}"
+                for model_name, result in results.items()
             )
+            + "}",
+            unknown_features(feature_values),
+        )
 
-            results[model_name] = {
-                "prediction": prediction_value,
-                "probabilities": {
-                    "benign": float(probabilities[0]),
-                    "malignant": float(probabilities[1]),
+    except Exception as e:
+        print("PREDICT-ALL ERROR:", repr(e))
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/predict-batch", methods=["POST"])
+def predict_batch():
+    models = served().models
+    if not models:
+        return jsonify({"error": "Models not loaded"}), 503
+
+    try:
+        data = request.get_json(silent=True) or {}
+        model_name = data.get("model", "logistic_regression")
+        rows = data.get("rows")
+        columns = data.get("columns")
+
+        if model_name not in models:
+            return jsonify({"error": f"Model {model_name} not found"}), 400
+
+        if (rows is None) == (columns is None):
+            return jsonify({"error": "Provide exactly one of rows or columns"}), 400
+
+        if rows is not None:
+            if not isinstance(rows, list) or not all(
+                isinstance(row, dict) for row in rows
+            ):
+                return jsonify({"error": "rows must be a list of objects"}), 400
+            n_rows = len(rows)
+        else:
+            if not isinstance(columns, dict) or not all(
+                isinstance(values, list) for values in columns.values()
+            ):
+                return jsonify({"error": "columns must map features to lists"}), 400
+            n_rows = max((len(values) for values in columns.values()), default=0)
+
+        if n_rows > MAX_BATCH_ROWS:
+            return (
+                jsonify({"error": f"Batch exceeds {MAX_BATCH_ROWS} rows"}),
+                413,
+            )
+
+        start = time.perf_counter()
+        try:
+            input_matrix, _ = build_input_matrix(rows, columns)
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+        observe_stage(model_name, "assemble", start)
+        unknown = unknown_features(
+            columns if rows is None else (key for row in rows for key in row)
+        )
+
+        model = models[model_name]
+        if len(input_matrix):
+            predictions, probabilities = score_matrix(model_name, model, input_matrix)
+        else:
+            predictions = np.empty(0, dtype=int)
+            probabilities = np.empty((0, 2))
+
+        explainer = None
+        if data.get("attributions"):
+            explainer = get_explainer(model_name, model)
+            if explainer is None:
+                return (
+                    jsonify({"error": f"Attributions are not available for {model_name}"}),
+                    400,
+                )
+            start = time.perf_counter()
+            contributions = explainer.explain(input_matrix)
+            observe_stage(model_name, "attributions", start)
+        feature_names = served().metadata.get("feature_names", [])
+
+        mimetype = columnar.negotiate(request.accept_mimetypes)
+        if mimetype != columnar.JSON_MIMETYPE:
+            names = ["prediction", "benign", "malignant"]
+            arrays = [predictions, probabilities[:, 0], probabilities[:, 1]]
+            extra_metadata = {"unknown_features": json.dumps(unknown)} if unknown else {}
+            if explainer is not None:
+                names += [f"attribution_{feature}" for feature in feature_names]
+                arrays += list(contributions.T)
+                extra_metadata["attribution_output"] = explainer.output
+                extra_metadata["attribution_base_value"] = repr(explainer.base_value)
+            return columnar_response(
+                mimetype,
+                names,
+                arrays,
+                metadata={
+                    "model": model_name,
+                    "feature_importance": get_feature_importance_json(
+                        model_name, model
+                    ),
+                    **extra_metadata,
                 },
-                "feature_importance": feature_importance,
+            )
+
+        start = time.perf_counter()
+        results = [
+            {
+                "prediction": prediction,
+                "probabilities": {"benign": benign, "malignant": malignant},
             }
+            for prediction, benign, malignant in zip(
+                predictions.tolist(),
+                probabilities[:, 0].tolist(),
+                probabilities[:, 1].tolist(),
+            )
+        ]
 
-        return jsonify(results)
+        extra = f',"unknown_features":{json.dumps(unknown)}' if unknown else ""
+        if explainer is not None:
+            attributions = {
+                "output": explainer.output,
+                "base_value": explainer.base_value,
+                "features": feature_names,
+                "values": contributions.tolist(),
+            }
+            extra += f',"attributions":{json.dumps(attributions, separators=(",", ":"))}'
+        body = (
+            f'{{"model":{json.dumps(model_name)},"count":{len(results)},'
+            f'"results":{json.dumps(results, separators=(",", ":"))},'
+            f'"feature_importance":{get_feature_importance_json(model_name, model)}'
+            f"{extra}}}"
+        )
+        observe_stage(model_name, "serialize", start)
+        return json_response(body, unknown)
 
     except Exception as e:
-        print("PREDICT-ALL ERROR:", repr(e))
+        print("PREDICT-BATCH ERROR:", repr(e))
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/predict-stream", methods=["POST"])
+def predict_stream():
+    """Score an NDJSON or CSV upload chunk by chunk, streaming NDJSON results.
+
+    The upload is never held in memory as a whole: rows are read in chunks of
+    STREAM_CHUNK_ROWS, each chunk is scored with one vectorized call per model
+    and its result lines are sent before the next chunk is read.
+    """
+    models = served().models
+    if not models:
+        return jsonify({"error": "Models not loaded"}), 503
+
+    model_param = request.args.get("model", "logistic_regression")
+    model_names = list(models.keys()) if model_param == "all" else model_param.split(",")
+    missing = [model_name for model_name in model_names if model_name not in models]
+    if missing:
+        return jsonify({"error": f"Model {', '.join(missing)} not found"}), 400
+
+    if request.mimetype == streaming.CSV_MIMETYPE:
+        read_chunks = streaming.iter_csv_chunks
+    elif request.mimetype in (streaming.NDJSON_MIMETYPE, "application/jsonl"):
+        read_chunks = streaming.iter_ndjson_chunks
+    else:
+        return (
+            jsonify({"error": "Send application/x-ndjson or text/csv"}),
+            415,
+        )
+
+    try:
+        chunk_rows = query_int(request.args, "chunk_rows", STREAM_CHUNK_ROWS, minimum=1)
+        schema = get_feature_schema()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def generate():
+        first_row = 0
+        try:
+            for ids, input_matrix in read_chunks(request.stream, schema, chunk_rows):
+                results = {
+                    model_name: score_matrix(model_name, models[model_name], input_matrix)
+                    for model_name in model_names
+                }
+                yield streaming.render_ndjson_rows(first_row, ids, results)
+                first_row += len(input_matrix)
+        except (TypeError, ValueError) as e:
+            # Headers are already sent, so errors become a final NDJSON line.
+            print("PREDICT-STREAM ERROR:", repr(e))
+            yield json.dumps({"error": str(e), "row": first_row}) + "\n"
+
+    return app.response_class(
+        stream_with_context(generate()), mimetype=streaming.NDJSON_MIMETYPE
+    )
+
+
+def get_dataset_cache():
+    """Build the static dataset payload once and keep it (and its encodings) in memory."""
+    global dataset_cache
+
+    if dataset_cache is None:
+        with dataset_cache_lock:
+            if dataset_cache is None:
+                dataset = load_breast_cancer()
+                body = json.dumps(
+                    {
+                        "features": dataset.feature_names.tolist(),
+                        "data": dataset.data.tolist(),
+                        "target": dataset.target.tolist(),
+                    },
+                    separators=(",", ":"),
+                ).encode("utf-8")
+
+                dataset_cache = {
+                    "features": dataset.feature_names.tolist(),
+                    # Any spelling the feature schema accepts (sklearn, CSV,
+                    # training name or display label) -> dataset column.
+                    "feature_lookup": build_feature_lookup(
+                        [COLUMN_RENAME_MAP.get(name, name) for name in dataset.feature_names],
+                        feature_aliases(FEATURE_LABELS),
+                    ),
+                    "data": dataset.data,
+                    "columns": np.asfortranarray(dataset.data),
+                    "target": dataset.target,
+                    "etag": hashlib.sha256(body).hexdigest()[:32],
+                    "encodings": {
+                        "identity": body,
+                        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+                    },
+                }
+                if brotli is not None:
+                    dataset_cache["encodings"]["br"] = brotli.compress(body)
+
+    return dataset_cache
+
+
+def cached_response(encodings, etag, mimetype="application/json"):
+    """Serve prebuilt bytes, honouring If-None-Match and Accept-Encoding."""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        encoding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in encodings and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        response = app.response_class(encodings[encoding], mimetype=mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+
+    return set_cache_headers(response, etag)
+
+
+def set_cache_headers(response, etag):
+    """Let clients and shared caches keep a dataset response, revalidating by ETag.
+
+    /api/dataset negotiates JSON, Arrow or float32 from Accept, so every
+    response (304s included) varies on it as well as on Accept-Encoding.
+    """
+    response.set_etag(etag)
+    response.vary.add("Accept")
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.max_age = DATASET_CACHE_MAX_AGE
+    return response
+
+
+def stratified_sample(target, n_samples, seed=0):
+    """Pick n_samples row indices keeping the class proportions of target."""
+    if n_samples >= len(target):
+        return np.arange(len(target))
+
+    rng = np.random.default_rng(seed)
+    classes, counts = np.unique(target, return_counts=True)
+    shares = n_samples * counts / counts.sum()
+    quotas = np.floor(shares).astype(int)
+    remainder = n_samples - quotas.sum()
+    quotas[np.argsort(quotas - shares)[:remainder]] += 1
+
+    picks = [
+        rng.choice(np.flatnonzero(target == cls), size=quota, replace=False)
+        for cls, quota in zip(classes, quotas)
+    ]
+    return np.sort(np.concatenate(picks))
+
+
+def query_int(args, name, default=None, minimum=0):
+    """Read an optional integer query parameter, rejecting malformed values."""
+    raw_value = args.get(name)
+    if raw_value is None:
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return value
+
+
+def parse_dataset_query(args, cache):
+    """Validate /api/dataset query parameters into column and row selections."""
+    columns = None
+    if args.get("features"):
+        names = [name.strip() for name in args["features"].split(",") if name.strip()]
+        columns = [lookup_feature(cache["feature_lookup"], name) for name in names]
+        unknown = [name for name, column in zip(names, columns) if column is None]
+        if unknown:
+            raise ValueError(f"Unknown features: {', '.join(unknown)}")
+
+    return {
+        "columns": columns,
+        "offset": query_int(args, "offset", default=0, minimum=0),
+        "limit": query_int(args, "limit", minimum=1),
+        "sample": query_int(args, "sample", minimum=1),
+        "seed": query_int(args, "seed", default=0, minimum=0),
+    }
+
+
+def select_dataset(cache, columns, offset, limit, sample, seed):
+    """Resolve a dataset query against the cached arrays.
+
+    Returns the selected feature names, one 1-D array per column, the target
+    and row indices for the page, plus the paging totals. Unsampled pages are
+    contiguous views of the column-major cache, so no data is copied here.
+    """
+    if sample is None:
+        total = len(cache["target"])
+        end = total if limit is None else min(offset + limit, total)
+        rows = slice(offset, end)
+        indices = np.arange(offset, max(offset, end))
+    else:
+        sampled = stratified_sample(cache["target"], sample, seed)
+        total = len(sampled)
+        end = total if limit is None else min(offset + limit, total)
+        rows = indices = sampled[offset:end]
+
+    if columns is None:
+        columns = range(len(cache["features"]))
+
+    return {
+        "features": [cache["features"][index] for index in columns],
+        "arrays": [cache["columns"][:, index][rows] for index in columns],
+        "target": cache["target"][rows],
+        "indices": indices,
+        "total": total,
+        "offset": offset,
+        "next_offset": end if end < total else None,
+    }
+
+
+def build_dataset_slice(selection):
+    """Serialize a dataset selection as JSON, converting only the selected page."""
+    if selection["arrays"]:
+        data = np.column_stack(selection["arrays"]).tolist()
+    else:
+        data = [[] for _ in range(len(selection["target"]))]
+
+    return json.dumps(
+        {
+            "features": selection["features"],
+            "data": data,
+            "target": selection["target"].tolist(),
+            "indices": selection["indices"].tolist(),
+            "total": selection["total"],
+            "offset": selection["offset"],
+            "next_offset": selection["next_offset"],
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def columnar_response(mimetype, names, arrays, metadata=None, etag=None):
+    """Build a binary columnar response (Arrow IPC stream or raw float32)."""
+    body, headers = columnar.encode_columns(mimetype, names, arrays, metadata)
+    response = app.response_class(body, mimetype=mimetype, headers=headers)
+    response.vary.add("Accept")
+    if etag is not None:
+        set_cache_headers(response, etag)
+    return response
+
+
 @app.route("/api/dataset", methods=["GET"])
 def get_dataset():
-    dataset = load_breast_cancer()
-    return jsonify(
-        {
-            "features": dataset.feature_names.tolist(),
-            "data": dataset.data.tolist(),
-            "target": dataset.target.tolist(),
-        }
-    )
+    cache = get_dataset_cache()
+    mimetype = columnar.negotiate(request.accept_mimetypes)
+    if not request.args and mimetype == columnar.JSON_MIMETYPE:
+        return cached_response(cache["encodings"], cache["etag"])
+
+    try:
+        query = parse_dataset_query(request.args, cache)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = hashlib.sha256(
+        (cache["etag"] + mimetype + json.dumps(query, sort_keys=True)).encode("utf-8")
+    ).hexdigest()[:32]
+    if request.if_none_match.contains(etag):
+        return cached_response({}, etag)
+
+    selection = select_dataset(cache, **query)
+    if mimetype != columnar.JSON_MIMETYPE:
+        return columnar_response(
+            mimetype,
+            selection["features"] + ["target"],
+            selection["arrays"] + [selection["target"]],
+            metadata={
+                "total": str(selection["total"]),
+                "next_offset": json.dumps(selection["next_offset"]),
+            },
+            etag=etag,
+        )
+
+    return cached_response({"identity": build_dataset_slice(selection)}, etag)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""
+Versioned model artifact directories.
+
+Each training run publishes its artifacts as an immutable version under
+``<models_dir>/versions/<version>/``, with a manifest.json listing the
+SHA-256 of every file and the run's metrics. The version id is derived from
+those hashes, so identical artifacts always get the same id (and keep their
+cached predictions valid). The served version is named by the
+``<models_dir>/CURRENT`` pointer, which is replaced atomically. A directory
+without CURRENT is served as a single unversioned set (the layout that
+predates versioning) whose version is the digest of its files.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+
+VERSIONS_DIR = "versions"
+CURRENT_FILENAME = "CURRENT"
+MANIFEST_FILENAME = "manifest.json"
+# Hashed for integrity but not part of the version id: it records timings.
+UNVERSIONED_FILES = {"training_report.json"}
+KEEP_VERSIONS = 5
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as artifact_file:
+        for block in iter(lambda: artifact_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_hashes(directory):
+    """Map each file's path relative to directory -> {sha256, bytes}.
+
+    The manifest, the CURRENT pointer and the versions tree are skipped.
+    """
+    hashes = {}
+    for root, dirs, filenames in os.walk(directory):
+        if root == directory:
+            dirs[:] = [name for name in dirs if name != VERSIONS_DIR]
+        dirs.sort()
+        for filename in sorted(filenames):
+            if root == directory and filename in (MANIFEST_FILENAME, CURRENT_FILENAME):
+                continue
+            path = os.path.join(root, filename)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            hashes[relative] = {"sha256": file_sha256(path), "bytes": os.path.getsize(path)}
+    return hashes
+
+
+def version_id(hashes):
+    """Short digest of every versioned file's path and content hash."""
+    digest = hashlib.sha256()
+    for relative, entry in sorted(hashes.items()):
+        if relative not in UNVERSIONED_FILES:
+            digest.update(f"{relative}:{entry['sha256']}\n".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def staging_dir(models_dir):
+    """Return a fresh directory to write a new version into before publish()."""
+    path = os.path.join(models_dir, VERSIONS_DIR, f".staging-{uuid.uuid4().hex}")
+    os.makedirs(path)
+    return path
+
+
+def write_current(models_dir, version):
+    """Point CURRENT at a version (atomic: readers see the old or new name)."""
+    temporary = os.path.join(models_dir, f".{CURRENT_FILENAME}.{uuid.uuid4().hex}")
+    with open(temporary, "w") as pointer_file:
+        pointer_file.write(version + "\n")
+    os.replace(temporary, os.path.join(models_dir, CURRENT_FILENAME))
+
+
+def publish(models_dir, staging, metrics=None, keep=KEEP_VERSIONS):
+    """Seal a staging directory as a version, make it current and return its id."""
+    hashes = content_hashes(staging)
+    version = version_id(hashes)
+    manifest = {
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+        "files": hashes,
+        "metrics": metrics or {},
+    }
+    with open(os.path.join(staging, MANIFEST_FILENAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    target = os.path.join(models_dir, VERSIONS_DIR, version)
+    if os.path.isdir(target):
+        # Identical artifacts are already published under this id.
+        shutil.rmtree(staging)
+    else:
+        os.rename(staging, target)
+    write_current(models_dir, version)
+    prune(models_dir, keep)
+    return version
+
+
+def current_version(models_dir):
+    """Return the version named by CURRENT, or None for an unversioned directory."""
+    try:
+        with open(os.path.join(models_dir, CURRENT_FILENAME)) as pointer_file:
+            return pointer_file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def version_path(models_dir, version):
+    """Return a version's directory; raise ValueError for names that are not ids."""
+    if not version or version.startswith(".") or os.path.basename(version) != version:
+        raise ValueError(f"Invalid model version: {version!r}")
+    return os.path.join(models_dir, VERSIONS_DIR, version)
+
+
+def resolve(models_dir):
+    """Return (version, directory) of the artifacts to serve from models_dir."""
+    version = current_version(models_dir)
+    if version is None:
+        return version_id(content_hashes(models_dir)), models_dir
+    path = version_path(models_dir, version)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"CURRENT names missing version {version}")
+    return version, path
+
+
+def read_manifest(path):
+    """Return a version directory's manifest, or None if it has none."""
+    try:
+        with open(os.path.join(path, MANIFEST_FILENAME)) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return None
+
+
+def verify(path):
+    """Check a version directory against its manifest; raise ValueError if not intact."""
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise ValueError(f"No {MANIFEST_FILENAME} in {path}")
+    actual = content_hashes(path)
+    expected = manifest["files"]
+    changed = sorted(
+        name for name in set(actual) | set(expected) if actual.get(name) != expected.get(name)
+    )
+    if changed:
+        raise ValueError(f"Artifacts do not match the manifest: {', '.join(changed)}")
+    if version_id(actual) != manifest["version"]:
+        raise ValueError("Manifest version does not match its file hashes")
+    return manifest
+
+
+def list_versions(models_dir):
+    """Published versions, newest first, with their creation time and metrics."""
+    root = os.path.join(models_dir, VERSIONS_DIR)
+    if not os.path.isdir(root):
+        return []
+    versions = []
+    for name in os.listdir(root):
+        if name.startswith("."):
+            continue
+        manifest = read_manifest(os.path.join(root, name))
+        if manifest is not None:
+            versions.append(
+                {"version": name, "created": manifest["created"], "metrics": manifest["metrics"]}
+            )
+    versions.sort(key=lambda entry: entry["created"], reverse=True)
+    return versions
+
+
+def prune(models_dir, keep=KEEP_VERSIONS):
+    """Delete all but the newest ``keep`` versions, never the current one.
+
+    Workers still serving a pruned version keep working from its open
+    memory maps; only models they have not loaded yet become unavailable.
+    """
+    current = current_version(models_dir)
+    for entry in list_versions(models_dir)[keep:]:
+        if entry["version"] != current:
+            shutil.rmtree(version_path(models_dir, entry["version"]), ignore_errors=True)
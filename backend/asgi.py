@@ -0,0 +1,162 @@
+"""
+ASGI entry point serving the Flask API with micro-batched scoring.
+
+Run with any ASGI server, e.g.:
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+Requests are handed to the Flask app on a bounded thread pool, so every
+endpoint keeps its exact response contract (status codes, headers, CORS,
+streaming bodies). Single-row scoring from /api/predict and /api/predict-all
+goes through the shared MicroBatcher: concurrent requests that arrive within
+MICRO_BATCH_WINDOW_MS (default 2) or until MICRO_BATCH_MAX_ROWS (default 64)
+are scored as one matrix per model; predict-all queues every model's row at
+once, so all models share one window.
+"""
+
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("MICRO_BATCH_WINDOW_MS", "2")
+
+import app as flask_app  # noqa: E402  (reads the setting above at import)
+
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 64))
+
+
+class ReceiveStream(io.RawIOBase):
+    """Blocking file-like view of an ASGI request body, for WSGI's wsgi.input."""
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b""
+        self._more_body = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer and self._more_body:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message["type"] == "http.disconnect":
+                self._more_body = False
+                break
+            self._buffer = message.get("body", b"")
+            self._more_body = message.get("more_body", False)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def build_environ(scope, body_stream):
+    """Translate an ASGI HTTP scope into a PEP 3333 environ."""
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body_stream,
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name == "CONTENT_LENGTH":
+            environ["CONTENT_LENGTH"] = value
+        else:
+            key = "HTTP_" + name
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class WsgiToAsgi:
+    """Serve a WSGI app from ASGI, running each request on a thread pool.
+
+    The request body is read from ``receive`` as the app consumes it and the
+    response is sent chunk by chunk, so streaming endpoints stay streaming.
+    """
+
+    def __init__(self, wsgi_app, max_workers=ASGI_THREADS):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asgi")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        loop = asyncio.get_running_loop()
+        environ = build_environ(scope, io.BufferedReader(ReceiveStream(receive, loop)))
+        await loop.run_in_executor(self.executor, self.run_wsgi, environ, send, loop)
+
+    def run_wsgi(self, environ, send, loop):
+        """Call the WSGI app in a worker thread, forwarding its output to send."""
+
+        def send_message(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):
+            response_start["status"] = int(status.split(" ", 1)[0])
+            response_start["headers"] = [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ]
+
+        def send_start():
+            send_message({"type": "http.response.start", **response_start})
+
+        iterable = self.wsgi_app(environ, start_response)
+        try:
+            started = False
+            for chunk in iterable:
+                if not chunk:
+                    continue
+                if not started:
+                    send_start()
+                    started = True
+                send_message({"type": "http.response.body", "body": chunk, "more_body": True})
+            if not started:
+                send_start()
+            send_message({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                batcher, flask_app.micro_batcher = flask_app.micro_batcher, None
+                if batcher is not None:
+                    batcher.stop()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = WsgiToAsgi(flask_app.app)
@@ -0,0 +1,172 @@
+"""
+Micro-batching scheduler for single-row predictions.
+
+Request threads submit one assembled row and wait on a future. A background
+thread collects the rows that arrive within a short window (or until a row
+limit is reached), stacks them per model into one matrix, scores each matrix
+with a single call and resolves every future with its own row's result.
+Under concurrent load this trades a couple of milliseconds of latency for
+far fewer, larger model calls.
+
+Every submitted future is resolved: rows still queued when the batcher stops
+are scored before its thread exits, rows submitted after stop() fail at once,
+and score() gives up after a bounded wait.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row scoring calls into batched calls.
+
+    ``score_fn(model_name, model, input_matrix)`` must return
+    ``(predictions, probabilities)`` for the stacked rows, like score_matrix.
+    score() waits at most ``timeout_seconds`` for its row.
+    """
+
+    def __init__(self, score_fn, max_rows=64, window_ms=2.0, timeout_seconds=10.0):
+        self.max_rows = max_rows
+        self.window_seconds = window_ms / 1000.0
+        self.timeout_seconds = timeout_seconds
+        self._score_fn = score_fn
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, model_name, model, input_row):
+        """Queue one row and return a Future of (prediction, (benign, malignant))."""
+        future = Future()
+        if self._stopped.is_set():
+            future.set_exception(RuntimeError("Micro-batcher is stopped"))
+            return future
+        self._queue.put((model_name, model, np.asarray(input_row, dtype=float), future))
+        return future
+
+    def score(self, model_name, model, input_row):
+        """Queue one row and wait for its result.
+
+        Raises TimeoutError if the row is not scored within timeout_seconds.
+        """
+        future = self.submit(model_name, model, input_row)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"No micro-batch result within {self.timeout_seconds:g}s"
+            ) from None
+
+    def stop(self):
+        """Score the rows already queued, then stop; later submits fail."""
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join()
+        # Rows that raced past the stopped check after the thread drained.
+        self._fail(self._drain(), RuntimeError("Micro-batcher is stopped"))
+
+    def stats(self):
+        return {
+            "max_rows": self.max_rows,
+            "window_ms": self.window_seconds * 1000.0,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_rows": self.rows / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
+
+    def _collect(self):
+        """Block for the first row, then gather more until the window or row limit."""
+        first = self._queue.get()
+        if first is None:
+            return []
+        items = [first]
+        deadline = time.monotonic() + self.window_seconds
+        while len(items) < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped.set()
+                break
+            items.append(item)
+        return items
+
+    def _drain(self):
+        """Take every row left in the queue without waiting."""
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not None:
+                items.append(item)
+
+    def _fail(self, items, error):
+        for *_, future in items:
+            try:
+                future.set_exception(error)
+            except InvalidStateError:
+                pass  # already resolved or cancelled
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._flush_safely(self._collect())
+        self._flush_safely(self._drain())
+
+    def _flush_safely(self, items):
+        """Flush items; an unexpected error fails their futures instead of the thread."""
+        if not items:
+            return
+        try:
+            self._flush(items)
+        except Exception as e:
+            self._fail(items, e)
+
+    def _flush(self, items):
+        # Keyed on the model object too: during a reload, requests pinned to
+        # different artifact versions submit different models under one name.
+        # Callers that gave up and cancelled their future are skipped.
+        items = [item for item in items if item[3].set_running_or_notify_cancel()]
+        groups = {}
+        for model_name, model, input_row, future in items:
+            groups.setdefault((model_name, id(model)), (model, []))[1].append((input_row, future))
+
+        for (model_name, _), (model, entries) in groups.items():
+            futures = [future for _, future in entries]
+            try:
+                input_matrix = np.vstack([input_row for input_row, _ in entries])
+                predictions, probabilities = self._score_fn(model_name, model, input_matrix)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            for index, future in enumerate(futures):
+                future.set_result(
+                    (
+                        int(predictions[index]),
+                        (float(probabilities[index, 0]), float(probabilities[index, 1])),
+                    )
+                )
+
+        self.batches += len(groups)
+        self.rows += len(items)
+        self.largest_batch = max(
+            [self.largest_batch] + [len(entries) for _, entries in groups.values()]
+        )
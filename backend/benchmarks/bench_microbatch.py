@@ -0,0 +1,79 @@
+"""
+Throughput benchmark for micro-batched single-row scoring.
+
+Many threads call score_row() concurrently, as request threads do under an
+ASGI or threaded WSGI server, with and without the MicroBatcher. The
+prediction cache is disabled so every call is scored.
+Run with: python backend/benchmarks/bench_microbatch.py [--threads 64]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from batching import MicroBatcher  # noqa: E402
+from prediction_cache import PredictionCache  # noqa: E402
+
+
+def run(model_name, rows, threads):
+    """Score every row from `threads` threads; return rows per second."""
+    model = app.models[model_name]
+    chunks = np.array_split(np.arange(len(rows)), threads)
+
+    def worker(indices):
+        for index in indices:
+            app.score_row(model_name, model, rows[index : index + 1])
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-rows", type=int, default=64)
+    args = parser.parse_args()
+
+    if not app.models:
+        sys.exit("Models not loaded")
+
+    app.prediction_cache = PredictionCache(max_entries=0)
+    single_row, _ = app.build_input_array({})
+    rng = np.random.default_rng(42)
+    rows = single_row * rng.uniform(0.5, 1.5, size=(args.rows, single_row.shape[1]))
+
+    print(f"{'model':<22}{'direct rows/s':>15}{'batched rows/s':>16}{'speedup':>10}{'mean batch':>12}")
+    for model_name in app.models.keys():
+        app.micro_batcher = None
+        direct = run(model_name, rows, args.threads)
+
+        app.micro_batcher = MicroBatcher(
+            app.score_matrix, max_rows=args.max_rows, window_ms=args.window_ms
+        )
+        batched = run(model_name, rows, args.threads)
+        mean_batch = app.micro_batcher.stats()["mean_batch_rows"]
+        app.micro_batcher.stop()
+        app.micro_batcher = None
+
+        print(
+            f"{model_name:<22}{direct:>15,.0f}{batched:>16,.0f}"
+            f"{batched / direct:>9.2f}x{mean_batch:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark for the single-pass scoring core.
+
+Compares the old predict + predict_proba path against score_matrix() for each
+loaded model, on a single row and on a batch.
+Run with: python backend/benchmarks/bench_scoring.py [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+def time_call(func, repeat):
+    """Return the median wall time of func() in microseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+
+def two_pass(model, input_matrix):
+    model.predict(input_matrix)
+    model.predict_proba(input_matrix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not app.models:
+        sys.exit("Models not loaded")
+
+    warnings.filterwarnings("ignore", category=UserWarning)
+    single_row, _ = app.build_input_array({})
+    rng = np.random.default_rng(42)
+    batch = single_row * rng.uniform(0.5, 1.5, size=(args.batch_size, single_row.shape[1]))
+
+    print(f"{'model':<22}{'rows':>6}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for model_name, model in app.models.items():
+        for input_matrix in (single_row, batch):
+            before = time_call(lambda: two_pass(model, input_matrix), args.repeat)
+            after = time_call(
+                lambda: app.score_matrix(model_name, model, input_matrix), args.repeat
+            )
+            print(
+                f"{model_name:<22}{len(input_matrix):>6}"
+                f"{before:>14.1f}{after:>14.1f}{before / after:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
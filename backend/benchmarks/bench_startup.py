@@ -0,0 +1,76 @@
+"""
+Cold-start benchmark for model artifact loading.
+
+Each strategy runs in a fresh interpreter so import caches do not leak
+between measurements:
+
+* pickle -- joblib.load of the sklearn pipelines (what workers used to do)
+* heap   -- compiled bundles read into private memory
+* mmap   -- compiled bundles memory-mapped (the default serving path)
+
+Run with: python backend/benchmarks/bench_startup.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADER = r"""
+import json, os, sys, time, warnings
+warnings.filterwarnings("ignore")
+sys.path.insert(0, {backend_dir!r})
+import joblib, numpy, sklearn.ensemble, sklearn.linear_model, sklearn.pipeline
+import inference
+
+def rss_kb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+models_dir = os.path.join({backend_dir!r}, "models")
+before = rss_kb()
+start = time.perf_counter()
+for name in inference.MODEL_NAMES:
+    if {strategy!r} == "pickle":
+        joblib.load(os.path.join(models_dir, name + ".pkl"))
+    else:
+        inference.load_compiled(
+            os.path.join(models_dir, name + inference.COMPILED_SUFFIX),
+            mmap={strategy!r} == "mmap",
+        )
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "rss_kb": rss_kb() - before}}))
+"""
+
+
+def measure(strategy):
+    code = LOADER.format(backend_dir=BACKEND_DIR, strategy=strategy)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'strategy':<10}{'load (ms)':>12}{'RSS growth (KB)':>20}")
+    for strategy in ("pickle", "heap", "mmap"):
+        runs = [measure(strategy) for _ in range(args.repeat)]
+        load_ms = float(np.median([run["ms"] for run in runs]))
+        rss_kb = int(np.median([run["rss_kb"] for run in runs]))
+        print(f"{strategy:<10}{load_ms:>12.2f}{rss_kb:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Benchmark suite for inference, serialization and dataset endpoints.
+
+Measures, through the Flask test client and direct function calls:
+
+* single-row latency per model (/api/predict, score_row and attributions)
+* /api/predict-all latency
+* /api/dataset payload build time, request time and payload size per encoding
+* build_input_array cost
+* training CSV ingestion: typed parse vs memory-mapped snapshot
+* batch throughput at 1, 64, 1k and 10k rows (/api/predict-batch and score_matrix)
+
+Results are written to a JSON file. With --compare, each benchmark's median is
+checked against a stored baseline and the run exits with status 1 if any is
+slower by more than --threshold (or a payload grew). Run with:
+
+    python backend/benchmarks/bench_suite.py --output baseline.json
+    python backend/benchmarks/bench_suite.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import app  # noqa: E402
+import columnar  # noqa: E402
+import ingest  # noqa: E402
+import training  # noqa: E402
+from prediction_cache import PredictionCache  # noqa: E402
+
+BATCH_SIZES = (1, 64, 1000, 10000)
+
+
+def time_call(func, repeat, warmup=3):
+    """Return wall times of func() in seconds, after a few warm-up calls."""
+    for _ in range(warmup):
+        func()
+    timings = np.empty(repeat)
+    for index in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings[index] = time.perf_counter() - start
+    return timings
+
+
+def summarize(timings, rows=None, payload_bytes=None):
+    """Summary statistics in microseconds, plus throughput and size if given."""
+    micros = timings * 1e6
+    result = {
+        "median_us": round(float(np.median(micros)), 2),
+        "p95_us": round(float(np.percentile(micros, 95)), 2),
+        "min_us": round(float(micros.min()), 2),
+        "runs": len(micros),
+    }
+    if rows is not None:
+        result["rows"] = rows
+        result["rows_per_s"] = round(rows / float(np.median(timings)), 1)
+    if payload_bytes is not None:
+        result["payload_bytes"] = payload_bytes
+    return result
+
+
+def post_json(client, path, body, headers=None):
+    def call():
+        response = client.post(path, data=body, content_type="application/json", headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.data[:200]!r}")
+        return response
+
+    return call
+
+
+def get(client, path, headers=None):
+    def call():
+        response = client.get(path, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+        return response
+
+    return call
+
+
+def benchmark_cases(client, repeat):
+    """Yield (name, thunk returning a result dict) for every benchmark."""
+    feature_names = app.metadata["feature_names"]
+    full_features = {name: app.feature_stats[name]["mean"] for name in feature_names}
+    single_row, _ = app.build_input_array({})
+    rng = np.random.default_rng(42)
+
+    yield "build_input_array.empty", lambda: summarize(
+        time_call(lambda: app.build_input_array({}), repeat)
+    )
+    yield "build_input_array.full", lambda: summarize(
+        time_call(lambda: app.build_input_array(full_features), repeat)
+    )
+
+    for model_name in app.models.keys():
+        model = app.models[model_name]
+        body = json.dumps({"model": model_name, "features": full_features})
+        yield f"predict.{model_name}", lambda body=body: summarize(
+            time_call(post_json(client, "/api/predict", body), repeat)
+        )
+        yield f"score_row.{model_name}", lambda model_name=model_name, model=model: summarize(
+            time_call(lambda: app.score_row(model_name, model, single_row), repeat)
+        )
+        explainer = app.get_explainer(model_name, model)
+        if explainer is not None:
+            yield f"attributions.{model_name}", lambda explainer=explainer: summarize(
+                time_call(lambda: explainer.explain(single_row), repeat)
+            )
+
+    body = json.dumps({"features": full_features})
+    yield "predict_all", lambda: summarize(
+        time_call(post_json(client, "/api/predict-all", body), repeat)
+    )
+
+    for batch_size in BATCH_SIZES:
+        matrix = single_row * rng.uniform(0.5, 1.5, size=(batch_size, single_row.shape[1]))
+        columns = {name: matrix[:, index].tolist() for index, name in enumerate(feature_names)}
+        # Larger batches take proportionally longer; keep total time bounded.
+        batch_repeat = max(5, repeat // max(1, batch_size // 64))
+        for model_name in app.models.keys():
+            model = app.models[model_name]
+            body = json.dumps({"model": model_name, "columns": columns})
+            yield f"predict_batch.{model_name}.{batch_size}", (
+                lambda body=body, batch_size=batch_size, batch_repeat=batch_repeat: summarize(
+                    time_call(post_json(client, "/api/predict-batch", body), batch_repeat),
+                    rows=batch_size,
+                )
+            )
+            yield f"score_matrix.{model_name}.{batch_size}", (
+                lambda model_name=model_name, model=model, matrix=matrix, batch_repeat=batch_repeat: summarize(
+                    time_call(lambda: app.score_matrix(model_name, model, matrix), batch_repeat),
+                    rows=batch_size,
+                )
+            )
+
+    def build_dataset_cache():
+        app.dataset_cache = None
+        app.get_dataset_cache()
+
+    yield "dataset.build", lambda: summarize(time_call(build_dataset_cache, max(5, repeat // 20), warmup=1))
+
+    dataset_requests = [
+        ("identity", {"Accept-Encoding": "identity"}),
+        ("gzip", {"Accept-Encoding": "gzip"}),
+        ("br", {"Accept-Encoding": "br"}),
+    ]
+    columnar_labels = {columnar.ARROW_STREAM_MIMETYPE: "arrow", columnar.FLOAT32_MIMETYPE: "float32"}
+    for mimetype in columnar.available_mimetypes():
+        if mimetype in columnar_labels:
+            dataset_requests.append((columnar_labels[mimetype], {"Accept": mimetype}))
+
+    for label, headers in dataset_requests:
+        if label == "br" and "br" not in app.get_dataset_cache()["encodings"]:
+            continue
+        path = "/api/dataset" if "Accept" not in headers else "/api/dataset?limit=1000"
+        call = get(client, path, headers)
+        yield f"dataset.{label}", lambda call=call: summarize(
+            time_call(call, repeat), payload_bytes=len(call().data)
+        )
+
+    call = get(client, "/api/dataset?limit=100&sample=100")
+    yield "dataset.json_slice", lambda: summarize(
+        time_call(call, repeat), payload_bytes=len(call().data)
+    )
+
+    csv_path = training.DEFAULT_DATA_PATH
+    ingest_repeat = max(5, repeat // 10)
+    yield "ingest.read_csv", lambda: summarize(
+        time_call(lambda: ingest.read_csv(csv_path), ingest_repeat), rows=len(ingest.read_csv(csv_path))
+    )
+
+    def snapshot_load():
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            ingest.load(csv_path, snapshot_dir)
+            return summarize(time_call(lambda: ingest.load(csv_path, snapshot_dir), ingest_repeat))
+
+    yield "ingest.snapshot", snapshot_load
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "engine": app.INFERENCE_ENGINE,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the names of regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':<42}{'baseline us':>13}{'current us':>13}{'change':>9}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<42}{'-':>13}{current['median_us']:>13.1f}{'new':>9}")
+            continue
+
+        change = current["median_us"] / previous["median_us"] - 1
+        grew = current.get("payload_bytes", 0) > previous.get("payload_bytes", float("inf"))
+        flag = ""
+        if change > threshold or grew:
+            regressions.append(name)
+            flag = "  REGRESSION" + (" (payload grew)" if grew else "")
+        print(
+            f"{name:<42}{previous['median_us']:>13.1f}{current['median_us']:>13.1f}"
+            f"{change:>+8.0%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown of the median before flagging (default 0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--filter", help="only run benchmarks whose name matches this regex")
+    args = parser.parse_args()
+
+    if not app.models:
+        sys.exit("Models not loaded")
+
+    warnings.filterwarnings("ignore", category=UserWarning)
+    # Score and explain every call instead of measuring cache hits.
+    app.prediction_cache = PredictionCache(max_entries=0)
+    app.attribution_cache = PredictionCache(max_entries=0)
+    app.app.config["TESTING"] = True
+    pattern = re.compile(args.filter) if args.filter else None
+
+    results = {}
+    with app.app.test_client() as client:
+        for name, run in benchmark_cases(client, args.repeat):
+            if pattern and not pattern.search(name):
+                continue
+            results[name] = run()
+            extra = ""
+            if "rows_per_s" in results[name]:
+                extra = f"{results[name]['rows_per_s']:>14,.0f} rows/s"
+            elif "payload_bytes" in results[name]:
+                extra = f"{results[name]['payload_bytes']:>14,} bytes"
+            print(f"{name:<42}{results[name]['median_us']:>12.1f} us{extra}")
+
+    with open(args.output, "w") as output_file:
+        json.dump({"environment": environment(), "results": results}, output_file, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Load test: throughput of the production gunicorn setup by worker count.
+
+For each worker count, starts gunicorn with gunicorn.conf.py on a free port,
+drives it with concurrent keep-alive clients posting to an endpoint for a
+fixed duration, and reports requests/s and latency percentiles. Run with:
+
+    python backend/benchmarks/load_test.py --workers 1 2 4 --clients 32
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAYLOADS = {
+    "/api/predict": {"model": "random_forest", "features": {"radius_mean": 17.2}},
+    "/api/predict-all": {"features": {"radius_mean": 17.2}},
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become healthy")
+
+
+def start_server(port, workers, threads):
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "app:app"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def drive(port, path, clients, duration, vary_inputs):
+    """Post from `clients` threads for `duration` seconds; return latencies (s)."""
+    latencies = [[] for _ in range(clients)]
+    stop_at = time.monotonic() + duration
+
+    def client(index):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        payload = dict(PAYLOADS[path])
+        request_number = 0
+        while time.monotonic() < stop_at:
+            if vary_inputs:
+                # Defeat the prediction cache so every request is scored.
+                payload["features"] = {"radius_mean": 10 + index + request_number * 1e-6}
+            body = json.dumps(payload)
+            start = time.perf_counter()
+            connection.request("POST", path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            latencies[index].append(time.perf_counter() - start)
+            request_number += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate([np.asarray(values) for values in latencies])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--path", choices=sorted(PAYLOADS), default="/api/predict")
+    parser.add_argument("--cached", action="store_true", help="repeat one input (cache hits)")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} cores, {args.clients} clients, {args.path}, {args.duration:g}s per run")
+    print(f"{'workers':>8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'scaling':>9}")
+    baseline = None
+    for workers in args.workers:
+        port = free_port()
+        server = start_server(port, workers, args.threads)
+        try:
+            wait_until_healthy(port)
+            drive(port, args.path, args.clients, 1.0, not args.cached)  # warm-up
+            latencies = drive(port, args.path, args.clients, args.duration, not args.cached)
+        finally:
+            server.terminate()
+            server.wait()
+
+        throughput = len(latencies) / args.duration
+        baseline = baseline or throughput
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(
+            f"{workers:>8}{throughput:>10,.0f}{p50:>9.2f}{p99:>9.2f}"
+            f"{throughput / baseline:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
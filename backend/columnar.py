@@ -0,0 +1,82 @@
+"""
+Columnar binary encodings for bulk API responses.
+
+Two formats are offered next to the default JSON body:
+
+* ``application/vnd.apache.arrow.stream`` -- an Arrow IPC stream holding one
+  record batch; numeric columns are handed to Arrow straight from their numpy
+  buffers (requires the optional ``pyarrow`` package).
+* ``application/x-float32-columns`` -- raw little-endian float32 values, one
+  column after another (column-major). The ``X-Columns`` header lists the
+  column names as a JSON array and ``X-Rows`` gives the column length, so
+  column ``i`` occupies bytes ``[4 * i * rows, 4 * (i + 1) * rows)``.
+"""
+
+import json
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: Arrow responses are only offered when installed
+    pa = None
+
+JSON_MIMETYPE = "application/json"
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+FLOAT32_MIMETYPE = "application/x-float32-columns"
+
+
+def available_mimetypes():
+    """Return the response formats this server can produce, JSON first."""
+    mimetypes = [JSON_MIMETYPE]
+    if pa is not None:
+        mimetypes.append(ARROW_STREAM_MIMETYPE)
+    mimetypes.append(FLOAT32_MIMETYPE)
+    return mimetypes
+
+
+def negotiate(accept_mimetypes):
+    """Pick the response format for a request's Accept header (JSON by default)."""
+    return accept_mimetypes.best_match(available_mimetypes(), default=JSON_MIMETYPE)
+
+
+def encode_arrow(names, arrays, metadata=None):
+    """Encode equal-length 1-D arrays as a single-batch Arrow IPC stream."""
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(np.ascontiguousarray(array)) for array in arrays], names=names
+    )
+    if metadata:
+        batch = batch.replace_schema_metadata(metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_float32(names, arrays):
+    """Encode equal-length 1-D arrays as column-major little-endian float32."""
+    n_rows = len(arrays[0]) if arrays else 0
+    buffer = np.empty((len(arrays), n_rows), dtype="<f4")
+    for index, array in enumerate(arrays):
+        buffer[index] = array
+    headers = {"X-Columns": json.dumps(list(names)), "X-Rows": str(n_rows)}
+    return buffer.tobytes(), headers
+
+
+def encode_columns(mimetype, names, arrays, metadata=None):
+    """Encode columns in a binary mimetype, returning (body, extra headers).
+
+    ``metadata`` (str -> str) is stored in the Arrow schema, or sent as
+    ``X-<Key>`` headers for the raw float32 layout.
+    """
+    if mimetype == ARROW_STREAM_MIMETYPE:
+        return encode_arrow(names, arrays, metadata), {}
+
+    if mimetype == FLOAT32_MIMETYPE:
+        body, headers = encode_float32(names, arrays)
+        for key, value in (metadata or {}).items():
+            headers["X-" + key.replace("_", "-").title()] = value
+        return body, headers
+
+    raise ValueError(f"Unsupported columnar mimetype: {mimetype}")
@@ -0,0 +1,313 @@
+"""
+Per-prediction feature attributions computed from the exported model arrays.
+
+Attributions are additive: for every row, base_value plus the sum of the
+per-feature values equals the model output on the scale given by ``output``.
+
+* Linear models: the exact contribution coef * standardized value on the
+  log-odds scale, relative to the training mean (base value = intercept).
+* Tree ensembles: path-dependent TreeSHAP (Lundberg et al., 2018), on the
+  probability scale for the random forest and the log-odds scale for
+  gradient boosting.
+
+TreeSHAP is evaluated without recursion. Each root-to-leaf path is flattened
+once into fixed-width tables of the distinct features it splits on: the
+interval (lower, upper] a row must fall in to follow the path, and the
+fraction of training cover that does. The EXTEND and UNWIND recurrences of
+the original algorithm then run as O(depth) numpy steps over (rows, leaves,
+path position) arrays, once per pattern of satisfied conditions for paths
+of moderate depth, and per request beyond that. Short paths are padded with features
+that every row satisfies at cover fraction 1; such features are null players
+and leave the Shapley values of the others unchanged.
+"""
+
+import numpy as np
+from scipy import sparse
+
+# Rows are explained in chunks of about this many (row, path slot) elements,
+# which keeps the working arrays around 2 MB and cache friendly.
+MAX_CHUNK_ELEMENTS = 250_000
+# Paths with up to this many distinct features use precomputed tables
+# (2**depth * depth values per leaf); deeper paths are solved per request.
+TABLE_MAX_DEPTH = 10
+
+
+def held_bytes(obj):
+    """Bytes of the numpy arrays and sparse matrices an explainer holds."""
+    total = 0
+    for value in vars(obj).values():
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif sparse.issparse(value):
+            total += value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        elif isinstance(value, (PathGroup, PatternTable)):
+            total += held_bytes(value)
+    return total
+
+
+class LinearExplainer:
+    """Exact contributions of a standardized linear model."""
+
+    output = "log_odds"
+
+    def __init__(self, arrays):
+        self.mean = np.asarray(arrays["mean"], dtype=np.float64)
+        self.scale = np.asarray(arrays["scale"], dtype=np.float64)
+        self.coef = np.asarray(arrays["coef"], dtype=np.float64)
+        self.base_value = float(arrays["intercept"])
+
+    @property
+    def nbytes(self):
+        """Size of the standardization and coefficient arrays."""
+        return held_bytes(self)
+
+    def explain(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return (X - self.mean) / self.scale * self.coef
+
+
+def tree_paths(arrays):
+    """Yield (root, leaf, {feature: (lower, upper, zero_fraction)}) per leaf.
+
+    zero_fraction is the share of the node's training cover that follows the
+    path through every split on that feature.
+    """
+    feature = arrays["feature"]
+    threshold = arrays["threshold"]
+    children = arrays["children"]
+    cover = arrays["cover"]
+
+    for root in arrays["roots"].tolist():
+        stack = [(root, {})]
+        while stack:
+            node, conditions = stack.pop()
+            left, right = children[node].tolist()
+            if left == node:
+                yield root, node, conditions
+                continue
+
+            split_feature = int(feature[node])
+            split = float(threshold[node])
+            lower, upper, zero_fraction = conditions.get(
+                split_feature, (-np.inf, np.inf, 1.0)
+            )
+            for child, child_lower, child_upper in (
+                (left, lower, min(upper, split)),
+                (right, max(lower, split), upper),
+            ):
+                child_conditions = dict(conditions)
+                child_conditions[split_feature] = (
+                    child_lower,
+                    child_upper,
+                    zero_fraction * float(cover[child]) / float(cover[node]),
+                )
+                stack.append((child, child_conditions))
+
+
+def path_contributions(one, zero, leaf_value):
+    """TreeSHAP contribution of every path position, for 0/1 ``one`` fractions.
+
+    ``one`` is (..., leaves, depth), ``zero`` and ``leaf_value`` are per leaf.
+    Runs the EXTEND and UNWIND recurrences of the original algorithm with all
+    leaves, rows and path positions in one array per step.
+    """
+    depth = zero.shape[-1]
+    one = np.broadcast_to(one, np.broadcast_shapes(one.shape, zero.shape)).astype(np.float64)
+
+    # EXTEND: position 0 is the usual (1, 1) root element, then one path
+    # feature per step. weights[..., k] is the permutation weight of
+    # subsets of size k.
+    weights = np.zeros(one.shape[:-1] + (depth + 1,))
+    weights[..., 0] = 1.0
+    for step in range(1, depth + 1):
+        k = np.arange(step + 1)
+        previous = weights[..., : step + 1].copy()
+        extended = zero[..., step - 1, None] * previous * ((step - k) / (step + 1))
+        extended[..., 1:] += one[..., step - 1, None] * previous[..., :-1] * (k[1:] / (step + 1))
+        weights[..., : step + 1] = extended
+
+    # UNWIND every path position at once: the weight sum with it removed.
+    unwound_one = np.zeros_like(one)
+    unwound_zero = np.zeros_like(one)
+    next_one_portion = weights[..., depth, None]
+    for k in range(depth - 1, -1, -1):
+        weight = weights[..., k, None]
+        tmp = next_one_portion / (k + 1)
+        unwound_one += tmp
+        next_one_portion = weight - tmp * zero * (depth - k)
+        unwound_zero += weight / (zero * (depth - k))
+    unwound = np.where(one > 0, unwound_one, unwound_zero) * (depth + 1)
+
+    return unwound * (one - zero) * leaf_value[:, None]
+
+
+class PathGroup:
+    """Fixed-width tables for a set of root-to-leaf paths."""
+
+    def __init__(self, paths, leaf_weight):
+        self.path_depth = np.array([len(conditions) for _, _, conditions, _ in paths])
+        depth = max(1, int(self.path_depth.max()))
+        n_leaves = len(paths)
+
+        self.depth = depth
+        self.feature = np.zeros((n_leaves, depth), dtype=np.intp)
+        self.lower = np.full((n_leaves, depth), -np.inf)
+        self.upper = np.full((n_leaves, depth), np.inf)
+        self.zero = np.ones((n_leaves, depth))
+        self.leaf_value = np.empty(n_leaves)
+        for index, (_, _, conditions, value) in enumerate(paths):
+            for position, (split_feature, (lower, upper, zero_fraction)) in enumerate(
+                conditions.items()
+            ):
+                self.feature[index, position] = split_feature
+                self.lower[index, position] = lower
+                self.upper[index, position] = upper
+                self.zero[index, position] = zero_fraction
+            self.leaf_value[index] = leaf_weight * value
+
+    def one(self, X):
+        """(rows, leaves, depth) flags: does the row follow each path split."""
+        values = X[:, self.feature]
+        return (values > self.lower) & (values <= self.upper)
+
+
+class PatternTable:
+    """Contributions of every satisfied-condition pattern of every path.
+
+    With 0/1 one-fractions, a leaf's contributions depend only on which of
+    its path conditions a row satisfies, so the recurrences are solved once
+    per pattern and explaining a row becomes comparisons and table lookups.
+    Slots are the (leaf, position) pairs of real path conditions, leaf-major.
+    """
+
+    def __init__(self, group):
+        positions = np.arange(group.depth)
+        path_depth = group.path_depth
+        sizes = (1 << path_depth) * path_depth
+        leaf_offset = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.values = np.zeros(int(sizes.sum()))
+
+        for depth in np.unique(path_depth):
+            leaves = np.flatnonzero(path_depth == depth)
+            patterns = np.arange(1 << depth)[:, None]
+            # Padding positions are always satisfied (null players).
+            one = ((patterns >> positions) & 1) | (positions >= depth)
+            contributions = path_contributions(
+                one[:, None, :], group.zero[leaves], group.leaf_value[leaves]
+            )[..., :depth]
+            width = (1 << depth) * depth
+            self.values[leaf_offset[leaves][:, None] + np.arange(width)] = (
+                contributions.transpose(1, 0, 2).reshape(len(leaves), width)
+            )
+
+        slot_leaf, slot_position = np.nonzero(positions < path_depth[:, None])
+        n_slots = len(slot_leaf)
+        self.slot_leaf = slot_leaf
+        self.slot_position = slot_position.astype(np.int32)
+        self.slot_feature = group.feature[slot_leaf, slot_position]
+        self.slot_lower = group.lower[slot_leaf, slot_position]
+        self.slot_upper = group.upper[slot_leaf, slot_position]
+        self.leaf_offset = leaf_offset.astype(np.int32)
+        self.leaf_stride = path_depth.astype(np.int32)
+        # Sparse (leaves, slots) bit weights: pattern = bits @ satisfied flags.
+        self.pattern_bits = sparse.csr_matrix(
+            (np.ldexp(1.0, slot_position), (slot_leaf, np.arange(n_slots))),
+            shape=(len(path_depth), n_slots),
+        )
+
+    def explain(self, X):
+        """Return (slots, rows) contributions of every path condition."""
+        values = X[:, self.slot_feature]
+        one = ((values > self.slot_lower) & (values <= self.slot_upper)).astype(np.float64)
+        pattern = (self.pattern_bits @ one.T).astype(np.int32)
+        index = (self.leaf_offset[:, None] + pattern * self.leaf_stride[:, None]).take(
+            self.slot_leaf, axis=0
+        )
+        return self.values.take(index + self.slot_position[:, None])
+
+
+class TreeExplainer:
+    """Path-dependent TreeSHAP over a forest or boosting export.
+
+    Paths of up to TABLE_MAX_DEPTH distinct features are served from a
+    PatternTable; deeper paths run the recurrences per request.
+    """
+
+    def __init__(self, arrays):
+        kind = str(arrays["kind"])
+        n_features = len(arrays["mean"])
+        if kind == "forest":
+            self.output = "probability"
+            leaf_weight = 1.0 / len(arrays["roots"])
+            base_value = 0.0
+        else:
+            self.output = "log_odds"
+            leaf_weight = float(arrays["learning_rate"])
+            base_value = float(arrays["init"])
+
+        cover = arrays["cover"]
+        value = arrays["value"]
+        shallow, deep = [], []
+        for root, leaf, conditions in tree_paths(arrays):
+            leaf_value = float(value[leaf])
+            base_value += leaf_weight * leaf_value * float(cover[leaf]) / float(cover[root])
+            if conditions:  # a single-leaf tree only shifts the base value
+                path = (root, leaf, conditions, leaf_value)
+                (shallow if len(conditions) <= TABLE_MAX_DEPTH else deep).append(path)
+        self.base_value = base_value
+        self.n_features = n_features
+
+        self.table = None
+        if shallow:
+            self.table = PatternTable(PathGroup(shallow, leaf_weight))
+            self.table_scatter = feature_scatter(self.table.slot_feature, n_features)
+
+        self.deep = None
+        if deep:
+            self.deep = PathGroup(deep, leaf_weight)
+            self.deep_scatter = feature_scatter(self.deep.feature.ravel(), n_features)
+
+    @property
+    def nbytes(self):
+        """Size of the precomputed tables, counted against the model memory budget."""
+        return held_bytes(self)
+
+    def explain(self, X):
+        # Rows are compared at float32 precision, as the trees are evaluated.
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        result = np.zeros((len(X), self.n_features))
+
+        width = 1
+        if self.table is not None:
+            width += len(self.table.slot_leaf)
+        if self.deep is not None:
+            width += self.deep.feature.size * (self.deep.depth + 1)
+        rows_per_chunk = max(1, MAX_CHUNK_ELEMENTS // width)
+
+        for start in range(0, len(X), rows_per_chunk):
+            chunk = X[start : start + rows_per_chunk]
+            if self.table is not None:
+                result[start : start + len(chunk)] += (self.table_scatter @ self.table.explain(chunk)).T
+            if self.deep is not None:
+                contributions = path_contributions(
+                    self.deep.one(chunk), self.deep.zero, self.deep.leaf_value
+                )
+                result[start : start + len(chunk)] += (
+                    self.deep_scatter @ contributions.reshape(len(chunk), -1).T
+                ).T
+        return result
+
+
+def feature_scatter(slot_feature, n_features):
+    """Sparse (features, slots) indicator summing slot values per feature."""
+    return sparse.csr_matrix(
+        (np.ones(len(slot_feature)), (slot_feature, np.arange(len(slot_feature)))),
+        shape=(n_features, len(slot_feature)),
+    )
+
+
+def build_explainer(arrays):
+    """Return the explainer for a model exported by inference.export_pipeline()."""
+    if str(arrays["kind"]) == "linear":
+        return LinearExplainer(arrays)
+    return TreeExplainer(arrays)
@@ -0,0 +1,218 @@
+"""
+Precomputed feature schema for assembling model inputs.
+
+FeatureSchema is built once from the training metadata and feature stats. It
+holds the training feature order, a name -> column index and the default
+(mean) vector, so a request's input is a copy of the defaults plus indexed
+writes for the supplied keys, for one row or N rows alike.
+
+Clients may spell a feature the way sklearn's load_breast_cancer() does
+("mean radius"), the way the CSV does ("radius_mean") or by its display
+label ("Average Radius"). Every known spelling is precompiled into one
+alias table, so resolving a key is a single dict lookup.
+"""
+
+import numpy as np
+
+# sklearn feature names -> training column names (used by training.py).
+COLUMN_RENAME_MAP = {
+    "mean radius": "radius_mean",
+    "mean texture": "texture_mean",
+    "mean perimeter": "perimeter_mean",
+    "mean area": "area_mean",
+    "mean smoothness": "smoothness_mean",
+    "mean compactness": "compactness_mean",
+    "mean concavity": "concavity_mean",
+    "mean concave points": "concave_points_mean",
+    "mean symmetry": "symmetry_mean",
+    "mean fractal dimension": "fractal_dimension_mean",
+
+    "radius error": "radius_se",
+    "texture error": "texture_se",
+    "perimeter error": "perimeter_se",
+    "area error": "area_se",
+    "smoothness error": "smoothness_se",
+    "compactness error": "compactness_se",
+    "concavity error": "concavity_se",
+    "concave points error": "concave_points_se",
+    "symmetry error": "symmetry_se",
+    "fractal dimension error": "fractal_dimension_se",
+
+    "worst radius": "radius_worst",
+    "worst texture": "texture_worst",
+    "worst perimeter": "perimeter_worst",
+    "worst area": "area_worst",
+    "worst smoothness": "smoothness_worst",
+    "worst compactness": "compactness_worst",
+    "worst concavity": "concavity_worst",
+    "worst concave points": "concave_points_worst",
+    "worst symmetry": "symmetry_worst",
+    "worst fractal dimension": "fractal_dimension_worst",
+}
+
+
+# Training column names -> display labels, saved into metadata.pkl.
+FEATURE_LABELS = {
+    "radius_mean": "Average Radius",
+    "texture_mean": "Average Texture",
+    "perimeter_mean": "Average Perimeter",
+    "area_mean": "Average Area",
+    "smoothness_mean": "Average Smoothness",
+    "compactness_mean": "Average Compactness",
+    "concavity_mean": "Average Concavity",
+    "concave_points_mean": "Average Concave Points",
+    "symmetry_mean": "Average Symmetry",
+    "fractal_dimension_mean": "Average Fractal Dimension",
+
+    "radius_se": "Radius Variation",
+    "texture_se": "Texture Variation",
+    "perimeter_se": "Perimeter Variation",
+    "area_se": "Area Variation",
+    "smoothness_se": "Smoothness Variation",
+    "compactness_se": "Compactness Variation",
+    "concavity_se": "Concavity Variation",
+    "concave_points_se": "Concave Points Variation",
+    "symmetry_se": "Symmetry Variation",
+    "fractal_dimension_se": "Fractal Dimension Variation",
+
+    "radius_worst": "Largest Radius",
+    "texture_worst": "Roughest Texture",
+    "perimeter_worst": "Largest Perimeter",
+    "area_worst": "Largest Area",
+    "smoothness_worst": "Highest Smoothness",
+    "compactness_worst": "Highest Compactness",
+    "concavity_worst": "Highest Concavity",
+    "concave_points_worst": "Most Concave Points",
+    "symmetry_worst": "Highest Symmetry",
+    "fractal_dimension_worst": "Highest Fractal Dimension",
+}
+
+
+def normalize_feature_name(name):
+    """Fold case and separators, e.g. "Concave points_mean" -> "concave_points_mean"."""
+    return "_".join(str(name).lower().replace("-", " ").replace("_", " ").split())
+
+
+def build_feature_lookup(feature_names, aliases=None):
+    """Map every known spelling of feature_names to its column index.
+
+    Exact spellings first, then their normalized forms; canonical names win
+    over aliases and the first alias wins over later conflicts.
+    """
+    index = {feature: column for column, feature in enumerate(feature_names)}
+    lookup = dict(index)
+    for feature, column in index.items():
+        lookup.setdefault(normalize_feature_name(feature), column)
+    for alias, feature in (aliases or {}).items():
+        column = lookup.get(feature)
+        if column is None:
+            column = lookup.get(normalize_feature_name(feature))
+        if column is not None:
+            lookup.setdefault(alias, column)
+            lookup.setdefault(normalize_feature_name(alias), column)
+    return lookup
+
+
+def lookup_feature(lookup, feature):
+    """Return the column index of any known spelling of a feature, else None."""
+    column = lookup.get(feature)
+    if column is None and isinstance(feature, str):
+        column = lookup.get(normalize_feature_name(feature))
+    return column
+
+
+def feature_aliases(feature_labels=None):
+    """Map every alternative feature spelling to the name it stands for."""
+    aliases = dict(COLUMN_RENAME_MAP)
+    for feature, label in (feature_labels or {}).items():
+        aliases[label] = feature
+    return aliases
+
+
+class FeatureSchema:
+    """Training feature order, column index and default values."""
+
+    def __init__(self, feature_names, feature_stats, aliases=None):
+        if not feature_names:
+            raise ValueError("Metadata is missing feature_names")
+
+        missing_stats = [
+            feature
+            for feature in feature_names
+            if feature not in feature_stats or "mean" not in feature_stats[feature]
+        ]
+        if missing_stats:
+            raise ValueError(
+                f"Feature stats missing for features: {', '.join(missing_stats)}"
+            )
+
+        self.feature_names = list(feature_names)
+        self.index = {feature: column for column, feature in enumerate(feature_names)}
+        self.defaults = np.array(
+            [float(feature_stats[feature]["mean"]) for feature in feature_names]
+        )
+        self.defaults.flags.writeable = False
+
+        self.lookup = build_feature_lookup(feature_names, aliases)
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def column(self, feature):
+        """Return the column index for any known spelling of a feature, else None."""
+        return lookup_feature(self.lookup, feature)
+
+    def unknown_features(self, features):
+        """Return the keys that do not resolve to a feature, in first-seen order."""
+        return list(dict.fromkeys(f for f in features if self.column(f) is None))
+
+    def fill_defaults(self, input_matrix):
+        """Replace missing (None/NaN) entries with the feature means, in place."""
+        np.copyto(
+            input_matrix,
+            np.broadcast_to(self.defaults, input_matrix.shape),
+            where=np.isnan(input_matrix),
+        )
+        return input_matrix
+
+    def build_row(self, feature_values):
+        """Return a 1 x n_features input from a feature dict."""
+        return self.build_rows([feature_values])
+
+    def build_rows(self, rows):
+        """Return an N x n_features input from a list of feature dicts.
+
+        Keys may use any known spelling; unknown keys are ignored (see
+        unknown_features) and missing or null values take the mean.
+        """
+        input_matrix = np.tile(self.defaults, (len(rows), 1))
+        entries = [
+            (row_index, column, value)
+            for row_index, feature_values in enumerate(rows)
+            for feature, value in feature_values.items()
+            if (column := self.column(feature)) is not None
+        ]
+        if entries:
+            row_index, columns, values = zip(*entries)
+            input_matrix[row_index, columns] = np.array(values, dtype=float)
+        return self.fill_defaults(input_matrix)
+
+    def build_columns(self, columns):
+        """Return an N x n_features input from feature name -> value lists."""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        n_rows = lengths.pop() if lengths else 0
+
+        input_matrix = np.tile(self.defaults, (n_rows, 1))
+        supplied = {
+            feature: column
+            for feature in columns
+            if (column := self.column(feature)) is not None
+        }
+        if supplied and n_rows:
+            input_matrix[:, list(supplied.values())] = np.array(
+                [columns[feature] for feature in supplied], dtype=float
+            ).T
+        return self.fill_defaults(input_matrix)
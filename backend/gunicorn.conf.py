@@ -0,0 +1,76 @@
+"""
+Production gunicorn settings: python -m gunicorn --config gunicorn.conf.py app:app
+
+The app is preloaded, so load_models() runs once in the master. Models and
+caches are warmed before forking, and workers share those pages copy-on-write.
+Worker and thread counts come from the available cores and can be overridden
+with WEB_CONCURRENCY / GUNICORN_THREADS. Workers are recycled gracefully after
+a jittered number of requests to bound memory growth. Each worker watches
+models/CURRENT and swaps in newly published versions on its own.
+"""
+
+import gc
+import os
+
+# Load every model in the master instead of lazily in each worker.
+os.environ.setdefault("PRELOAD_MODELS", "1")
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+preload_app = True
+
+# Scoring is CPU-bound numpy work: one process per core, plus a few threads
+# each to overlap request parsing and network I/O.
+workers = int(os.environ.get("WEB_CONCURRENCY", available_cores()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")
+errorlog = "-"
+
+
+def when_ready(server):
+    """Warm the shared caches in the master so workers inherit them."""
+    import app
+
+    if app.models:
+        app.get_dataset_cache()
+    server.log.info("Models and dataset cache loaded in master")
+
+
+def pre_fork(server, worker):
+    # Move everything allocated so far out of the GC's reach so collections in
+    # the workers do not write to (and un-share) the preloaded pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Restart per-process threads that do not survive fork()."""
+    import threading
+
+    import app
+
+    # A reload running in the master at fork time would leave its locks held.
+    app.model_set_lock = threading.Lock()
+    app.reload_lock = threading.Lock()
+    app.reload_watcher = None
+    app.start_reload_watcher()
+    app.scoring_pool = None
+    # Start counting from zero; series are labelled with this worker's pid.
+    app.metrics_registry.reset()
+    if app.micro_batcher is not None:
+        app.micro_batcher = None
+        app.enable_micro_batching(app.MICRO_BATCH_WINDOW_MS, app.MICRO_BATCH_MAX_ROWS)
@@ -0,0 +1,164 @@
+"""
+Incremental model updates from rows appended to the training CSV.
+
+A full training run (training.run) saves training_state.pkl next to the
+models. It holds running feature statistics, class counts and the byte offset
+the CSV was read up to. update() seeks past that offset and parses only the
+new rows. Then it:
+
+* merges them into the feature statistics (RunningStats) and class counts,
+* updates the scaler with StandardScaler.partial_fit and continues the linear
+  model with SGD logistic-regression steps over the new rows,
+* adds warm-started trees (random forest) and boosting stages (gradient
+  boosting) fitted on the new rows, as many per row as the full run used,
+
+and publishes the result as a new artifact version. The cost scales with the
+number of new rows, not with the history. The updated models are
+approximations of a full refit: the hyperparameters are not re-tuned, appended
+rows are all used for training, and the ensembles grow with every update.
+Schedule a full run of train_models.py periodically.
+"""
+
+import io
+import math
+import os
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+
+import artifacts
+import ingest
+import training
+from inference import MODEL_NAMES
+
+# Passes of SGD over the new rows per update, and its constant step size
+# (small enough not to undo the fitted weights on a handful of rows).
+LINEAR_EPOCHS = 5
+LINEAR_LEARNING_RATE = 0.01
+
+
+def read_appended_rows(csv_path, source):
+    """Return (X, y, new source position) for the rows past ``source``.
+
+    Raises ValueError when the CSV was rewritten rather than appended to.
+    """
+    offset = source["offset"]
+    with open(csv_path, "rb") as csv_file:
+        header = csv_file.readline()
+        size = csv_file.seek(0, os.SEEK_END)
+        if size < offset or training.tail_digest(csv_file, offset) != source["tail_sha256"]:
+            raise ValueError(
+                f"{csv_path} was modified before its last-read offset; run a full retrain"
+            )
+        csv_file.seek(offset)
+        appended = csv_file.read()
+        position = {"offset": size, "tail_sha256": training.tail_digest(csv_file, size)}
+
+    if not appended.strip():
+        return None, None, position
+    X, y = ingest.read_csv(io.BytesIO(header + appended)).frame()
+    return X, y, position
+
+
+def update_linear(pipeline, X, y, n_train_rows):
+    """Fold new rows into the scaler and linear classifier in place."""
+    scaler = pipeline.named_steps["scaler"]
+    scaler.partial_fit(X)
+    X_scaled = scaler.transform(X)
+
+    classifier = pipeline.named_steps["classifier"]
+    if isinstance(classifier, SGDClassifier):
+        for _ in range(LINEAR_EPOCHS):
+            classifier.partial_fit(X_scaled, y)
+        return
+
+    # First update of a LogisticRegression: continue from its weights with
+    # SGD on the same objective (alpha = 1 / (C * n) matches its L2 penalty).
+    sgd = SGDClassifier(
+        loss="log_loss",
+        alpha=1.0 / (classifier.C * n_train_rows),
+        learning_rate="constant",
+        eta0=LINEAR_LEARNING_RATE,
+        max_iter=LINEAR_EPOCHS,
+        tol=None,
+        random_state=training.RANDOM_STATE,
+    )
+    sgd.fit(X_scaled, y, coef_init=classifier.coef_, intercept_init=classifier.intercept_)
+    pipeline.steps[-1] = ("classifier", sgd)
+
+
+def add_estimators(pipeline, X, y, estimators_per_row):
+    """Grow a forest or boosting ensemble with members fitted on the new rows."""
+    classifier = pipeline.named_steps["classifier"]
+    n_new = max(1, math.ceil(len(X) * estimators_per_row))
+    classifier.set_params(warm_start=True, n_estimators=classifier.n_estimators + n_new)
+    classifier.fit(X, y)
+    classifier.set_params(warm_start=False)
+    return n_new
+
+
+def update(csv_path=training.DEFAULT_DATA_PATH, models_dir=training.DEFAULT_MODELS_DIR):
+    """Fold rows appended since the last run into the models; return a report.
+
+    Returns None when there is nothing new. Raises ValueError when there is
+    no saved state, the CSV was rewritten or the new rows hold one class
+    (trees fitted on a single class cannot join the ensembles); the state is
+    left unchanged so the rows are picked up by a later update.
+    """
+    state = training.load_state(models_dir)
+    if state is None:
+        raise ValueError(f"No {training.STATE_FILENAME} in {models_dir}; run a full training first")
+
+    timer = training.StageTimer()
+    with timer.stage("read"):
+        X, y, position = read_appended_rows(csv_path, state["source"])
+    if X is None:
+        print("No new rows since the last training run")
+        return None
+    X = X[state["stats"].columns]
+    if y.nunique() < 2:
+        raise ValueError(
+            f"The {len(X)} new rows hold a single class; append rows of both classes"
+        )
+    print(f"Read {len(X)} new rows (history: {state['stats'].count} rows)")
+
+    with timer.stage("load"):
+        _, current_dir = artifacts.resolve(models_dir)
+        pipelines = {
+            name: joblib.load(os.path.join(current_dir, f"{name}.pkl")) for name in MODEL_NAMES
+        }
+
+    report = {"mode": "incremental", "new_rows": len(X), "models": {}}
+    with timer.stage("update"):
+        for model_name, pipeline in pipelines.items():
+            # Scored before the update: accuracy on rows the model has not seen.
+            result = {"prequential_accuracy": accuracy_score(y, pipeline.predict(X))}
+            if model_name == "logistic_regression":
+                update_linear(pipeline, X, y, state["n_train_rows"])
+            else:
+                result["added_estimators"] = add_estimators(
+                    pipeline, X, y, state["estimators_per_row"][model_name]
+                )
+                result["n_estimators"] = pipeline.named_steps["classifier"].n_estimators
+            report["models"][model_name] = result
+
+        state["stats"].update(X.to_numpy())
+        state["class_counts"] = state["class_counts"] + np.bincount(y, minlength=2)
+        state["n_train_rows"] += len(X)
+        state["source"] = position
+
+    with timer.stage("export"):
+        coef = pipelines["logistic_regression"].named_steps["classifier"].coef_[0]
+        metadata = training.build_metadata(state["stats"].columns, coef, state["class_counts"])
+        staging = artifacts.staging_dir(models_dir)
+        training.save_artifacts(staging, pipelines, state["stats"].feature_stats(), metadata)
+        training.save_state(staging, state)
+
+    for model_name, result in report["models"].items():
+        print(f"{model_name}: accuracy on new rows before update {result['prequential_accuracy']:.4f}")
+    timer.print_report()
+
+    report["stages"] = {name: round(seconds, 3) for name, seconds in timer.stages.items()}
+    return training.publish(models_dir, staging, report)
@@ -0,0 +1,264 @@
+"""
+Pure-numpy inference engine for the trained pipelines.
+
+export_pipeline() flattens a fitted scikit-learn Pipeline into plain arrays:
+the StandardScaler mean/scale, the logistic-regression coefficients, or the
+node tables of every tree in a RandomForest / GradientBoosting ensemble.
+CompiledModel scores batches straight from those arrays, skipping sklearn's
+input validation and estimator dispatch.
+
+Run directly to compile every pickled pipeline in a models directory:
+    python inference.py [models_dir]
+"""
+
+import os
+import sys
+
+import numpy as np
+from scipy.special import expit
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+MODEL_NAMES = ["logistic_regression", "random_forest", "gradient_boosting"]
+COMPILED_SUFFIX = ".bundle"
+
+
+def export_scaler(scaler, n_features):
+    """Return (mean, scale) arrays equivalent to StandardScaler.transform."""
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
+
+
+def export_trees(trees, leaf_value):
+    """Concatenate sklearn tree node tables into flat arrays.
+
+    Child indices are rewritten to global node ids and stored as an
+    (n_nodes, 2) ``children`` table of [left, right]. Leaves point to
+    themselves with an infinite threshold, so a fixed number of descent steps
+    (the maximum depth) lands every row on its leaf without branching on
+    leafness.
+    """
+    features, thresholds, children, values, covers, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        tree_ = tree.tree_
+        node_ids = np.arange(tree_.node_count) + offset
+        is_leaf = tree_.children_left == -1
+
+        features.append(np.where(is_leaf, 0, tree_.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree_.threshold))
+        children.append(
+            np.column_stack(
+                [
+                    np.where(is_leaf, node_ids, tree_.children_left + offset),
+                    np.where(is_leaf, node_ids, tree_.children_right + offset),
+                ]
+            )
+        )
+        values.append(leaf_value(tree_.value))
+        covers.append(tree_.weighted_n_node_samples)
+        roots.append(offset)
+
+        offset += tree_.node_count
+        max_depth = max(max_depth, tree_.max_depth)
+
+    return {
+        "feature": np.concatenate(features).astype(np.intp),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "children": np.concatenate(children).astype(np.intp),
+        "value": np.concatenate(values).astype(np.float64),
+        "cover": np.concatenate(covers).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.intp),
+        "max_depth": np.int32(max_depth),
+    }
+
+
+def classifier_proportion(value):
+    """Malignant-class fraction at each node of a classification tree."""
+    totals = value[:, 0, :].sum(axis=1)
+    totals[totals == 0] = 1.0
+    return value[:, 0, 1] / totals
+
+
+def export_pipeline(pipeline):
+    """Flatten a fitted Pipeline into a dict of numpy arrays."""
+    classifier = pipeline.steps[-1][1]
+    n_features = classifier.n_features_in_
+    if list(getattr(classifier, "classes_", [])) != [0, 1]:
+        raise ValueError("Only binary classifiers with classes [0, 1] are supported")
+
+    mean = np.zeros(n_features)
+    scale = np.ones(n_features)
+    for _, step in pipeline.steps[:-1]:
+        if not isinstance(step, StandardScaler):
+            raise ValueError(f"Unsupported pipeline step: {type(step).__name__}")
+        mean, scale = export_scaler(step, n_features)
+
+    arrays = {"mean": mean, "scale": scale}
+
+    if isinstance(classifier, SGDClassifier) and classifier.loss != "log_loss":
+        raise ValueError("Only log-loss SGD classifiers are supported")
+
+    if isinstance(classifier, (LogisticRegression, SGDClassifier)):
+        arrays["kind"] = np.array("linear")
+        arrays["coef"] = classifier.coef_[0].astype(np.float64)
+        arrays["intercept"] = np.float64(classifier.intercept_[0])
+        arrays["feature_importance"] = arrays["coef"]
+
+    elif isinstance(classifier, RandomForestClassifier):
+        arrays["kind"] = np.array("forest")
+        arrays.update(export_trees(classifier.estimators_, classifier_proportion))
+        arrays["feature_importance"] = classifier.feature_importances_
+
+    elif isinstance(classifier, GradientBoostingClassifier):
+        if not (classifier.init_ == "zero" or isinstance(classifier.init_, DummyClassifier)):
+            raise ValueError("Only constant GradientBoosting init estimators are supported")
+        arrays["kind"] = np.array("boosting")
+        arrays.update(
+            export_trees(classifier.estimators_[:, 0], lambda value: value[:, 0, 0])
+        )
+        arrays["init"] = np.float64(
+            classifier._raw_predict_init(np.zeros((1, n_features)))[0, 0]
+        )
+        arrays["learning_rate"] = np.float64(classifier.learning_rate)
+        arrays["feature_importance"] = classifier.feature_importances_
+
+    else:
+        raise ValueError(f"Unsupported classifier: {type(classifier).__name__}")
+
+    return arrays
+
+
+def prepare_tree_arrays(arrays):
+    """Return the node tables in the index dtype ``take`` uses, flattened once.
+
+    Exports are already stored as intp, so memory-mapped tables stay views.
+    """
+    return {
+        "feature": arrays["feature"].astype(np.intp, copy=False),
+        "threshold": arrays["threshold"],
+        "children": arrays["children"].astype(np.intp, copy=False).ravel(),
+        "roots": arrays["roots"].astype(np.intp, copy=False),
+        "max_depth": int(arrays["max_depth"]),
+    }
+
+
+def tree_leaves(trees, X):
+    """Return the (n_rows, n_trees) global leaf ids reached by each row.
+
+    ``trees`` comes from prepare_tree_arrays(). All trees advance one level
+    per step using flat ``take`` gathers; rows are compared as float32, as
+    sklearn's tree code does.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    n_rows, n_features = X.shape
+    flat_X = X.ravel()
+
+    feature = trees["feature"]
+    threshold = trees["threshold"]
+    children = trees["children"]
+    if n_rows == 1:
+        row_offsets = 0
+        nodes = trees["roots"]
+    else:
+        row_offsets = np.arange(n_rows)[:, None] * n_features
+        nodes = np.tile(trees["roots"], (n_rows, 1))
+
+    for _ in range(trees["max_depth"]):
+        values = flat_X.take(row_offsets + feature.take(nodes))
+        go_right = ~(values <= threshold.take(nodes))
+        nodes = children.take(2 * nodes + go_right)
+    return nodes.reshape(n_rows, -1)
+
+
+class CompiledModel:
+    """Scores rows from exported arrays with the sklearn predict/predict_proba API."""
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.kind = str(arrays["kind"])
+        self.feature_importance = np.asarray(arrays["feature_importance"])
+        self.trees = prepare_tree_arrays(arrays) if self.kind != "linear" else None
+
+    @property
+    def nbytes(self):
+        """Total size of the model's arrays (mapped or in memory)."""
+        return sum(np.asarray(value).nbytes for value in self.arrays.values())
+
+    def malignant_proba(self, X):
+        """Return P(malignant) for each row of X (training feature order)."""
+        arrays = self.arrays
+        X = np.asarray(X, dtype=np.float64)
+
+        if self.kind == "linear":
+            scaled = (X - arrays["mean"]) / arrays["scale"]
+            return expit(scaled @ arrays["coef"] + arrays["intercept"])
+
+        leaf_values = arrays["value"].take(tree_leaves(self.trees, X))
+        if self.kind == "forest":
+            return leaf_values.mean(axis=1)
+        return expit(arrays["init"] + arrays["learning_rate"] * leaf_values.sum(axis=1))
+
+    def predict_proba(self, X):
+        malignant = self.malignant_proba(X)
+        proba = np.empty((len(malignant), 2))
+        proba[:, 0] = 1.0 - malignant
+        proba[:, 1] = malignant
+        return proba
+
+    def predict(self, X):
+        return (self.malignant_proba(X) > 0.5).astype(int)
+
+
+def save_compiled(path, arrays):
+    """Write exported arrays to a bundle directory, one uncompressed .npy per key."""
+    os.makedirs(path, exist_ok=True)
+    for filename in os.listdir(path):
+        if filename.endswith(".npy"):
+            os.remove(os.path.join(path, filename))
+    for key, value in arrays.items():
+        np.save(os.path.join(path, key + ".npy"), np.asarray(value), allow_pickle=False)
+
+
+def load_compiled(path, mmap=True):
+    """Load a CompiledModel from a bundle directory written by save_compiled().
+
+    With ``mmap`` the arrays are memory-mapped read-only instead of copied onto
+    the heap: loading is near-instant and the pages live in the OS page cache,
+    so every worker process serving the same bundle shares one copy.
+    """
+    arrays = {}
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith(".npy"):
+            array = np.load(
+                os.path.join(path, filename),
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            arrays[filename[: -len(".npy")]] = np.asarray(array)
+    return CompiledModel(arrays)
+
+
+def compile_models_dir(models_dir):
+    """Export every known pickled pipeline in models_dir next to its .pkl."""
+    import joblib
+
+    for model_name in MODEL_NAMES:
+        pickle_path = os.path.join(models_dir, f"{model_name}.pkl")
+        if not os.path.exists(pickle_path):
+            continue
+        compiled_path = os.path.join(models_dir, model_name + COMPILED_SUFFIX)
+        save_compiled(compiled_path, export_pipeline(joblib.load(pickle_path)))
+        print(f"Saved: {compiled_path}")
+
+
+if __name__ == "__main__":
+    compile_models_dir(
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+    )
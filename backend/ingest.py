@@ -0,0 +1,249 @@
+"""
+Typed, validated ingestion of the training CSV with a memory-mapped snapshot.
+
+read_csv() parses the Wisconsin CSV in fixed-size chunks with an explicit
+dtype per column (no inference), validates every chunk (missing values,
+diagnosis codes, duplicates across the whole file) and returns a Dataset of
+numpy arrays in the schema's feature order.
+
+load() does the same once per version of the file: the parsed arrays are
+saved as a snapshot directory of uncompressed .npy files keyed on the CSV's
+SHA-256, and later calls memory-map the snapshot instead of reparsing text.
+Editing the CSV changes its hash, so a stale snapshot is never served; it is
+replaced by the next load().
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from features import COLUMN_RENAME_MAP, normalize_feature_name
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT_DIR = os.path.join(BACKEND_DIR, ".data_cache")
+
+ID_COLUMN = "id"
+TARGET_COLUMN = "diagnosis"
+TARGET_CODES = {"B": 0, "M": 1}
+# Training feature names, in model input order (as in the CSV header).
+FEATURE_COLUMNS = (
+    "radius_mean", "texture_mean", "perimeter_mean", "area_mean",
+    "smoothness_mean", "compactness_mean", "concavity_mean",
+    "concave points_mean", "symmetry_mean", "fractal_dimension_mean",
+    "radius_se", "texture_se", "perimeter_se", "area_se",
+    "smoothness_se", "compactness_se", "concavity_se",
+    "concave points_se", "symmetry_se", "fractal_dimension_se",
+    "radius_worst", "texture_worst", "perimeter_worst", "area_worst",
+    "smoothness_worst", "compactness_worst", "concavity_worst",
+    "concave points_worst", "symmetry_worst", "fractal_dimension_worst",
+)
+FEATURE_DTYPE = np.float64
+CHUNK_ROWS = 65536
+MANIFEST_FILENAME = "manifest.json"
+HASH_BLOCK_BYTES = 1 << 20
+
+
+class Dataset:
+    """Feature matrix, 0/1 target and ids of a parsed CSV."""
+
+    def __init__(self, X, y, ids, feature_names=FEATURE_COLUMNS, source_sha256=None):
+        self.X = X
+        self.y = y
+        self.ids = ids
+        self.feature_names = list(feature_names)
+        self.source_sha256 = source_sha256
+
+    def __len__(self):
+        return len(self.y)
+
+    def frame(self):
+        """Return (features DataFrame, target Series) without copying X."""
+        return (
+            pd.DataFrame(self.X, columns=self.feature_names, copy=False),
+            pd.Series(self.y, name=TARGET_COLUMN),
+        )
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        for block in iter(lambda: source_file.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def resolve_columns(header):
+    """Map each schema column to its header spelling; raise on missing ones."""
+    # Compared in normalized form, as FeatureSchema does, so "concave points_mean",
+    # "concave_points_mean" and the sklearn "mean concave points" all match.
+    by_name = {}
+    for column in header:
+        by_name.setdefault(normalize_feature_name(COLUMN_RENAME_MAP.get(column, column)), column)
+    schema = (ID_COLUMN, TARGET_COLUMN) + FEATURE_COLUMNS
+    missing = [column for column in schema if normalize_feature_name(column) not in by_name]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+    return {column: by_name[normalize_feature_name(column)] for column in schema}
+
+
+def read_csv(source, dtype=FEATURE_DTYPE, chunk_rows=CHUNK_ROWS):
+    """Parse and validate a CSV path or binary file object into a Dataset.
+
+    Raises ValueError for missing columns or unparseable values, and naming
+    the first offending line for missing values, unknown diagnosis codes and
+    duplicate rows.
+    """
+    if hasattr(source, "seek"):
+        start = source.tell()
+        header = pd.read_csv(source, nrows=0).columns
+        source.seek(start)
+    else:
+        header = pd.read_csv(source, nrows=0).columns
+    columns = resolve_columns(header)
+    dtypes = {columns[ID_COLUMN]: np.int64, columns[TARGET_COLUMN]: str}
+    dtypes.update({columns[feature]: dtype for feature in FEATURE_COLUMNS})
+
+    X_chunks, y_chunks, id_chunks = [], [], []
+    first_line = 2  # line 1 is the header
+    reader = pd.read_csv(
+        source, usecols=list(columns.values()), dtype=dtypes, chunksize=chunk_rows
+    )
+    for chunk in reader:
+        X = chunk[[columns[feature] for feature in FEATURE_COLUMNS]].to_numpy()
+        y = chunk[columns[TARGET_COLUMN]].map(TARGET_CODES)
+
+        bad = y.isna().to_numpy()
+        if bad.any():
+            line = first_line + int(np.argmax(bad))
+            raise ValueError(f"Line {line}: diagnosis must be one of {sorted(TARGET_CODES)}")
+        missing = np.isnan(X).any(axis=1)
+        if missing.any():
+            raise ValueError(f"Line {first_line + int(np.argmax(missing))}: missing feature values")
+
+        y = y.to_numpy(dtype=np.int8)
+        X_chunks.append(X)
+        y_chunks.append(y)
+        id_chunks.append(chunk[columns[ID_COLUMN]].to_numpy())
+        first_line += len(chunk)
+
+    if not X_chunks:
+        return Dataset(np.empty((0, len(FEATURE_COLUMNS)), dtype=dtype),
+                       np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int64))
+
+    X = np.concatenate(X_chunks)
+    y = np.concatenate(y_chunks)
+    duplicate = first_duplicate_row(X, y)
+    if duplicate is not None:
+        raise ValueError(f"Line {duplicate + 2}: duplicate row")
+    return Dataset(X, y, np.concatenate(id_chunks))
+
+
+def first_duplicate_row(X, y):
+    """Index of the first row equal to an earlier one (features and target).
+
+    Rows are compared as raw bytes, one fixed-width record per row, so the
+    check is a single sort rather than per-column hashing.
+    """
+    rows = np.ascontiguousarray(np.column_stack([X, y.astype(X.dtype)]))
+    records = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+    _, first_seen = np.unique(records, return_index=True)
+    if len(first_seen) == len(records):
+        return None
+    return int(np.setdiff1d(np.arange(len(records)), first_seen)[0])
+
+
+def snapshot_path(csv_path, digest, dtype, snapshot_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(snapshot_dir, f"{stem}-{np.dtype(dtype).name}-{digest[:16]}")
+
+
+def save_snapshot(path, dataset, dtype):
+    """Write arrays then the manifest into a temporary directory and rename it
+    into place, so readers see either no snapshot or a complete one."""
+    temporary = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+    for name in ("X", "y", "ids"):
+        np.save(os.path.join(temporary, name + ".npy"), getattr(dataset, name), allow_pickle=False)
+    manifest = {
+        "source_sha256": dataset.source_sha256,
+        "rows": len(dataset),
+        "dtype": np.dtype(dtype).name,
+        "feature_names": dataset.feature_names,
+    }
+    with open(os.path.join(temporary, MANIFEST_FILENAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    try:
+        os.rename(temporary, path)
+    except OSError:  # another process published the same snapshot first
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+def load_snapshot(path, digest, dtype, mmap=True):
+    """Return the snapshot's Dataset, or None if it is missing or invalid."""
+    try:
+        with open(os.path.join(path, MANIFEST_FILENAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+        arrays = {
+            name: np.load(
+                os.path.join(path, name + ".npy"),
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            for name in ("X", "y", "ids")
+        }
+    except (OSError, ValueError):
+        return None
+
+    rows = manifest.get("rows")
+    if (
+        manifest.get("source_sha256") != digest
+        or manifest.get("dtype") != np.dtype(dtype).name
+        or manifest.get("feature_names") != list(FEATURE_COLUMNS)
+        or arrays["X"].shape != (rows, len(FEATURE_COLUMNS))
+        or arrays["X"].dtype != dtype
+        or arrays["y"].shape != (rows,)
+        or arrays["ids"].shape != (rows,)
+    ):
+        return None
+    return Dataset(arrays["X"], arrays["y"], arrays["ids"], manifest["feature_names"], digest)
+
+
+def prune_snapshots(csv_path, keep, dtype, snapshot_dir):
+    """Remove snapshots of earlier versions of the same CSV and dtype."""
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    pattern = re.compile(re.escape(f"{stem}-{np.dtype(dtype).name}-") + "[0-9a-f]{16}")
+    for name in os.listdir(snapshot_dir):
+        path = os.path.join(snapshot_dir, name)
+        if pattern.fullmatch(name) and path != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load(csv_path, snapshot_dir=DEFAULT_SNAPSHOT_DIR, dtype=FEATURE_DTYPE, mmap=True):
+    """Return the CSV's Dataset, from its snapshot when one matches its hash.
+
+    Pass ``snapshot_dir=None`` to always parse the CSV.
+    """
+    digest = file_sha256(csv_path)
+    if snapshot_dir is None:
+        dataset = read_csv(csv_path, dtype)
+        dataset.source_sha256 = digest
+        return dataset
+
+    path = snapshot_path(csv_path, digest, dtype, snapshot_dir)
+    dataset = load_snapshot(path, digest, dtype, mmap)
+    if dataset is not None:
+        return dataset
+
+    dataset = read_csv(csv_path, dtype)
+    dataset.source_sha256 = digest
+    shutil.rmtree(path, ignore_errors=True)  # an invalid snapshot of this version
+    os.makedirs(snapshot_dir, exist_ok=True)
+    save_snapshot(path, dataset, dtype)
+    prune_snapshots(csv_path, path, dtype, snapshot_dir)
+    return load_snapshot(path, digest, dtype, mmap) or dataset
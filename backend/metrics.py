@@ -0,0 +1,184 @@
+"""
+Minimal Prometheus-style metrics: counters, histograms and scrape-time gauges.
+
+Metrics are plain in-process objects updated under a lock (an observation is
+a bisect and two additions), rendered on demand in the Prometheus text
+exposition format. A disabled registry turns every update into a no-op.
+
+Values are per process. Under a multi-worker server each scrape reaches one
+worker, so a registry created with ``process_label`` tags every series with
+the process id; aggregate with e.g. ``sum without (pid) (rate(...[5m]))``.
+"""
+
+import bisect
+import os
+import threading
+
+# Seconds; spans cache hits (~µs) through cold loads and large batches.
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+TEXT_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labelnames, labels, extra=""):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def add_label(labels, pair):
+    """Append one rendered ``name="value"`` pair to a rendered label set."""
+    if not pair:
+        return labels
+    return labels[:-1] + "," + pair + "}" if labels else "{" + pair + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label tuple."""
+
+    kind = "counter"
+
+    def __init__(self, registry, name, help_text, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        if not self.registry.enabled:
+            return
+        with self.registry.lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self._values.get(labels, 0)
+
+    def clear(self):
+        self._values.clear()
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield self.name, format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label tuple."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, value, labels=()):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self.registry.lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, labels=()):
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def clear(self):
+        self._series.clear()
+
+    def samples(self):
+        for labels, (bucket_counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{format_value(bound)}"'
+                yield self.name + "_bucket", format_labels(self.labelnames, labels, le), cumulative
+            yield self.name + "_sum", format_labels(self.labelnames, labels), total
+            yield self.name + "_count", format_labels(self.labelnames, labels), cumulative
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors, and renders them as text.
+
+    A collector is a callable returning ``(name, kind, help, samples)`` tuples
+    where samples is a list of ``(labels dict, value)``; it is only called
+    when /api/metrics is scraped, so it adds nothing to the request path.
+    ``process_label`` names a label holding the process id, added to every
+    series at render time.
+    """
+
+    def __init__(self, enabled=True, process_label=None):
+        self.enabled = enabled
+        self.process_label = process_label
+        self.lock = threading.Lock()
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labelnames=()):
+        metric = Counter(self, name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(self, name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def reset(self):
+        """Zero every metric (e.g. in a forked worker, so it does not report
+        the parent's counts as its own)."""
+        with self.lock:
+            for metric in self._metrics:
+                metric.clear()
+
+    def render(self):
+        process = (
+            f'{self.process_label}="{os.getpid()}"' if self.process_label else ""
+        )
+        lines = []
+        with self.lock:
+            for metric in self._metrics:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(
+                    f"{name}{add_label(labels, process)} {format_value(value)}"
+                    for name, labels, value in metric.samples()
+                )
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    rendered = add_label(
+                        format_labels(tuple(labels), tuple(labels.values())), process
+                    )
+                    lines.append(f"{name}{rendered} {format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,88 @@
+"""
+Bounded LRU + TTL cache for single-row prediction results.
+
+Entries are keyed on (model name, artifact version, quantized input vector).
+Inputs are quantized to float32, the precision the tree models compare at,
+so slider positions that differ only in float64 noise share one entry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def prediction_key(model_name, version, input_row):
+    """Build the cache key for one assembled model input row."""
+    return (model_name, version, np.asarray(input_row, dtype=np.float32).tobytes())
+
+
+class PredictionCache:
+    """Thread-safe LRU cache whose entries also expire after ttl_seconds."""
+
+    def __init__(self, max_entries=4096, ttl_seconds=3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expiry."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if self.ttl_seconds and self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + (self.ttl_seconds or 0), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
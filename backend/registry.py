@@ -0,0 +1,206 @@
+"""
+Lazy, memory-bounded model registry.
+
+ModelRegistry discovers model artifacts in a models directory (compiled
+``<name>.bundle`` directories and ``<name>.pkl`` pipelines), loads each one
+the first time it is requested and evicts the least recently used models when
+the loaded artifacts, plus anything attached to them such as attribution
+tables, exceed a memory budget. It behaves like a read-only dict of model
+name -> model, so request handlers can use it exactly like the eagerly loaded
+dict it replaces.
+"""
+
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from inference import COMPILED_SUFFIX, MODEL_NAMES
+
+# Pickles in the models directory that are not models.
+NON_MODEL_ARTIFACTS = {"metadata", "feature_stats", "top_features", "training_state"}
+
+
+def artifact_size(path):
+    """Return the on-disk size in bytes of a file or bundle directory."""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, filename)) for filename in os.listdir(path)
+        )
+    return os.path.getsize(path)
+
+
+def artifact_fingerprint(paths):
+    """Cheap version tag for a model's artifacts from file sizes and mtimes."""
+    stamps = []
+    for path in sorted(paths):
+        files = (
+            [os.path.join(path, filename) for filename in sorted(os.listdir(path))]
+            if os.path.isdir(path)
+            else [path]
+        )
+        for filename in files:
+            stat = os.stat(filename)
+            stamps.append(f"{os.path.basename(filename)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return format(zlib.crc32(";".join(stamps).encode("utf-8")), "08x")
+
+
+def discover_models(models_dir):
+    """Map model name -> artifact paths found in models_dir.
+
+    Known models keep their usual order; other variants follow alphabetically.
+    """
+    artifacts = {}
+    for filename in os.listdir(models_dir):
+        path = os.path.join(models_dir, filename)
+        if filename.endswith(COMPILED_SUFFIX) and os.path.isdir(path):
+            name = filename[: -len(COMPILED_SUFFIX)]
+        elif filename.endswith(".pkl"):
+            name = filename[: -len(".pkl")]
+        else:
+            continue
+        if name not in NON_MODEL_ARTIFACTS:
+            artifacts.setdefault(name, []).append(path)
+
+    def sort_key(name):
+        return (MODEL_NAMES.index(name) if name in MODEL_NAMES else len(MODEL_NAMES), name)
+
+    return {name: artifacts[name] for name in sorted(artifacts, key=sort_key)}
+
+
+class ModelRegistry:
+    """Dict-like view over a models directory that loads models on demand.
+
+    ``loader(models_dir, name)`` builds a model; ``on_load(name, model)`` runs
+    once per load (e.g. to precompute per-model payloads) and
+    ``on_evict(name)`` once per eviction (to drop what was built from it). A
+    budget of ``None`` keeps every loaded model warm.
+    """
+
+    def __init__(
+        self, models_dir, loader, memory_budget_bytes=None, on_load=None, on_evict=None
+    ):
+        self.models_dir = models_dir
+        self.memory_budget_bytes = memory_budget_bytes
+        self._loader = loader
+        self._on_load = on_load
+        self._on_evict = on_evict
+        self._lock = threading.Lock()
+        self._warm = OrderedDict()
+        self._artifacts = discover_models(models_dir)
+        self._versions = {
+            name: artifact_fingerprint(paths) for name, paths in self._artifacts.items()
+        }
+        self._sizes = {}
+        self._attached = {}
+        self.load_ms = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def __contains__(self, model_name):
+        return model_name in self._artifacts
+
+    def __iter__(self):
+        return iter(self._artifacts)
+
+    def __len__(self):
+        return len(self._artifacts)
+
+    def keys(self):
+        return self._artifacts.keys()
+
+    def __getitem__(self, model_name):
+        if model_name not in self._artifacts:
+            raise KeyError(model_name)
+
+        with self._lock:
+            model = self._warm.get(model_name)
+            if model is not None:
+                self._warm.move_to_end(model_name)
+                return model
+
+            start = time.perf_counter()
+            model = self._loader(self.models_dir, model_name)
+            if self._on_load is not None:
+                self._on_load(model_name, model)
+            self.load_ms[model_name] = (time.perf_counter() - start) * 1000
+            self._sizes[model_name] = self._model_size(model_name, model)
+            self.loads += 1
+
+            self._warm[model_name] = model
+            self._evict()
+            return model
+
+    def version(self, model_name):
+        """Return the artifact version tag of a model (changes when it is rebuilt)."""
+        return self._versions.get(model_name)
+
+    def attach(self, model_name, nbytes):
+        """Count nbytes built from a warm model against the budget until it is evicted.
+
+        Returns False (and counts nothing) if the model is no longer warm.
+        """
+        with self._lock:
+            if model_name not in self._warm:
+                return False
+            self._attached[model_name] = self._attached.get(model_name, 0) + int(nbytes)
+            self._evict()
+            return True
+
+    def get(self, model_name, default=None):
+        return self[model_name] if model_name in self else default
+
+    def items(self):
+        """Yield (name, model) pairs, loading cold models as they are reached."""
+        for model_name in list(self._artifacts):
+            yield model_name, self[model_name]
+
+    def values(self):
+        for _, model in self.items():
+            yield model
+
+    def warm_up(self):
+        """Load every model now (subject to the memory budget)."""
+        for model_name in self._artifacts:
+            self[model_name]
+
+    def used_bytes(self):
+        return sum(self._sizes[name] + self._attached.get(name, 0) for name in self._warm)
+
+    def _model_size(self, model_name, model):
+        """Compiled models report their array bytes; others use artifact size."""
+        nbytes = getattr(model, "nbytes", None)
+        if nbytes is not None:
+            return int(nbytes)
+        return max(artifact_size(path) for path in self._artifacts[model_name])
+
+    def _evict(self):
+        """Drop least recently used models until within budget (never the newest)."""
+        if self.memory_budget_bytes is None:
+            return
+        while self.used_bytes() > self.memory_budget_bytes and len(self._warm) > 1:
+            model_name, _ = self._warm.popitem(last=False)
+            self._attached.pop(model_name, None)
+            self.evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(model_name)
+
+    def status(self):
+        """Describe each model as warm or cold, for health reporting."""
+        return {
+            "models": {
+                name: {
+                    "state": "warm" if name in self._warm else "cold",
+                    "version": self._versions[name],
+                    "size_bytes": self._sizes.get(name),
+                    "attached_bytes": self._attached.get(name, 0),
+                    "load_ms": self.load_ms.get(name),
+                }
+                for name in self._artifacts
+            },
+            "used_bytes": self.used_bytes(),
+            "budget_bytes": self.memory_budget_bytes,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
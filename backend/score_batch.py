@@ -0,0 +1,178 @@
+"""
+Offline batch scoring of CSV/Parquet shards, without going through Flask.
+
+Every shard in the input directory is scored by a pool of worker processes.
+Each worker loads the served artifact version of backend/models (or
+$MODELS_DIR) once, exactly as the API does (same engine, feature schema and
+decision thresholds), then reads its shard in chunks and appends one row per
+case to ``<output>/<shard name>.predictions.csv``:
+
+    row,id,logistic_regression_prediction,logistic_regression_benign,...
+
+Outputs are written to a ``.part`` file and renamed when the shard is
+complete, so an interrupted run resumes from the shards not yet finished.
+
+Run with: python backend/score_batch.py INPUT_DIR OUTPUT_DIR [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import artifacts
+import streaming
+from registry import discover_models
+
+MODELS_DIR = os.environ.get(
+    "MODELS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+)
+
+SHARD_READERS = {
+    ".csv": streaming.iter_csv_chunks,
+    ".parquet": streaming.iter_parquet_chunks,
+}
+
+worker_app = None
+
+
+def find_shards(input_dir):
+    """Return the CSV/Parquet shard paths in input_dir, sorted by name."""
+    return [
+        os.path.join(input_dir, filename)
+        for filename in sorted(os.listdir(input_dir))
+        if os.path.splitext(filename)[1].lower() in SHARD_READERS
+    ]
+
+
+def output_path(output_dir, shard_path):
+    stem = os.path.splitext(os.path.basename(shard_path))[0]
+    return os.path.join(output_dir, stem + ".predictions.csv")
+
+
+def init_worker(models_dir=MODELS_DIR):
+    """Load the serving artifacts once per worker process."""
+    global worker_app
+    import app
+
+    if app.MODELS_DIR != models_dir or not app.models:
+        app.MODELS_DIR = models_dir
+        app.reload_models()
+    if not app.models:
+        raise RuntimeError("Models not loaded")
+    worker_app = app
+
+
+def score_shard(shard_path, output_dir, model_names, chunk_rows):
+    """Score one shard chunk by chunk; return (shard_path, rows, seconds)."""
+    start = time.perf_counter()
+    app = worker_app
+    # One model version per shard, even if a reload lands mid-shard.
+    model_set = app.served()
+    schema = app.call_pinned(model_set, app.get_feature_schema)
+    read_chunks = SHARD_READERS[os.path.splitext(shard_path)[1].lower()]
+
+    final_path = output_path(output_dir, shard_path)
+    partial_path = final_path + ".part"
+    n_rows = 0
+    with open(partial_path, "w", newline="") as output:
+        for ids, input_matrix in read_chunks(shard_path, schema, chunk_rows):
+            frame = {"row": range(n_rows, n_rows + len(input_matrix))}
+            if ids is not None:
+                frame["id"] = ids
+            for model_name in model_names:
+                predictions, probabilities = app.score_matrix(
+                    model_name, model_set.models[model_name], input_matrix
+                )
+                frame[f"{model_name}_prediction"] = predictions
+                frame[f"{model_name}_benign"] = probabilities[:, 0]
+                frame[f"{model_name}_malignant"] = probabilities[:, 1]
+            pd.DataFrame(frame).to_csv(output, header=n_rows == 0, index=False)
+            n_rows += len(input_matrix)
+
+    os.replace(partial_path, final_path)
+    return shard_path, n_rows, time.perf_counter() - start
+
+
+def run(
+    input_dir,
+    output_dir,
+    model_names=None,
+    workers=None,
+    chunk_rows=10000,
+    resume=True,
+    models_dir=MODELS_DIR,
+):
+    """Score every pending shard and return (rows, seconds) for this run."""
+    version, version_dir = artifacts.resolve(models_dir)
+    available = list(discover_models(version_dir))
+    if not available:
+        raise ValueError(f"No models found in {models_dir}")
+    if model_names is None:
+        model_names = available
+    missing = [model_name for model_name in model_names if model_name not in available]
+    if missing:
+        raise ValueError(f"Model {', '.join(missing)} not found in {models_dir}")
+    print(f"Scoring with model version {version}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    shards = find_shards(input_dir)
+    pending = [
+        shard
+        for shard in shards
+        if not (resume and os.path.exists(output_path(output_dir, shard)))
+    ]
+    print(f"{len(shards)} shards, {len(shards) - len(pending)} already scored")
+    if not pending:
+        return 0, 0.0
+
+    start = time.perf_counter()
+    total_rows = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(models_dir,)
+    ) as pool:
+        futures = [
+            pool.submit(score_shard, shard, output_dir, model_names, chunk_rows)
+            for shard in pending
+        ]
+        for future in as_completed(futures):
+            shard_path, n_rows, seconds = future.result()
+            total_rows += n_rows
+            print(
+                f"Scored {os.path.basename(shard_path)}: {n_rows} rows "
+                f"in {seconds:.2f}s ({n_rows / seconds if seconds else 0:,.0f} rows/s)"
+            )
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\nTotal: {total_rows} rows in {elapsed:.2f}s "
+        f"({total_rows / elapsed if elapsed else 0:,.0f} rows/s)"
+    )
+    return total_rows, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("input_dir", help="directory of .csv / .parquet shards")
+    parser.add_argument("output_dir", help="directory for per-shard prediction CSVs")
+    parser.add_argument("--models", help="comma-separated model names (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cores)")
+    parser.add_argument("--chunk-rows", type=int, default=10000, help="rows read per chunk")
+    parser.add_argument("--no-resume", action="store_true", help="rescore shards that already have output")
+    args = parser.parse_args(argv)
+
+    run(
+        args.input_dir,
+        args.output_dir,
+        model_names=args.models.split(",") if args.models else None,
+        workers=args.workers,
+        chunk_rows=args.chunk_rows,
+        resume=not args.no_resume,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Chunked readers and NDJSON rendering for streaming bulk scoring.
+
+Uploads are read incrementally in fixed-size chunks of rows, so memory use is
+bounded by the chunk size rather than the size of the case file. Each chunk
+is assembled into one input matrix through a FeatureSchema and scored in a
+single vectorized call; results are rendered as one NDJSON line per row.
+"""
+
+import json
+
+import pandas as pd
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+CSV_MIMETYPE = "text/csv"
+
+# Columns of data/breast_cancer_wisconsin.csv that are passed through, not scored.
+ID_COLUMN = "id"
+
+
+def iter_ndjson_chunks(stream, schema, chunk_rows):
+    """Yield (ids, input_matrix) for each chunk of an NDJSON byte stream.
+
+    Blank lines are skipped. At a line that is not a JSON object, the rows read
+    so far are yielded and ValueError is raised naming the line number.
+    ``ids`` is None when no row in the chunk has an id.
+    """
+    rows = []
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            if rows:
+                yield ndjson_chunk(rows, schema)
+            raise ValueError(f"Line {line_number}: {e}") from None
+
+        rows.append(row)
+        if len(rows) == chunk_rows:
+            yield ndjson_chunk(rows, schema)
+            rows = []
+
+    if rows:
+        yield ndjson_chunk(rows, schema)
+
+
+def ndjson_chunk(rows, schema):
+    ids = [row.get(ID_COLUMN) for row in rows]
+    return (ids if any(i is not None for i in ids) else None), schema.build_rows(rows)
+
+
+def iter_csv_chunks(stream, schema, chunk_rows):
+    """Yield (ids, input_matrix) for each chunk of a CSV byte stream or path.
+
+    Columns are matched by any spelling the schema accepts; others (such as
+    ``diagnosis``) are ignored and empty cells take the feature mean.
+    """
+    for chunk in pd.read_csv(stream, chunksize=chunk_rows):
+        yield frame_chunk(chunk, schema)
+
+
+def iter_parquet_chunks(path, schema, chunk_rows):
+    """Yield (ids, input_matrix) for each row batch of a Parquet file."""
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        yield frame_chunk(batch.to_pandas(), schema)
+
+
+def frame_chunk(chunk, schema):
+    """Assemble a DataFrame chunk into (ids, input_matrix)."""
+    columns = {
+        name: pd.to_numeric(chunk[name]).to_numpy(dtype=float)
+        for name in chunk.columns
+        if schema.column(name) is not None
+    }
+    ids = chunk[ID_COLUMN].tolist() if ID_COLUMN in chunk.columns else None
+    if columns:
+        return ids, schema.build_columns(columns)
+    return ids, schema.build_rows([{}] * len(chunk))
+
+
+def render_ndjson_rows(first_row, ids, results):
+    """Render one NDJSON line per row.
+
+    ``results`` maps model name -> (predictions, probabilities) for the chunk.
+    A single model is rendered flat, like /api/predict-batch results; several
+    models are nested under ``models``.
+    """
+    scored = {
+        model_name: (predictions.tolist(), probabilities[:, 0].tolist(), probabilities[:, 1].tolist())
+        for model_name, (predictions, probabilities) in results.items()
+    }
+    n_rows = len(next(iter(scored.values()))[0])
+    single = len(scored) == 1
+
+    lines = []
+    for index in range(n_rows):
+        parts = [f'"row":{first_row + index}']
+        if ids is not None:
+            parts.append(f'"id":{json.dumps(ids[index])}')
+
+        entries = []
+        for model_name, (predictions, benign, malignant) in scored.items():
+            body = (
+                f'"prediction":{predictions[index]},'
+                f'"probabilities":{{"benign":{benign[index]!r},"malignant":{malignant[index]!r}}}'
+            )
+            entries.append(body if single else f"{json.dumps(model_name)}:{{{body}}}")
+        if single:
+            parts.append(entries[0])
+        else:
+            parts.append(f'"models":{{{",".join(entries)}}}')
+        lines.append("{" + ",".join(parts) + "}\n")
+    return "".join(lines)
@@ -118,6 +118,20 @@ class TestHealthEndpoint:
         assert data['status'] == 'healthy'
         assert data['message'] == 'ok'
 
+    def test_health_reports_warm_and_cold_models(self, client):
+        """Test health lists every model with its registry state"""
+        client.post(
+            '/api/predict',
+            data=json.dumps({'model': 'logistic_regression', 'features': {}}),
+            content_type='application/json'
+        )
+        data = json.loads(client.get('/api/health').data)
+
+        models = data['registry']['models']
+        assert set(models) >= {'logistic_regression', 'random_forest', 'gradient_boosting'}
+        assert models['logistic_regression']['state'] == 'warm'
+        assert all(m['state'] in ('warm', 'cold') for m in models.values())
+
     def test_health_returns_error_when_models_not_loaded(self, client, mock_models_not_loaded):
         """Test health endpoint returns error when models fail to load"""
         # Reload app to pick up mocked state
@@ -446,6 +460,691 @@ class TestPredictAllEndpoint:
             assert response.status_code == 503
 
 
+    def test_predict_all_reports_unknown_features(self, client):
+        """Test unknown keys are reported in a header, keeping the body keyed by model"""
+        response = client.post(
+            '/api/predict-all',
+            data=json.dumps({'features': {'mean radius': 14.5, 'bogus': 1}}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        assert json.loads(response.headers['X-Unknown-Features']) == ['bogus']
+        assert len(json.loads(response.data)) == 3
+
+    def test_predict_all_reports_timings(self, client, valid_features):
+        """Test each model entry carries its scoring time"""
+        response = client.post(
+            '/api/predict-all',
+            data=json.dumps({'features': valid_features}),
+            content_type='application/json'
+        )
+
+        data = json.loads(response.data)
+        for result in data.values():
+            assert result['timing_ms'] >= 0
+
+
+class TestPredictAllParallel:
+    """Tests for PREDICT_ALL_MODE=parallel"""
+
+    def test_parallel_matches_serial(self, client, valid_features):
+        """Test fanning out over the pool returns the same predictions"""
+        body = json.dumps({'features': valid_features})
+        serial = json.loads(client.post('/api/predict-all', data=body,
+                                        content_type='application/json').data)
+
+        with patch.object(app, 'PREDICT_ALL_MODE', 'parallel'):
+            parallel = json.loads(client.post('/api/predict-all', data=body,
+                                              content_type='application/json').data)
+
+        assert list(parallel) == list(serial)
+        for model_name in serial:
+            assert parallel[model_name]['prediction'] == serial[model_name]['prediction']
+            assert parallel[model_name]['probabilities'] == serial[model_name]['probabilities']
+
+    def test_slow_model_returns_partial_results(self, client, valid_features):
+        """Test a model past the timeout is reported without blocking the others"""
+        import threading
+        release = threading.Event()
+        score_row = app.score_row
+
+        def slow_score_row(model_name, model, input_array):
+            if model_name == 'gradient_boosting':
+                release.wait(5)
+            return score_row(model_name, model, input_array)
+
+        app.prediction_cache.clear()
+        try:
+            with patch.object(app, 'PREDICT_ALL_MODE', 'parallel'), \
+                    patch.object(app, 'PREDICT_ALL_TIMEOUT', 0.2), \
+                    patch('app.score_row', side_effect=slow_score_row):
+                response = client.post(
+                    '/api/predict-all',
+                    data=json.dumps({'features': valid_features}),
+                    content_type='application/json'
+                )
+        finally:
+            release.set()
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data) == 3
+        assert data['gradient_boosting']['timed_out'] is True
+        assert 'error' in data['gradient_boosting']
+        assert 'prediction' in data['logistic_regression']
+        assert 'prediction' in data['random_forest']
+
+    def test_micro_batched_models_share_one_window(self, client, valid_features):
+        """Test predict-all queues every model on the batcher without pool threads"""
+        import time
+        body = json.dumps({'features': valid_features})
+        serial = json.loads(client.post('/api/predict-all', data=body,
+                                        content_type='application/json').data)
+        app.prediction_cache.clear()
+        batcher = app.enable_micro_batching(window_ms=200)
+        try:
+            with patch.object(app, 'get_scoring_pool', side_effect=AssertionError('pool used')):
+                start = time.perf_counter()
+                batched = json.loads(client.post('/api/predict-all', data=body,
+                                                 content_type='application/json').data)
+                elapsed = time.perf_counter() - start
+            stats = batcher.stats()
+        finally:
+            app.micro_batcher = None
+            batcher.stop()
+
+        # One 200 ms window for all three models, not one per model.
+        assert elapsed < 0.5
+        assert stats['rows'] == 3
+        assert list(batched) == list(serial)
+        for model_name in serial:
+            assert batched[model_name]['prediction'] == serial[model_name]['prediction']
+            assert batched[model_name]['probabilities'] == serial[model_name]['probabilities']
+            assert batched[model_name]['timing_ms'] >= 0
+
+    def test_micro_batched_slow_model_times_out(self, client, valid_features):
+        """Test a model stuck in the batcher is reported without blocking the others"""
+        import threading
+        release = threading.Event()
+        app.prediction_cache.clear()
+        batcher = app.enable_micro_batching(window_ms=1)
+
+        def slow_score(model_name, model, input_matrix):
+            if model_name == 'gradient_boosting':
+                release.wait(5)
+            return app.score_matrix(model_name, model, input_matrix)
+
+        batcher._score_fn = slow_score
+        try:
+            with patch.object(app, 'PREDICT_ALL_TIMEOUT', 0.2):
+                response = client.post(
+                    '/api/predict-all',
+                    data=json.dumps({'features': valid_features}),
+                    content_type='application/json'
+                )
+        finally:
+            release.set()
+            app.micro_batcher = None
+            batcher.stop()
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['gradient_boosting']['timed_out'] is True
+        assert 'prediction' in data['logistic_regression']
+        assert 'prediction' in data['random_forest']
+
+
+class TestFeatureAliases:
+    """Tests for alternative feature spellings in request payloads"""
+
+    def test_sklearn_names_match_canonical(self, client, valid_features):
+        """Test sklearn-style names score the same as the training names"""
+        schema = app.get_feature_schema()
+        canonical = {
+            schema.feature_names[schema.column(name)]: value
+            for name, value in valid_features.items()
+        }
+
+        def predict(features):
+            response = client.post(
+                '/api/predict',
+                data=json.dumps({'model': 'logistic_regression', 'features': features}),
+                content_type='application/json'
+            )
+            return json.loads(response.data)
+
+        assert len(canonical) == 30
+        assert predict(valid_features)['probabilities'] == predict(canonical)['probabilities']
+        assert predict(valid_features)['probabilities'] != predict({})['probabilities']
+
+    def test_predict_reports_unknown_features(self, client):
+        """Test unknown keys are listed in the response"""
+        response = client.post(
+            '/api/predict',
+            data=json.dumps({'features': {'Average Radius': 14.5, 'mean radiuss': 1}}),
+            content_type='application/json'
+        )
+
+        data = json.loads(response.data)
+        assert data['unknown_features'] == ['mean radiuss']
+        assert json.loads(response.headers['X-Unknown-Features']) == ['mean radiuss']
+
+    def test_known_features_not_reported(self, client, valid_features):
+        """Test fully known payloads carry no unknown_features field"""
+        response = client.post(
+            '/api/predict',
+            data=json.dumps({'features': valid_features}),
+            content_type='application/json'
+        )
+
+        assert 'unknown_features' not in json.loads(response.data)
+        assert 'X-Unknown-Features' not in response.headers
+
+    def test_batch_reports_unknown_features(self, client):
+        """Test batch payloads report unknown keys across all rows"""
+        response = client.post(
+            '/api/predict-batch',
+            data=json.dumps({'rows': [{'mean radius': 10, 'foo': 1}, {'bar': 2, 'foo': 3}]}),
+            content_type='application/json'
+        )
+
+        assert json.loads(response.data)['unknown_features'] == ['foo', 'bar']
+
+
+class TestPredictStreamEndpoint:
+    """Tests for POST /api/predict-stream"""
+
+    def test_csv_upload_matches_batch(self, client):
+        """Test the dataset CSV streams one result per row, matching predict-batch"""
+        csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'data', 'breast_cancer_wisconsin.csv')
+        with open(csv_path, 'rb') as f:
+            body = f.read()
+
+        response = client.post('/api/predict-stream?model=random_forest&chunk_rows=100',
+                               data=body, content_type='text/csv')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        import pandas as pd
+        df = pd.read_csv(csv_path)
+        columns = {f: df[f].tolist() for f in app.metadata['feature_names']}
+        batch = json.loads(client.post(
+            '/api/predict-batch',
+            data=json.dumps({'model': 'random_forest', 'columns': columns}),
+            content_type='application/json'
+        ).data)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert [line['row'] for line in lines] == list(range(len(df)))
+        assert [line['id'] for line in lines] == df['id'].tolist()
+        assert [line['probabilities'] for line in lines] == \
+            [result['probabilities'] for result in batch['results']]
+
+    def test_ndjson_all_models(self, client, valid_features):
+        """Test model=all nests every model's result per row"""
+        body = "\n".join(json.dumps(valid_features) for _ in range(3))
+
+        response = client.post('/api/predict-stream?model=all', data=body,
+                               content_type='application/x-ndjson')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert len(lines) == 3
+        assert set(lines[0]['models']) == set(app.models.keys())
+
+    def test_invalid_line_ends_stream_with_error(self, client):
+        """Test a malformed line produces a final error line"""
+        body = '{"mean radius": 12}\nnot json\n'
+
+        response = client.post('/api/predict-stream', data=body,
+                               content_type='application/x-ndjson')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert 'prediction' in lines[0]
+        assert lines[1]['row'] == 1
+        assert 'Line 2' in lines[1]['error']
+
+    def test_unsupported_content_type(self, client):
+        """Test other upload types are rejected with 415"""
+        response = client.post('/api/predict-stream', data='{}',
+                               content_type='application/json')
+
+        assert response.status_code == 415
+
+    def test_unknown_model(self, client):
+        """Test an unknown model is rejected before streaming"""
+        response = client.post('/api/predict-stream?model=nope', data='',
+                               content_type='application/x-ndjson')
+
+        assert response.status_code == 400
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /api/metrics"""
+
+    def test_metrics_format(self, client):
+        """Test the endpoint serves Prometheus text with request and stage metrics"""
+        client.post('/api/predict', data=json.dumps({'model': 'random_forest', 'features': {}}),
+                    content_type='application/json')
+
+        response = client.get('/api/metrics')
+        text = response.data.decode()
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert '# TYPE http_requests_total counter' in text
+        assert (
+            'http_requests_total{endpoint="/api/predict",method="POST",status="200",'
+            f'pid="{os.getpid()}"}}'
+        ) in text
+        pid = f'pid="{os.getpid()}"'
+        assert f'model_inference_seconds_count{{model="random_forest",stage="assemble",{pid}}}' in text
+        assert f'model_inference_seconds_count{{model="random_forest",stage="serialize",{pid}}}' in text
+        assert f'models_load_seconds{{{pid}}} ' in text
+        assert f'model_loaded{{model="random_forest",{pid}}} 1' in text
+
+    def test_request_counts_increase(self, client):
+        """Test each request increments its endpoint counter"""
+        labels = ('/api/metadata', 'GET', '200')
+        before = app.http_requests_total.value(labels)
+
+        client.get('/api/metadata')
+        client.get('/api/metadata')
+
+        assert app.http_requests_total.value(labels) - before == 2
+
+    def test_predict_proba_timed_on_cache_miss(self, client):
+        """Test predict_proba time is recorded per scored model"""
+        app.prediction_cache.clear()
+        labels = ('gradient_boosting', 'predict_proba')
+        before = app.model_inference_duration.count(labels)
+
+        client.post('/api/predict-all', data=json.dumps({'features': {'radius_mean': 9.75}}),
+                    content_type='application/json')
+
+        assert app.model_inference_duration.count(labels) - before == 1
+
+    def test_metrics_disabled(self, client):
+        """Test the endpoint is off when metrics are disabled"""
+        with patch.object(app.metrics_registry, 'enabled', False):
+            before = app.http_requests_total.value(('/api/metadata', 'GET', '200'))
+            client.get('/api/metadata')
+            response = client.get('/api/metrics')
+
+            assert response.status_code == 404
+            assert app.http_requests_total.value(('/api/metadata', 'GET', '200')) == before
+
+
+class TestAttributions:
+    """Tests for per-prediction attributions"""
+
+    def test_predict_attributions_add_up(self, client):
+        """Test base value plus attributions equals the forest's probability"""
+        response = client.post('/api/predict',
+                               data=json.dumps({'model': 'random_forest',
+                                                'features': {'radius_mean': 19.5}}),
+                               content_type='application/json')
+        data = response.get_json()
+        attributions = data['attributions']
+
+        assert attributions['output'] == 'probability'
+        assert set(attributions['values']) == set(app.metadata['feature_names'])
+        total = attributions['base_value'] + sum(attributions['values'].values())
+        assert total == pytest.approx(data['probabilities']['malignant'])
+
+    def test_predict_all_log_odds(self, client):
+        """Test linear and boosting attributions add up to the log-odds"""
+        response = client.post('/api/predict-all',
+                               data=json.dumps({'features': {'texture_mean': 25.0}}),
+                               content_type='application/json')
+        data = response.get_json()
+
+        for model_name in ('logistic_regression', 'gradient_boosting'):
+            attributions = data[model_name]['attributions']
+            malignant = data[model_name]['probabilities']['malignant']
+            total = attributions['base_value'] + sum(attributions['values'].values())
+            assert attributions['output'] == 'log_odds'
+            assert total == pytest.approx(np.log(malignant / (1 - malignant)))
+
+    def test_attributions_cached(self, client):
+        """Test a repeated input is served from the attribution cache"""
+        app.attribution_cache.clear()
+        payload = json.dumps({'model': 'gradient_boosting', 'features': {'area_mean': 812.5}})
+
+        first = client.post('/api/predict', data=payload, content_type='application/json')
+        hits = app.attribution_cache.hits
+        second = client.post('/api/predict', data=payload, content_type='application/json')
+
+        assert app.attribution_cache.hits == hits + 1
+        assert first.get_json()['attributions'] == second.get_json()['attributions']
+
+    def test_disabled(self, client):
+        """Test ATTRIBUTIONS=0 leaves attributions out"""
+        with patch.object(app, 'ATTRIBUTIONS_ENABLED', False):
+            response = client.post('/api/predict',
+                                   data=json.dumps({'model': 'random_forest', 'features': {}}),
+                                   content_type='application/json')
+
+        assert 'attributions' not in response.get_json()
+
+    def test_batch_opt_in(self, client):
+        """Test predict-batch returns one attribution row per input when asked"""
+        payload = {'model': 'gradient_boosting', 'rows': [{'radius_mean': 11.0}, {}]}
+        plain = client.post('/api/predict-batch', data=json.dumps(payload),
+                            content_type='application/json').get_json()
+        payload['attributions'] = True
+        data = client.post('/api/predict-batch', data=json.dumps(payload),
+                           content_type='application/json').get_json()
+
+        assert 'attributions' not in plain
+        assert data['attributions']['features'] == app.metadata['feature_names']
+        assert len(data['attributions']['values']) == 2
+        assert len(data['attributions']['values'][0]) == len(app.metadata['feature_names'])
+
+    def test_unsupported_model(self, client, mock_models_loaded):
+        """Test models the explainer cannot read are served without attributions"""
+        app.explainers.pop('logistic_regression', None)
+        with patch.object(app, 'score_row', return_value=(0, (0.9, 0.1))):
+            response = client.post('/api/predict',
+                                   data=json.dumps({'model': 'logistic_regression', 'features': {}}),
+                                   content_type='application/json')
+        app.explainers.pop('logistic_regression', None)
+
+        assert response.status_code == 200
+        assert 'attributions' not in response.get_json()
+
+    def test_explainers_follow_registry_evictions(self):
+        """Test attribution tables count against the budget and go with their model"""
+        with patch.object(app, 'MODEL_MEMORY_BUDGET_BYTES', 1):
+            model_set = app.load_models()
+        registry = model_set.models
+
+        def explainer_for(model_name):
+            return app.get_explainer(model_name, registry[model_name])
+
+        forest = app.call_pinned(model_set, explainer_for, 'random_forest')
+        status = registry.status()['models']['random_forest']
+        assert status['attached_bytes'] == forest.nbytes > 0
+        assert model_set.explainers['random_forest'] is forest
+
+        boosting = app.call_pinned(model_set, explainer_for, 'gradient_boosting')
+        assert 'random_forest' not in model_set.explainers
+        assert registry.status()['models']['random_forest']['attached_bytes'] == 0
+        status = registry.status()['models']['gradient_boosting']
+        assert registry.used_bytes() == status['size_bytes'] + boosting.nbytes
+
+
+class TestProfiling:
+    """Tests for opt-in request profiling and /api/profiles"""
+
+    @pytest.fixture
+    def profiling(self, tmp_path):
+        with patch.object(app, 'PROFILE_HEADER_ENABLED', True), \
+             patch.object(app, 'profile_store', app.ProfileStore(str(tmp_path))):
+            yield
+
+    def test_header_opt_in(self, client, profiling):
+        """Test X-Profile: 1 writes a profile of the request"""
+        response = client.post('/api/predict',
+                               data=json.dumps({'model': 'random_forest', 'features': {}}),
+                               content_type='application/json', headers={'X-Profile': '1'})
+        name = response.headers['X-Profile-Id']
+
+        profile = client.get(f'/api/profiles/{name}')
+        assert response.status_code == 200
+        assert name.endswith('-predict.collapsed')
+        assert profile.status_code == 200
+        assert 'predict (app.py:' in profile.data.decode()
+
+    def test_unprofiled_without_header(self, client, profiling):
+        """Test requests without the header are not profiled"""
+        response = client.get('/api/metadata')
+
+        assert 'X-Profile-Id' not in response.headers
+        assert client.get('/api/profiles').get_json()['profiles'] == []
+
+    def test_sample_rate(self, client, profiling):
+        """Test a sample rate of 1 profiles every request"""
+        with patch.object(app, 'PROFILE_SAMPLE_RATE', 1.0):
+            client.get('/api/metadata')
+            client.get('/api/health')
+            listing = client.get('/api/profiles?limit=1').get_json()
+
+        assert listing['sample_rate'] == 1.0
+        assert len(listing['profiles']) == 1
+
+    def test_disabled_by_default(self, client):
+        """Test the profile endpoints are off unless profiling is configured"""
+        response = client.get('/api/metadata', headers={'X-Profile': '1'})
+
+        assert 'X-Profile-Id' not in response.headers
+        assert client.get('/api/profiles').status_code == 404
+
+    def test_unknown_profile(self, client, profiling):
+        """Test unknown or unsafe profile names return 404"""
+        assert client.get('/api/profiles/missing.collapsed').status_code == 404
+        assert client.get('/api/profiles/..%2Fapp.py').status_code == 404
+
+
+# ============================================================================
+# Tests for the prediction cache
+# ============================================================================
+
+class TestPredictionCaching:
+    """Tests for cached /api/predict and /api/predict-all results"""
+
+    def test_repeated_predict_skips_model(self, client):
+        """Test a repeated input is served from the cache without scoring"""
+        app.prediction_cache.clear()
+        body = json.dumps({'model': 'random_forest', 'features': {'radius_mean': 17.25}})
+
+        with patch('app.score_matrix', wraps=app.score_matrix) as scorer:
+            first = client.post('/api/predict', data=body, content_type='application/json')
+            second = client.post('/api/predict', data=body, content_type='application/json')
+
+        assert scorer.call_count == 1
+        assert json.loads(first.data) == json.loads(second.data)
+
+    def test_cache_stats_endpoint(self, client):
+        """Test hit/miss counters are exposed"""
+        app.prediction_cache.clear()
+        body = json.dumps({'features': {'radius_mean': 11.125}})
+        before = json.loads(client.get('/api/cache-stats').data)['prediction_cache']
+
+        client.post('/api/predict-all', data=body, content_type='application/json')
+        client.post('/api/predict-all', data=body, content_type='application/json')
+        after = json.loads(client.get('/api/cache-stats').data)['prediction_cache']
+
+        assert after['misses'] - before['misses'] == 3
+        assert after['hits'] - before['hits'] == 3
+        assert 'evictions' in after
+
+    def test_cache_key_includes_model_version(self, client):
+        """Test predictions are keyed on the served version and the model name"""
+        app.prediction_cache.clear()
+        client.post('/api/predict', data=json.dumps({'model': 'random_forest', 'features': {}}),
+                    content_type='application/json')
+        input_array, _ = app.build_input_array({})
+
+        assert app.model_version_id is not None
+        assert app.cache_key('random_forest', input_array) == app.prediction_key(
+            'random_forest', app.model_version_id, input_array
+        )
+        assert app.prediction_cache.get(app.cache_key('random_forest', input_array))
+        assert app.prediction_cache.get(app.cache_key('gradient_boosting', input_array)) is None
+
+
+# ============================================================================
+# Tests for /api/predict-batch
+# ============================================================================
+
+class TestPredictBatchEndpoint:
+    """Tests for POST /api/predict-batch"""
+
+    def test_predict_batch_rows(self, client):
+        """Test batch scoring of row dicts returns one result per row"""
+        rows = [
+            {f: app.feature_stats[f]['min'] for f in app.metadata['feature_names']},
+            {f: app.feature_stats[f]['max'] for f in app.metadata['feature_names']},
+            {},
+        ]
+        response = client.post(
+            '/api/predict-batch',
+            data=json.dumps({'model': 'random_forest', 'rows': rows}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['count'] == 3
+        assert len(data['results']) == 3
+        assert 'feature_importance' in data
+        for result in data['results']:
+            assert result['prediction'] in [0, 1]
+            probs = result['probabilities']
+            assert probs['benign'] + probs['malignant'] == pytest.approx(1.0)
+
+    def test_predict_batch_matches_single_predict(self, client):
+        """Test batch results equal the single-row endpoint for each row"""
+        features = app.metadata['feature_names']
+        rows = [
+            {f: app.feature_stats[f]['mean'] * scale for f in features}
+            for scale in (0.5, 1.0, 1.5)
+        ]
+        response = client.post(
+            '/api/predict-batch',
+            data=json.dumps({'model': 'gradient_boosting', 'rows': rows}),
+            content_type='application/json'
+        )
+        batch = json.loads(response.data)['results']
+
+        for row, batch_result in zip(rows, batch):
+            single = json.loads(client.post(
+                '/api/predict',
+                data=json.dumps({'model': 'gradient_boosting', 'features': row}),
+                content_type='application/json'
+            ).data)
+            assert batch_result['prediction'] == single['prediction']
+            assert batch_result['probabilities']['malignant'] == pytest.approx(
+                single['probabilities']['malignant']
+            )
+
+    def test_predict_batch_columns(self, client):
+        """Test columnar payloads are equivalent to row payloads"""
+        features = app.metadata['feature_names'][:3]
+        columns = {f: [app.feature_stats[f]['min'], app.feature_stats[f]['max']] for f in features}
+        rows = [{f: values[i] for f, values in columns.items()} for i in range(2)]
+
+        by_columns = json.loads(client.post(
+            '/api/predict-batch',
+            data=json.dumps({'columns': columns}),
+            content_type='application/json'
+        ).data)
+        by_rows = json.loads(client.post(
+            '/api/predict-batch',
+            data=json.dumps({'rows': rows}),
+            content_type='application/json'
+        ).data)
+
+        assert by_columns['results'] == by_rows['results']
+
+    def test_predict_batch_ragged_columns(self, client):
+        """Test columns of different lengths are rejected"""
+        features = app.metadata['feature_names']
+        response = client.post(
+            '/api/predict-batch',
+            data=json.dumps({'columns': {features[0]: [1.0, 2.0], features[1]: [1.0]}}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+
+    def test_predict_batch_requires_rows_or_columns(self, client):
+        """Test a payload without rows or columns is rejected"""
+        response = client.post(
+            '/api/predict-batch',
+            data=json.dumps({'model': 'logistic_regression'}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+
+    def test_predict_batch_too_large(self, client):
+        """Test batches above MAX_BATCH_ROWS are rejected"""
+        with patch('app.MAX_BATCH_ROWS', 2):
+            response = client.post(
+                '/api/predict-batch',
+                data=json.dumps({'rows': [{}, {}, {}]}),
+                content_type='application/json'
+            )
+
+        assert response.status_code == 413
+
+
+# ============================================================================
+# Tests for the shared scoring core
+# ============================================================================
+
+class TestScoreMatrix:
+    """Tests for score_matrix()"""
+
+    def test_labels_match_sklearn_predict(self):
+        """Test single-pass labels equal model.predict at the default threshold"""
+        input_matrix, _ = app.build_input_matrix(columns={
+            f: [app.feature_stats[f]['min'], app.feature_stats[f]['mean'], app.feature_stats[f]['max']]
+            for f in app.metadata['feature_names']
+        })
+
+        for model_name, model in app.models.items():
+            predictions, probabilities = app.score_matrix(model_name, model, input_matrix)
+            assert predictions.tolist() == model.predict(input_matrix).tolist()
+            assert probabilities.shape == (3, 2)
+
+    def test_per_model_threshold(self):
+        """Test a configured threshold changes the label for that model only"""
+        input_matrix, _ = app.build_input_array({})
+        model = app.models['logistic_regression']
+        malignant = model.predict_proba(input_matrix)[0, 1]
+
+        with patch.dict('app.DECISION_THRESHOLDS', {'logistic_regression': malignant - 1e-9}):
+            predictions, _ = app.score_matrix('logistic_regression', model, input_matrix)
+            assert predictions[0] == 1
+        with patch.dict('app.DECISION_THRESHOLDS', {'logistic_regression': malignant + 1e-9}):
+            predictions, _ = app.score_matrix('logistic_regression', model, input_matrix)
+            assert predictions[0] == 0
+
+    def test_feature_importance_cache_matches_models(self):
+        """Test cached importance fragments equal a fresh build from the model"""
+        features = app.metadata['feature_names']
+        for model_name, model in app.models.items():
+            expected = app.build_feature_importance(model_name, model, features)
+            cached = app.feature_importance_cache[model_name]
+            assert cached['values'] == expected
+            assert json.loads(cached['json']) == expected
+
+    def test_predict_response_uses_cached_importance(self, client):
+        """Test spliced responses are valid JSON carrying the cached importances"""
+        response = client.post(
+            '/api/predict-all',
+            data=json.dumps({'features': {}}),
+            content_type='application/json'
+        )
+
+        assert response.mimetype == 'application/json'
+        data = json.loads(response.data)
+        for model_name, result in data.items():
+            assert result['feature_importance'] == app.feature_importance_cache[model_name]['values']
+
+    def test_parse_decision_thresholds(self):
+        """Test the DECISION_THRESHOLDS env format is parsed"""
+        assert app.parse_decision_thresholds("") == {}
+        assert app.parse_decision_thresholds("random_forest=0.3, gradient_boosting=0.7") == {
+            'random_forest': 0.3,
+            'gradient_boosting': 0.7,
+        }
+
+
 # ============================================================================
 # Tests for /api/dataset
 # ============================================================================
@@ -487,6 +1186,344 @@ class TestDatasetEndpoint:
         assert unique_targets.issubset({0, 1})
 
 
+class TestDatasetCaching:
+    """Tests for the cached /api/dataset payload"""
+
+    def test_dataset_sets_etag(self, client):
+        """Test dataset responses carry a stable ETag"""
+        first = client.get('/api/dataset')
+        second = client.get('/api/dataset')
+
+        assert first.headers['ETag']
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert first.data == second.data
+
+    def test_dataset_if_none_match_returns_304(self, client):
+        """Test revalidation with a matching ETag returns 304 without a body"""
+        etag = client.get('/api/dataset').headers['ETag']
+        response = client.get('/api/dataset', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_dataset_gzip(self, client):
+        """Test gzip-accepting clients receive the precompressed body"""
+        import gzip
+
+        plain = client.get('/api/dataset')
+        response = client.get('/api/dataset', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(response.data) < len(plain.data)
+        assert gzip.decompress(response.data) == plain.data
+
+    def test_dataset_built_once(self, client):
+        """Test the dataset is loaded only on the first request"""
+        with patch('app.dataset_cache', None), \
+             patch('app.load_breast_cancer', wraps=app.load_breast_cancer) as loader:
+            client.get('/api/dataset')
+            client.get('/api/dataset')
+
+        assert loader.call_count == 1
+
+
+class TestDatasetQuery:
+    """Tests for /api/dataset projection, pagination and sampling"""
+
+    def test_dataset_column_projection(self, client):
+        """Test ?features= returns only the requested columns"""
+        full = json.loads(client.get('/api/dataset').data)
+        response = client.get('/api/dataset?features=mean radius,worst area')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['features'] == ['mean radius', 'worst area']
+        radius_idx = full['features'].index('mean radius')
+        area_idx = full['features'].index('worst area')
+        assert data['data'][5] == [full['data'][5][radius_idx], full['data'][5][area_idx]]
+        assert data['target'] == full['target']
+
+    def test_dataset_projection_accepts_feature_aliases(self, client):
+        """Test training, CSV and display-label spellings select the same columns"""
+        expected = json.loads(client.get('/api/dataset?features=mean radius,worst concave points').data)
+        for spelling in ('radius_mean,concave_points_worst',
+                         'radius_mean,concave points_worst',
+                         'Average Radius,Most Concave Points'):
+            response = client.get(f'/api/dataset?features={spelling}')
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data['features'] == ['mean radius', 'worst concave points']
+            assert data['data'] == expected['data']
+
+    def test_dataset_pagination(self, client):
+        """Test offset/limit pages walk the whole dataset"""
+        rows = []
+        offset = 0
+        while offset is not None:
+            page = json.loads(client.get(f'/api/dataset?limit=200&offset={offset}').data)
+            assert page['total'] == 569
+            rows.extend(page['indices'])
+            offset = page['next_offset']
+
+        assert rows == list(range(569))
+
+    def test_dataset_stratified_sample(self, client):
+        """Test stratified downsampling keeps the class balance"""
+        data = json.loads(client.get('/api/dataset?sample=100&features=mean radius').data)
+        full_target = json.loads(client.get('/api/dataset').data)['target']
+
+        assert len(data['data']) == 100
+        assert data['total'] == 100
+        expected_ones = round(100 * sum(full_target) / len(full_target))
+        assert abs(sum(data['target']) - expected_ones) <= 1
+        assert [full_target[i] for i in data['indices']] == data['target']
+
+    def test_dataset_sample_is_deterministic(self, client):
+        """Test the same seed returns the same sample"""
+        first = json.loads(client.get('/api/dataset?sample=50&seed=3').data)
+        second = json.loads(client.get('/api/dataset?sample=50&seed=3').data)
+
+        assert first['indices'] == second['indices']
+
+    def test_dataset_unknown_feature(self, client):
+        """Test unknown projection columns are rejected"""
+        response = client.get('/api/dataset?features=not_a_feature')
+
+        assert response.status_code == 400
+
+    def test_dataset_invalid_limit(self, client):
+        """Test malformed pagination values are rejected"""
+        assert client.get('/api/dataset?limit=abc').status_code == 400
+        assert client.get('/api/dataset?limit=0').status_code == 400
+        assert client.get('/api/dataset?offset=-1').status_code == 400
+
+    def test_dataset_query_etag(self, client):
+        """Test sliced responses revalidate with their own ETag"""
+        url = '/api/dataset?features=mean radius&limit=10'
+        etag = client.get(url).headers['ETag']
+
+        assert etag != client.get('/api/dataset').headers['ETag']
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    @pytest.mark.parametrize('url', ['/api/dataset', '/api/dataset?limit=10'])
+    @pytest.mark.parametrize('accept', ['application/json', 'application/x-float32-columns'])
+    def test_dataset_varies_on_accept(self, client, url, accept):
+        """Test every negotiated response, 304s included, is cached per Accept"""
+        response = client.get(url, headers={'Accept': accept})
+        revalidated = client.get(
+            url, headers={'Accept': accept, 'If-None-Match': response.headers['ETag']}
+        )
+
+        assert revalidated.status_code == 304
+        for cached in (response, revalidated):
+            assert {'Accept', 'Accept-Encoding'} <= set(cached.vary)
+            assert cached.cache_control.public
+            assert cached.cache_control.max_age == app.DATASET_CACHE_MAX_AGE
+
+
+class TestColumnarResponses:
+    """Tests for Arrow / raw float32 content negotiation"""
+
+    def test_dataset_float32_layout(self, client):
+        """Test the raw float32 body is column-major with named columns"""
+        full = json.loads(client.get('/api/dataset').data)
+        response = client.get(
+            '/api/dataset?features=mean radius,worst area&limit=10&offset=5',
+            headers={'Accept': 'application/x-float32-columns'}
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-float32-columns'
+        names = json.loads(response.headers['X-Columns'])
+        n_rows = int(response.headers['X-Rows'])
+        assert names == ['mean radius', 'worst area', 'target']
+        assert n_rows == 10
+
+        values = np.frombuffer(response.data, dtype='<f4').reshape(len(names), n_rows)
+        radius_idx = full['features'].index('mean radius')
+        expected = [row[radius_idx] for row in full['data'][5:15]]
+        np.testing.assert_allclose(values[0], expected, rtol=1e-6)
+        assert values[2].tolist() == full['target'][5:15]
+
+    def test_dataset_arrow_stream(self, client):
+        """Test Arrow clients receive the full dataset as an IPC stream"""
+        pa = pytest.importorskip('pyarrow')
+        full = json.loads(client.get('/api/dataset').data)
+        response = client.get(
+            '/api/dataset',
+            headers={'Accept': 'application/vnd.apache.arrow.stream'}
+        )
+
+        assert response.mimetype == 'application/vnd.apache.arrow.stream'
+        table = pa.ipc.open_stream(response.data).read_all()
+        assert table.num_rows == 569
+        assert table.column_names == full['features'] + ['target']
+        assert table.column('mean radius').to_pylist() == [row[0] for row in full['data']]
+
+    def test_predict_batch_float32(self, client):
+        """Test batch predictions can be returned as raw float32 columns"""
+        rows = [{}, {f: app.feature_stats[f]['max'] for f in app.metadata['feature_names']}]
+        body = json.dumps({'model': 'logistic_regression', 'rows': rows})
+        as_json = json.loads(client.post(
+            '/api/predict-batch', data=body, content_type='application/json'
+        ).data)
+        response = client.post(
+            '/api/predict-batch',
+            data=body,
+            content_type='application/json',
+            headers={'Accept': 'application/x-float32-columns'}
+        )
+
+        assert response.headers['X-Model'] == 'logistic_regression'
+        values = np.frombuffer(response.data, dtype='<f4').reshape(3, 2)
+        assert values[0].tolist() == [r['prediction'] for r in as_json['results']]
+        np.testing.assert_allclose(
+            values[2], [r['probabilities']['malignant'] for r in as_json['results']], rtol=1e-6
+        )
+
+    def test_json_remains_default(self, client):
+        """Test clients without a binary Accept header keep getting JSON"""
+        response = client.get('/api/dataset?limit=5', headers={'Accept': '*/*'})
+
+        assert response.mimetype == 'application/json'
+        assert len(json.loads(response.data)['data']) == 5
+
+
+# ============================================================================
+# Tests for model versions and hot reload
+# ============================================================================
+
+ADMIN_HEADERS = {'Authorization': 'Bearer secret'}
+
+
+@pytest.fixture
+def versioned_models(tmp_path):
+    """A models directory with two published versions of the served artifacts"""
+    import shutil
+    import joblib
+    import artifacts
+
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+    models_dir = str(tmp_path / 'models')
+    versions = []
+    for n_samples in (569, 570):
+        staging = artifacts.staging_dir(models_dir)
+        shutil.copytree(source, staging, dirs_exist_ok=True)
+        metadata = joblib.load(os.path.join(staging, 'metadata.pkl'))
+        metadata['n_samples'] = n_samples
+        joblib.dump(metadata, os.path.join(staging, 'metadata.pkl'))
+        versions.append(artifacts.publish(models_dir, staging))
+
+    live = app.served()
+    with patch.object(app, 'MODELS_DIR', models_dir), patch.object(app, 'ADMIN_TOKEN', 'secret'):
+        yield models_dir, versions
+    app.activate(live)
+
+
+class TestModelVersions:
+    """Tests for versioned artifacts, POST /api/admin/reload and the watcher"""
+
+    def test_responses_carry_version(self, client):
+        """Test the served version is reported in headers, health and metadata"""
+        response = client.get('/api/health')
+        assert response.headers['X-Model-Version'] == app.model_version_id
+        assert response.get_json()['model_version'] == app.model_version_id
+        assert client.get('/api/metadata').get_json()['model_version'] == app.model_version_id
+
+    def test_admin_disabled_without_token(self, client):
+        """Test the admin endpoints do not exist unless ADMIN_TOKEN is set"""
+        assert client.post('/api/admin/reload', headers=ADMIN_HEADERS).status_code == 404
+        assert client.get('/api/admin/versions', headers=ADMIN_HEADERS).status_code == 404
+
+    def test_admin_requires_token(self, client, versioned_models):
+        """Test a missing or wrong token is rejected"""
+        assert client.post('/api/admin/reload').status_code == 401
+        response = client.post('/api/admin/reload', headers={'Authorization': 'Bearer wrong'})
+        assert response.status_code == 401
+
+    def test_reload_and_rollback(self, client, versioned_models, valid_features):
+        """Test reloading CURRENT, then rolling back to an earlier version"""
+        models_dir, (first, second) = versioned_models
+        previous = app.model_version_id
+
+        response = client.post('/api/admin/reload', headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['version'] == second
+        assert data['previous_version'] == previous
+        assert data['load_ms'] > 0
+        assert client.get('/api/metadata').get_json()['n_samples'] == 570
+
+        response = client.post('/api/admin/reload', headers=ADMIN_HEADERS,
+                               data=json.dumps({'version': first}),
+                               content_type='application/json')
+        assert response.get_json()['version'] == first
+        assert app.artifacts.current_version(models_dir) == first
+
+        prediction = client.post('/api/predict',
+                                 data=json.dumps({'features': valid_features}),
+                                 content_type='application/json')
+        assert prediction.status_code == 200
+        assert prediction.headers['X-Model-Version'] == first
+        assert client.get('/api/metadata').get_json()['n_samples'] == 569
+
+        versions = client.get('/api/admin/versions', headers=ADMIN_HEADERS).get_json()
+        assert versions['current'] == first
+        assert [entry['version'] for entry in versions['versions']] == [second, first]
+
+    def test_in_flight_request_keeps_its_version(self, versioned_models):
+        """Test a request pinned before a reload finishes on the old set"""
+        _, (_, second) = versioned_models
+        with app.app.test_request_context('/api/predict'):
+            app.pin_model_set()
+            pinned = app.served()
+            app.reload_models()
+            assert app.served() is pinned
+            assert app.get_feature_schema() is not None
+        assert app.served().version == second
+        assert app.served().models is not pinned.models
+
+    def test_unknown_or_invalid_version(self, client, versioned_models):
+        """Test naming a missing or malformed version leaves the served set in place"""
+        served = app.model_version_id
+        for version, status in (('0123456789ab', 404), ('../x', 400), (5, 400)):
+            response = client.post('/api/admin/reload', headers=ADMIN_HEADERS,
+                                   data=json.dumps({'version': version}),
+                                   content_type='application/json')
+            assert response.status_code == status
+        assert app.model_version_id == served
+
+    def test_corrupted_version_is_not_served(self, client, versioned_models):
+        """Test artifacts that no longer match their manifest are refused"""
+        models_dir, (_, second) = versioned_models
+        served = app.model_version_id
+        with open(os.path.join(app.artifacts.version_path(models_dir, second), 'metadata.pkl'), 'ab') as f:
+            f.write(b'x')
+        response = client.post('/api/admin/reload', headers=ADMIN_HEADERS)
+        assert response.status_code == 400
+        assert 'metadata.pkl' in response.get_json()['error']
+        assert app.model_version_id == served
+
+    def test_concurrent_reload_conflicts(self, client, versioned_models):
+        """Test a second reload is refused while one is running"""
+        with app.reload_lock:
+            response = client.post('/api/admin/reload', headers=ADMIN_HEADERS)
+        assert response.status_code == 409
+
+    def test_watcher_picks_up_new_version(self, versioned_models):
+        """Test the watcher reloads once CURRENT changes, skipping broken versions"""
+        models_dir, (first, second) = versioned_models
+        assert app.check_for_new_version() is None
+        assert app.model_version_id == second
+        assert app.check_for_new_version() is None
+
+        app.artifacts.write_current(models_dir, first)
+        os.remove(os.path.join(app.artifacts.version_path(models_dir, first), 'metadata.pkl'))
+        assert app.check_for_new_version() == first
+        assert app.check_for_new_version(failed=first) == first
+        assert app.model_version_id == second
+
+
 # ============================================================================
 # Edge Cases and Boundary Tests
 # ============================================================================
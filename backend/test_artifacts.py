@@ -0,0 +1,111 @@
+"""
+Unit tests for versioned model artifact directories (artifacts.py)
+Run with: pytest backend/test_artifacts.py -v
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import artifacts
+
+
+def stage(models_dir, content, report="{}"):
+    """Write a small artifact set into a fresh staging directory"""
+    staging = artifacts.staging_dir(str(models_dir))
+    with open(os.path.join(staging, "metadata.pkl"), "w") as artifact_file:
+        artifact_file.write(content)
+    bundle = os.path.join(staging, "logistic_regression.bundle")
+    os.makedirs(bundle)
+    with open(os.path.join(bundle, "coef.npy"), "w") as artifact_file:
+        artifact_file.write(content * 2)
+    with open(os.path.join(staging, "training_report.json"), "w") as report_file:
+        report_file.write(report)
+    return staging
+
+
+# ============================================================================
+# Publishing
+# ============================================================================
+
+class TestPublish:
+    """Tests for sealing staging directories as versions"""
+
+    def test_publish_makes_version_current(self, tmp_path):
+        version = artifacts.publish(str(tmp_path), stage(tmp_path, "a"), {"accuracy": 0.9})
+        path = artifacts.version_path(str(tmp_path), version)
+        assert artifacts.current_version(str(tmp_path)) == version
+        assert artifacts.resolve(str(tmp_path)) == (version, path)
+
+        manifest = artifacts.verify(path)
+        assert manifest["version"] == version
+        assert manifest["metrics"] == {"accuracy": 0.9}
+        assert set(manifest["files"]) == {
+            "metadata.pkl", "logistic_regression.bundle/coef.npy", "training_report.json"
+        }
+        assert manifest["files"]["metadata.pkl"]["bytes"] == 1
+
+    def test_version_depends_on_content_only(self, tmp_path):
+        first = artifacts.publish(str(tmp_path), stage(tmp_path, "a", report='{"seconds": 1}'))
+        same = artifacts.publish(str(tmp_path), stage(tmp_path, "a", report='{"seconds": 2}'))
+        other = artifacts.publish(str(tmp_path), stage(tmp_path, "b"))
+        assert same == first
+        assert other != first
+        assert [entry["version"] for entry in artifacts.list_versions(str(tmp_path))] == [other, first]
+        # The duplicate staging directory was discarded.
+        assert sorted(os.listdir(tmp_path / artifacts.VERSIONS_DIR)) == sorted([first, other])
+
+    def test_prune_keeps_newest_and_current(self, tmp_path):
+        versions = [
+            artifacts.publish(str(tmp_path), stage(tmp_path, str(i)), keep=10) for i in range(4)
+        ]
+        artifacts.write_current(str(tmp_path), versions[0])
+        artifacts.prune(str(tmp_path), keep=2)
+        assert {entry["version"] for entry in artifacts.list_versions(str(tmp_path))} == {
+            versions[0], versions[2], versions[3]
+        }
+
+
+# ============================================================================
+# Resolving and verification
+# ============================================================================
+
+class TestResolve:
+    """Tests for finding and checking the served version"""
+
+    def test_unversioned_directory(self, tmp_path):
+        (tmp_path / "metadata.pkl").write_text("a")
+        version, path = artifacts.resolve(str(tmp_path))
+        assert path == str(tmp_path)
+        (tmp_path / "metadata.pkl").write_text("b")
+        assert artifacts.resolve(str(tmp_path))[0] != version
+
+    def test_missing_current_version(self, tmp_path):
+        artifacts.write_current(str(tmp_path), "0123456789ab")
+        with pytest.raises(FileNotFoundError, match="0123456789ab"):
+            artifacts.resolve(str(tmp_path))
+
+    def test_verify_detects_modified_files(self, tmp_path):
+        path = artifacts.version_path(str(tmp_path), artifacts.publish(str(tmp_path), stage(tmp_path, "a")))
+        with open(os.path.join(path, "logistic_regression.bundle", "coef.npy"), "a") as artifact_file:
+            artifact_file.write("tampered")
+        with pytest.raises(ValueError, match="coef.npy"):
+            artifacts.verify(path)
+
+    def test_verify_requires_manifest(self, tmp_path):
+        with pytest.raises(ValueError, match="manifest"):
+            artifacts.verify(str(tmp_path))
+
+    def test_manifest_is_json(self, tmp_path):
+        path = artifacts.version_path(str(tmp_path), artifacts.publish(str(tmp_path), stage(tmp_path, "a")))
+        with open(os.path.join(path, artifacts.MANIFEST_FILENAME)) as manifest_file:
+            assert json.load(manifest_file)["created"].endswith("+00:00")
+
+    @pytest.mark.parametrize("version", ["", "..", ".staging-x", "../CURRENT", "a/b"])
+    def test_rejects_non_id_versions(self, tmp_path, version):
+        with pytest.raises(ValueError, match="Invalid model version"):
+            artifacts.version_path(str(tmp_path), version)
@@ -0,0 +1,185 @@
+"""
+Tests for the ASGI serving mode (asgi.py)
+Run with: pytest backend/test_asgi.py -v
+"""
+
+import pytest
+import asyncio
+import json
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def asgi(monkeypatch):
+    """The asgi module, without leaking its environment defaults"""
+    monkeypatch.setenv("MICRO_BATCH_WINDOW_MS", "2")
+    import asgi
+    return asgi
+
+
+@pytest.fixture
+def valid_features_small():
+    """A few features in mixed spellings"""
+    return {"radius_mean": 17.5, "mean texture": 21.0, "Largest Area": 1200}
+
+
+@pytest.fixture
+def server(asgi):
+    """An ASGI app over the current Flask app with micro-batching enabled"""
+    import app
+    batcher = app.enable_micro_batching(window_ms=20, max_rows=64)
+    app.prediction_cache.clear()
+    yield asgi.WsgiToAsgi(app.app, max_workers=32), batcher
+    app.micro_batcher = None
+    batcher.stop()
+
+
+async def request(application, method, path, body=b"", headers=(), chunks=1):
+    """Drive one request through the ASGI app; return (status, headers, body)"""
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "http_version": "1.1", "scheme": "http", "server": ("testserver", 80),
+    }
+    size = max(1, -(-len(body) // chunks))
+    parts = [body[i:i + size] for i in range(0, len(body), size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": part, "more_body": index < len(parts) - 1}
+        for index, part in enumerate(parts)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    start = sent[0]
+    return (
+        start["status"],
+        {name.decode(): value.decode() for name, value in start["headers"]},
+        b"".join(message.get("body", b"") for message in sent[1:]),
+    )
+
+
+def post_json(payload, origin=None):
+    headers = [("content-type", "application/json")]
+    if origin:
+        headers.append(("origin", origin))
+    return json.dumps(payload).encode(), headers
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestAsgiServing:
+    """Tests for WsgiToAsgi with the micro-batcher"""
+
+    def test_predict_matches_flask(self, server, valid_features_small):
+        """Test the ASGI response equals the WSGI response"""
+        import app
+        application, _ = server
+        body, headers = post_json({"model": "random_forest", "features": valid_features_small})
+
+        status, _, content = asyncio.run(request(application, "POST", "/api/predict", body, headers))
+        expected = app.app.test_client().post("/api/predict", data=body, content_type="application/json")
+
+        assert status == 200
+        assert json.loads(content) == json.loads(expected.data)
+
+    def test_concurrent_predictions_are_batched(self, server):
+        """Test concurrent requests share model calls but keep their own results"""
+        import app
+        application, batcher = server
+        payloads = [
+            {"model": "gradient_boosting", "features": {"radius_mean": 8 + i, "texture_mean": 10 + i}}
+            for i in range(24)
+        ]
+
+        async def run_all():
+            return await asyncio.gather(*[
+                request(application, "POST", "/api/predict", *post_json(payload))
+                for payload in payloads
+            ])
+
+        responses = asyncio.run(run_all())
+        stats = batcher.stats()
+
+        assert all(status == 200 for status, _, _ in responses)
+        assert stats["rows"] == 24
+        assert stats["batches"] < 24
+        for payload, (_, _, content) in zip(payloads, responses):
+            schema = app.get_feature_schema()
+            input_array = schema.build_row(payload["features"])
+            _, probabilities = app.score_matrix("gradient_boosting", app.models["gradient_boosting"], input_array)
+            assert json.loads(content)["probabilities"]["malignant"] == pytest.approx(probabilities[0, 1])
+
+    def test_predict_all_contract(self, server):
+        """Test predict-all stays keyed by model name"""
+        import app
+        application, _ = server
+        status, _, content = asyncio.run(request(
+            application, "POST", "/api/predict-all", *post_json({"features": {"radius_mean": 15}})
+        ))
+
+        assert status == 200
+        assert set(json.loads(content)) == set(app.models.keys())
+
+    def test_errors_and_cors_pass_through(self, server):
+        """Test status codes and CORS headers come from Flask unchanged"""
+        application, _ = server
+        status, headers, content = asyncio.run(request(
+            application, "POST", "/api/predict",
+            *post_json({"model": "nope"}, origin="http://localhost:3000")
+        ))
+
+        assert status == 400
+        assert "not found" in json.loads(content)["error"]
+        assert headers["access-control-allow-origin"] == "http://localhost:3000"
+
+    def test_streamed_upload(self, server):
+        """Test a chunked NDJSON upload is read incrementally and streamed back"""
+        application, _ = server
+        body = b"".join(b'{"radius_mean": %d}\n' % (10 + i) for i in range(50))
+
+        status, headers, content = asyncio.run(request(
+            application, "POST", "/api/predict-stream",
+            body, [("content-type", "application/x-ndjson")], chunks=7
+        ))
+
+        assert status == 200
+        assert headers["content-type"].startswith("application/x-ndjson")
+        assert len(content.decode().splitlines()) == 50
+
+    def test_lifespan(self, asgi):
+        """Test startup and shutdown are acknowledged"""
+        import app
+        application = asgi.WsgiToAsgi(app.app, max_workers=1)
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(application({"type": "lifespan"}, receive, send))
+
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert app.micro_batcher is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,198 @@
+"""
+Unit tests for the micro-batching scheduler (batching.py)
+Run with: pytest backend/test_batching.py -v
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batching import MicroBatcher
+
+
+def fake_score(model_name, model, input_matrix):
+    """Malignant probability = first feature; records batch sizes on the model"""
+    model.append(len(input_matrix))
+    malignant = input_matrix[:, 0]
+    return (malignant > 0.5).astype(int), np.column_stack([1 - malignant, malignant])
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(**kwargs):
+        batcher = MicroBatcher(fake_score, **kwargs)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.stop()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher"""
+
+    def test_single_row(self, make_batcher):
+        """Test a lone request is scored after the window"""
+        batches = []
+        batcher = make_batcher(window_ms=1)
+
+        assert batcher.score("m", batches, np.array([[0.75, 0.0]])) == (1, (0.25, 0.75))
+        assert batches == [1]
+
+    def test_concurrent_rows_are_coalesced(self, make_batcher):
+        """Test rows submitted within the window share one call with their own results"""
+        batches = []
+        batcher = make_batcher(window_ms=200, max_rows=64)
+
+        futures = [batcher.submit("m", batches, np.array([[i / 10, 0.0]])) for i in range(10)]
+        results = [future.result(timeout=5) for future in futures]
+
+        assert batches == [10]
+        assert [prediction for prediction, _ in results] == [0] * 6 + [1] * 4
+        assert results[3][1] == (0.7, 0.3)
+        assert batcher.stats()["largest_batch"] == 10
+
+    def test_max_rows_flushes_early(self, make_batcher):
+        """Test a full batch is scored without waiting out the window"""
+        batches = []
+        batcher = make_batcher(window_ms=10000, max_rows=4)
+
+        futures = [batcher.submit("m", batches, np.zeros((1, 2))) for _ in range(4)]
+
+        for future in futures:
+            future.result(timeout=5)
+        assert batches == [4]
+
+    def test_models_are_batched_separately(self, make_batcher):
+        """Test each model gets its own matrix"""
+        first, second = [], []
+        batcher = make_batcher(window_ms=200)
+
+        futures = [batcher.submit("a", first, np.zeros((1, 2))) for _ in range(3)]
+        futures += [batcher.submit("b", second, np.zeros((1, 2))) for _ in range(2)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert (first, second) == ([3], [2])
+        assert batcher.stats()["batches"] == 2
+
+    def test_model_versions_are_batched_separately(self, make_batcher):
+        """Test two models under one name (old and new version) never score each other's rows"""
+        old_batches, new_batches = [], []
+        batcher = make_batcher(window_ms=200, max_rows=64)
+
+        def flipped_score(model_name, model, input_matrix):
+            predictions, probabilities = fake_score(model_name, model, input_matrix)
+            if model is new_batches:
+                return 1 - predictions, probabilities[:, ::-1]
+            return predictions, probabilities
+
+        batcher._score_fn = flipped_score
+        old_future = batcher.submit("m", old_batches, np.array([[0.75, 0.0]]))
+        new_future = batcher.submit("m", new_batches, np.array([[0.75, 0.0]]))
+
+        assert old_future.result(timeout=5) == (1, (0.25, 0.75))
+        assert new_future.result(timeout=5) == (0, (0.75, 0.25))
+        assert old_batches == [1] and new_batches == [1]
+
+    def test_errors_reach_every_caller(self, make_batcher):
+        """Test a failing batch raises in each waiting request"""
+        def failing(model_name, model, input_matrix):
+            raise ValueError("boom")
+
+        batcher = make_batcher(window_ms=50)
+        batcher._score_fn = failing
+        futures = [batcher.submit("m", None, np.zeros((1, 2))) for _ in range(2)]
+
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result(timeout=5)
+
+    def test_threads_share_batches(self, make_batcher):
+        """Test blocking callers on many threads are coalesced"""
+        batches = []
+        batcher = make_batcher(window_ms=50, max_rows=64)
+        results = []
+
+        def call():
+            results.append(batcher.score("m", batches, np.array([[0.9, 0.0]])))
+
+        threads = [threading.Thread(target=call) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 16
+        assert sum(batches) == 16
+        assert len(batches) < 16
+
+
+class TestMicroBatcherShutdown:
+    """Tests that no caller is left waiting on an unresolved future"""
+
+    def test_stop_scores_queued_rows(self, make_batcher):
+        """Test rows still in their batching window are scored on stop"""
+        batches = []
+        batcher = make_batcher(window_ms=10000, max_rows=64)
+        futures = [batcher.submit("m", batches, np.array([[0.75, 0.0]])) for _ in range(3)]
+
+        batcher.stop()
+
+        assert [future.result(timeout=0) for future in futures] == [(1, (0.25, 0.75))] * 3
+        assert sum(batches) == 3
+
+    def test_submit_after_stop_fails(self, make_batcher):
+        """Test rows submitted to a stopped batcher fail at once"""
+        batcher = make_batcher(window_ms=1)
+        batcher.stop()
+
+        with pytest.raises(RuntimeError, match="stopped"):
+            batcher.score("m", [], np.zeros((1, 2)))
+
+    def test_score_times_out(self, make_batcher):
+        """Test a caller stops waiting after timeout_seconds"""
+        release = threading.Event()
+
+        def stuck(model_name, model, input_matrix):
+            release.wait()
+            return fake_score(model_name, model, input_matrix)
+
+        batcher = make_batcher(window_ms=1, timeout_seconds=0.05)
+        batcher._score_fn = stuck
+        try:
+            with pytest.raises(TimeoutError, match="0.05s"):
+                batcher.score("m", [], np.zeros((1, 2)))
+        finally:
+            release.set()
+
+    def test_unexpected_flush_error_fails_futures(self, make_batcher):
+        """Test an error outside scoring reaches the callers and keeps the thread alive"""
+        batches = []
+        batcher = make_batcher(window_ms=1)
+        bad = batcher.submit("m", batches, np.zeros((1, 2, 3)))
+
+        with pytest.raises(TypeError):
+            bad.result(timeout=5)
+        assert batcher.score("m", batches, np.array([[0.75, 0.0]])) == (1, (0.25, 0.75))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
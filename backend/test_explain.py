@@ -0,0 +1,218 @@
+"""
+Tests for per-prediction attributions (explain.py)
+Run with: pytest backend/test_explain.py -v
+"""
+
+import pytest
+import sys
+import os
+import itertools
+import math
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+import explain
+import inference
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BACKEND_DIR, "models")
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def pipelines():
+    """The pickled sklearn pipelines"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return {
+            name: joblib.load(os.path.join(MODELS_DIR, f"{name}.pkl"))
+            for name in inference.MODEL_NAMES
+        }
+
+
+@pytest.fixture(scope="module")
+def exports(pipelines):
+    """Exported arrays of the served models"""
+    return {name: inference.export_pipeline(pipeline) for name, pipeline in pipelines.items()}
+
+
+@pytest.fixture(scope="module")
+def dataset_matrix(pipelines):
+    """A sample of dataset rows plus perturbed copies, in training feature order"""
+    df = pd.read_csv(os.path.join(BACKEND_DIR, "data", "breast_cancer_wisconsin.csv"))
+    columns = list(pipelines["logistic_regression"].feature_names_in_)
+    X = df[columns].to_numpy(dtype=float)[:100]
+    rng = np.random.default_rng(0)
+    return np.vstack([X, X * rng.uniform(0.5, 1.5, size=X.shape)])
+
+
+@pytest.fixture(scope="module")
+def small_forest(dataset_matrix):
+    """A shallow forest, small enough to enumerate feature subsets"""
+    X = dataset_matrix[:100]
+    y = (X[:, 0] > np.median(X[:, 0])).astype(int)
+    pipeline = Pipeline([
+        ("scaler", StandardScaler()),
+        ("classifier", RandomForestClassifier(n_estimators=3, max_depth=4, random_state=0)),
+    ])
+    return inference.export_pipeline(pipeline.fit(X, y))
+
+
+def single_tree(arrays, index):
+    """Arrays restricted to one tree of an ensemble, with unit leaf weight"""
+    tree = dict(arrays, roots=arrays["roots"][index : index + 1])
+    if str(arrays["kind"]) == "boosting":
+        tree.update(init=0.0, learning_rate=1.0)
+    else:
+        tree["kind"] = np.array("forest")
+    return tree
+
+
+def expected_value(arrays, node, x, subset):
+    """Path-dependent E[f(x) | x_subset], by recursion over the tree"""
+    left, right = arrays["children"][node]
+    if left == node:
+        return arrays["value"][node]
+    feature = arrays["feature"][node]
+    if feature in subset:
+        child = left if np.float32(x[feature]) <= arrays["threshold"][node] else right
+        return expected_value(arrays, child, x, subset)
+    cover = arrays["cover"]
+    return (
+        cover[left] * expected_value(arrays, left, x, subset)
+        + cover[right] * expected_value(arrays, right, x, subset)
+    ) / cover[node]
+
+
+def brute_force_shap(arrays, root, x):
+    """Exact Shapley values of the path-dependent value function"""
+    used, stack = set(), [root]
+    while stack:
+        node = stack.pop()
+        left, right = arrays["children"][node]
+        if left != node:
+            used.add(int(arrays["feature"][node]))
+            stack += [left, right]
+
+    phi = np.zeros(len(x))
+    n_used = len(used)
+    for feature in used:
+        others = sorted(used - {feature})
+        for size in range(n_used):
+            weight = math.factorial(size) * math.factorial(n_used - size - 1) / math.factorial(n_used)
+            for subset in itertools.combinations(others, size):
+                with_feature = expected_value(arrays, root, x, set(subset) | {feature})
+                without = expected_value(arrays, root, x, set(subset))
+                phi[feature] += weight * (with_feature - without)
+    return phi
+
+
+def model_output(arrays, X):
+    """The model output attributions explain: probability or raw log-odds"""
+    kind = str(arrays["kind"])
+    if kind == "linear":
+        return (X - arrays["mean"]) / arrays["scale"] @ arrays["coef"] + arrays["intercept"]
+    leaf_values = arrays["value"].take(
+        inference.tree_leaves(inference.prepare_tree_arrays(arrays), X)
+    )
+    if kind == "forest":
+        return leaf_values.mean(axis=1)
+    return arrays["init"] + arrays["learning_rate"] * leaf_values.sum(axis=1)
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestAdditivity:
+    """base_value + sum(attributions) must equal the model output"""
+
+    @pytest.mark.parametrize("model_name", inference.MODEL_NAMES)
+    def test_local_accuracy(self, exports, dataset_matrix, model_name):
+        """Test attributions add up to the prediction for every row"""
+        explainer = explain.build_explainer(exports[model_name])
+        contributions = explainer.explain(dataset_matrix)
+
+        assert contributions.shape == dataset_matrix.shape
+        np.testing.assert_allclose(
+            contributions.sum(axis=1) + explainer.base_value,
+            model_output(exports[model_name], dataset_matrix),
+            rtol=0, atol=1e-9
+        )
+
+    def test_linear_contributions(self, exports, dataset_matrix):
+        """Test linear attributions are coef x standardized value"""
+        arrays = exports["logistic_regression"]
+        explainer = explain.build_explainer(arrays)
+
+        expected = (dataset_matrix - arrays["mean"]) / arrays["scale"] * arrays["coef"]
+        np.testing.assert_allclose(explainer.explain(dataset_matrix), expected)
+        assert explainer.output == "log_odds"
+
+    def test_output_scales(self, exports):
+        """Test the forest explains probabilities and boosting log-odds"""
+        assert explain.build_explainer(exports["random_forest"]).output == "probability"
+        assert explain.build_explainer(exports["gradient_boosting"]).output == "log_odds"
+
+
+class TestTreeShap:
+    """Tree attributions must equal exact Shapley values"""
+
+    @pytest.mark.parametrize("tree_index", [0, 7, 42])
+    def test_boosting_matches_brute_force(self, exports, dataset_matrix, tree_index):
+        """Test one boosting tree's attributions equal subset-enumerated Shapley values"""
+        self.check_tree(single_tree(exports["gradient_boosting"], tree_index), dataset_matrix)
+
+    @pytest.mark.parametrize("tree_index", [0, 1, 2])
+    def test_forest_matches_brute_force(self, small_forest, dataset_matrix, tree_index):
+        """Test one forest tree's attributions equal subset-enumerated Shapley values"""
+        self.check_tree(single_tree(small_forest, tree_index), dataset_matrix)
+
+    def check_tree(self, arrays, dataset_matrix):
+        root = int(arrays["roots"][0])
+        explainer = explain.build_explainer(arrays)
+        rows = dataset_matrix[[0, 150]]
+
+        expected = np.array([brute_force_shap(arrays, root, x) for x in rows])
+        np.testing.assert_allclose(explainer.explain(rows), expected, rtol=0, atol=1e-12)
+
+    def test_deep_paths_match_tables(self, exports, dataset_matrix, monkeypatch):
+        """Test the per-request recurrence agrees with the pattern tables"""
+        arrays = exports["random_forest"]
+        tabled = explain.build_explainer(arrays)
+        monkeypatch.setattr(explain, "TABLE_MAX_DEPTH", 3)
+        mixed = explain.build_explainer(arrays)
+
+        assert mixed.deep is not None
+        np.testing.assert_allclose(
+            mixed.explain(dataset_matrix), tabled.explain(dataset_matrix), rtol=0, atol=1e-12
+        )
+
+    def test_chunking(self, exports, dataset_matrix, monkeypatch):
+        """Test results do not depend on the chunk size"""
+        explainer = explain.build_explainer(exports["gradient_boosting"])
+        expected = explainer.explain(dataset_matrix)
+        monkeypatch.setattr(explain, "MAX_CHUNK_ELEMENTS", 1)
+
+        np.testing.assert_allclose(explainer.explain(dataset_matrix), expected, rtol=0, atol=1e-15)
+
+    def test_single_row(self, exports, dataset_matrix):
+        """Test a single row matches its batch result"""
+        explainer = explain.build_explainer(exports["random_forest"])
+
+        np.testing.assert_allclose(
+            explainer.explain(dataset_matrix[3:4])[0], explainer.explain(dataset_matrix)[3]
+        )
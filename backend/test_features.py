@@ -0,0 +1,161 @@
+"""
+Unit tests for input assembly (features.py)
+Run with: pytest backend/test_features.py -v
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from features import COLUMN_RENAME_MAP, FeatureSchema, feature_aliases
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def schema():
+    """A three-feature schema with means 1, 2, 3"""
+    return FeatureSchema(
+        ["radius_mean", "texture_mean", "area_mean"],
+        {
+            "radius_mean": {"mean": 1.0},
+            "texture_mean": {"mean": 2.0},
+            "area_mean": {"mean": 3.0},
+        },
+    )
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestFeatureSchema:
+    """Tests for FeatureSchema"""
+
+    def test_index_and_defaults(self, schema):
+        """Test the column index follows training order"""
+        assert schema.index == {"radius_mean": 0, "texture_mean": 1, "area_mean": 2}
+        assert schema.defaults.tolist() == [1.0, 2.0, 3.0]
+        assert not schema.defaults.flags.writeable
+
+    def test_missing_stats(self):
+        """Test features without stats are rejected at build time"""
+        with pytest.raises(ValueError, match="texture_mean"):
+            FeatureSchema(["radius_mean", "texture_mean"], {"radius_mean": {"mean": 1.0}})
+
+    def test_missing_feature_names(self):
+        """Test an empty feature list is rejected"""
+        with pytest.raises(ValueError):
+            FeatureSchema([], {})
+
+    def test_build_row(self, schema):
+        """Test supplied keys overwrite the defaults; unknown keys are ignored"""
+        row = schema.build_row({"texture_mean": "5.5", "unknown": 9})
+
+        assert row.shape == (1, 3)
+        assert row.tolist() == [[1.0, 5.5, 3.0]]
+
+    def test_null_values_use_mean(self, schema):
+        """Test None values fall back to the mean"""
+        assert schema.build_row({"radius_mean": None}).tolist() == [[1.0, 2.0, 3.0]]
+
+    def test_invalid_value(self, schema):
+        """Test non-numeric values raise ValueError"""
+        with pytest.raises(ValueError):
+            schema.build_row({"radius_mean": "abc"})
+
+    def test_build_rows(self, schema):
+        """Test N rows are assembled with per-row defaults"""
+        matrix = schema.build_rows([{}, {"area_mean": 7}, {"radius_mean": 4, "area_mean": None}])
+
+        np.testing.assert_array_equal(
+            matrix, [[1.0, 2.0, 3.0], [1.0, 2.0, 7.0], [4.0, 2.0, 3.0]]
+        )
+
+    def test_build_rows_empty(self, schema):
+        """Test an empty batch has shape (0, n_features)"""
+        assert schema.build_rows([]).shape == (0, 3)
+
+    def test_build_columns(self, schema):
+        """Test columnar payloads match the equivalent rows"""
+        matrix = schema.build_columns({"area_mean": [7, None], "radius_mean": [4, 5]})
+
+        np.testing.assert_array_equal(
+            matrix,
+            schema.build_rows([{"area_mean": 7, "radius_mean": 4}, {"radius_mean": 5}]),
+        )
+
+    def test_build_columns_normalized_names(self, schema):
+        """Test columnar keys resolve through normalized spellings too"""
+        matrix = schema.build_columns({"Area-Mean": [7, 8]})
+
+        assert matrix[:, 2].tolist() == [7.0, 8.0]
+
+    def test_build_columns_unequal_lengths(self, schema):
+        """Test ragged columns are rejected"""
+        with pytest.raises(ValueError):
+            schema.build_columns({"area_mean": [1, 2], "radius_mean": [1]})
+
+
+class TestFeatureAliases:
+    """Tests for alias resolution"""
+
+    @pytest.fixture
+    def schema(self):
+        """A schema with the CSV's "concave points_mean" spelling"""
+        names = ["radius_mean", "concave points_mean", "area_worst"]
+        return FeatureSchema(
+            names,
+            {name: {"mean": 0.0} for name in names},
+            aliases=feature_aliases({
+                "radius_mean": "Average Radius",
+                "concave_points_mean": "Average Concave Points",
+                "area_worst": "Largest Area",
+            }),
+        )
+
+    @pytest.mark.parametrize("spelling,column", [
+        ("radius_mean", 0),
+        ("mean radius", 0),
+        ("Average Radius", 0),
+        ("concave points_mean", 1),
+        ("concave_points_mean", 1),
+        ("mean concave points", 1),
+        ("Average Concave Points", 1),
+        ("worst area", 2),
+        ("Largest Area", 2),
+        ("AREA_WORST", 2),
+        ("largest-area", 2),
+    ])
+    def test_spellings_resolve(self, schema, spelling, column):
+        """Test sklearn names, CSV names, labels and case variants resolve"""
+        assert schema.column(spelling) == column
+
+    def test_unknown_features(self, schema):
+        """Test unresolvable keys are reported once, in order"""
+        assert schema.unknown_features(
+            ["mean radius", "bogus", "area_worst", "bogus", "mean texture"]
+        ) == ["bogus", "mean texture"]
+
+    def test_sklearn_payload(self, schema):
+        """Test a raw sklearn-named row lands in the right columns"""
+        row = schema.build_row({"mean radius": 1.5, "worst area": 2.5, "bogus": 9})
+
+        assert row.tolist() == [[1.5, 0.0, 2.5]]
+
+    def test_rename_map_covers_sklearn_names(self):
+        """Test every load_breast_cancer() feature has an alias"""
+        from sklearn.datasets import load_breast_cancer
+
+        assert set(COLUMN_RENAME_MAP) == set(load_breast_cancer().feature_names)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,158 @@
+"""
+Tests for incremental model updates (incremental.py)
+Run with: pytest backend/test_incremental.py -v
+"""
+
+import pytest
+import sys
+import os
+
+import joblib
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sklearn.linear_model import SGDClassifier
+
+import artifacts
+import incremental
+import training
+from inference import COMPILED_SUFFIX, MODEL_NAMES, load_compiled
+
+HISTORY_ROWS = 400
+
+
+def append_rows(csv_path, lines):
+    with open(csv_path, "a") as csv_file:
+        csv_file.write("\n" + "\n".join(lines))
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def source_lines():
+    with open(training.DEFAULT_DATA_PATH) as csv_file:
+        return csv_file.read().splitlines()
+
+
+@pytest.fixture
+def trained(tmp_path, source_lines):
+    """A full run on the first HISTORY_ROWS rows of the dataset"""
+    csv_path = str(tmp_path / "data.csv")
+    with open(csv_path, "w") as csv_file:
+        csv_file.write("\n".join(source_lines[: HISTORY_ROWS + 1]))
+    models_dir = str(tmp_path / "models")
+    training.run(
+        csv_path=csv_path, models_dir=models_dir, cache_dir=str(tmp_path / "cache"),
+        snapshot_dir=str(tmp_path / "cache"), n_jobs=1, search_params=False,
+    )
+    return csv_path, models_dir
+
+
+@pytest.fixture
+def updated(trained, source_lines):
+    """The trained models after the rest of the dataset was appended"""
+    csv_path, models_dir = trained
+    append_rows(csv_path, source_lines[HISTORY_ROWS + 1:])
+    report = incremental.update(csv_path=csv_path, models_dir=models_dir)
+    return csv_path, models_dir, report
+
+
+# ============================================================================
+# Updates
+# ============================================================================
+
+class TestUpdate:
+    def test_feature_stats_match_full_history(self, updated):
+        _, models_dir, _ = updated
+        X, _ = training.load_dataset(snapshot_dir=None)
+        feature_stats = joblib.load(os.path.join(artifacts.resolve(models_dir)[1], "feature_stats.pkl"))
+        for column in X.columns:
+            assert feature_stats[column]["mean"] == pytest.approx(X[column].mean(), rel=1e-10)
+            assert feature_stats[column]["std"] == pytest.approx(X[column].std(), rel=1e-10)
+            assert feature_stats[column]["min"] == X[column].min()
+            assert feature_stats[column]["max"] == X[column].max()
+
+    def test_metadata_counts_all_rows(self, updated):
+        _, models_dir, _ = updated
+        metadata = joblib.load(os.path.join(artifacts.resolve(models_dir)[1], "metadata.pkl"))
+        assert metadata["n_samples"] == 569
+        assert metadata["class_distribution"] == {"benign": 357, "malignant": 212}
+        assert len(metadata["top_features"]) == 10
+
+    def test_models_grow_and_stay_accurate(self, updated):
+        _, models_dir, report = updated
+        assert report["new_rows"] == 569 - HISTORY_ROWS
+        X, y = training.load_dataset(snapshot_dir=None)
+        for model_name in MODEL_NAMES:
+            pipeline = joblib.load(os.path.join(artifacts.resolve(models_dir)[1], f"{model_name}.pkl"))
+            assert pipeline.score(X, y) > 0.9
+            compiled = load_compiled(os.path.join(artifacts.resolve(models_dir)[1], model_name + COMPILED_SUFFIX))
+            np.testing.assert_allclose(
+                compiled.predict_proba(X.to_numpy()[:20]), pipeline.predict_proba(X.iloc[:20]), atol=1e-6
+            )
+
+        linear = joblib.load(os.path.join(artifacts.resolve(models_dir)[1], "logistic_regression.pkl"))
+        assert isinstance(linear.named_steps["classifier"], SGDClassifier)
+        assert linear.named_steps["scaler"].n_samples_seen_ == 320 + report["new_rows"]
+        forest = report["models"]["random_forest"]
+        assert forest["n_estimators"] == 100 + forest["added_estimators"]
+        assert forest["added_estimators"] == int(np.ceil(169 * 100 / 320))
+
+    def test_second_update_continues_with_sgd(self, updated, source_lines):
+        csv_path, models_dir, _ = updated
+        assert incremental.update(csv_path=csv_path, models_dir=models_dir) is None
+
+        append_rows(csv_path, source_lines[1:41])
+        # Same rows again are fine for the update itself (no history kept).
+        report = incremental.update(csv_path=csv_path, models_dir=models_dir)
+        assert report["new_rows"] == 40
+        state = training.load_state(models_dir)
+        assert state["stats"].count == 609
+        assert state["n_train_rows"] == 320 + 169 + 40
+
+    def test_publishes_a_new_version(self, trained, source_lines):
+        csv_path, models_dir = trained
+        previous = artifacts.current_version(models_dir)
+        append_rows(csv_path, source_lines[HISTORY_ROWS + 1:])
+        report = incremental.update(csv_path=csv_path, models_dir=models_dir)
+        assert report["version"] != previous
+        assert artifacts.current_version(models_dir) == report["version"]
+        versions = [entry["version"] for entry in artifacts.list_versions(models_dir)]
+        assert versions == [report["version"], previous]
+        manifest = artifacts.verify(artifacts.version_path(models_dir, report["version"]))
+        assert manifest["metrics"]["mode"] == "incremental"
+
+
+# ============================================================================
+# Errors
+# ============================================================================
+
+class TestUpdateErrors:
+    def test_requires_state(self, tmp_path):
+        with pytest.raises(ValueError, match="full training"):
+            incremental.update(models_dir=str(tmp_path))
+
+    def test_rewritten_csv(self, trained, source_lines):
+        csv_path, models_dir = trained
+        with open(csv_path, "w") as csv_file:
+            csv_file.write("\n".join(source_lines[:HISTORY_ROWS] + source_lines[-20:]))
+        with pytest.raises(ValueError, match="full retrain"):
+            incremental.update(csv_path=csv_path, models_dir=models_dir)
+
+    def test_single_class_rows_are_kept_for_later(self, trained, source_lines):
+        csv_path, models_dir = trained
+        appended = source_lines[HISTORY_ROWS + 1:]
+        benign = [line for line in appended if line.split(",")[1] == "B"]
+        malignant = [line for line in appended if line not in benign]
+        append_rows(csv_path, benign[:5])
+        with pytest.raises(ValueError, match="single class"):
+            incremental.update(csv_path=csv_path, models_dir=models_dir)
+        assert training.load_state(models_dir)["stats"].count == HISTORY_ROWS
+
+        append_rows(csv_path, malignant[:5])
+        report = incremental.update(csv_path=csv_path, models_dir=models_dir)
+        assert report["new_rows"] == 10
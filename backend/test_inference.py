@@ -0,0 +1,171 @@
+"""
+Parity tests for the pure-numpy inference engine (inference.py)
+Run with: pytest backend/test_inference.py -v
+"""
+
+import pytest
+import sys
+import os
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import inference
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BACKEND_DIR, "models")
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def pipelines():
+    """The pickled sklearn pipelines"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return {
+            name: joblib.load(os.path.join(MODELS_DIR, f"{name}.pkl"))
+            for name in inference.MODEL_NAMES
+        }
+
+
+@pytest.fixture(scope="module")
+def dataset_matrix(pipelines):
+    """Dataset rows plus randomly perturbed copies, in training feature order"""
+    df = pd.read_csv(os.path.join(BACKEND_DIR, "data", "breast_cancer_wisconsin.csv"))
+    columns = list(pipelines["logistic_regression"].feature_names_in_)
+    X = df[columns].to_numpy(dtype=float)
+    rng = np.random.default_rng(0)
+    return np.vstack([X, X * rng.uniform(0.5, 1.5, size=X.shape)])
+
+
+def sklearn_proba(pipeline, X):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pipeline.predict_proba(X)
+
+
+# ============================================================================
+# Parity with sklearn
+# ============================================================================
+
+class TestParity:
+    """Compiled models must reproduce the sklearn pipelines"""
+
+    @pytest.mark.parametrize("model_name", inference.MODEL_NAMES)
+    def test_batch_probabilities_match(self, pipelines, dataset_matrix, model_name):
+        """Test batch probabilities equal sklearn's to floating-point precision"""
+        compiled = inference.CompiledModel(inference.export_pipeline(pipelines[model_name]))
+
+        np.testing.assert_allclose(
+            compiled.predict_proba(dataset_matrix),
+            sklearn_proba(pipelines[model_name], dataset_matrix),
+            rtol=0, atol=1e-12
+        )
+
+    @pytest.mark.parametrize("model_name", inference.MODEL_NAMES)
+    def test_labels_match(self, pipelines, dataset_matrix, model_name):
+        """Test predicted labels are identical"""
+        compiled = inference.CompiledModel(inference.export_pipeline(pipelines[model_name]))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = pipelines[model_name].predict(dataset_matrix)
+
+        assert compiled.predict(dataset_matrix).tolist() == expected.tolist()
+
+    @pytest.mark.parametrize("model_name", inference.MODEL_NAMES)
+    def test_single_row_matches(self, pipelines, dataset_matrix, model_name):
+        """Test the single-row fast path matches sklearn"""
+        compiled = inference.CompiledModel(inference.export_pipeline(pipelines[model_name]))
+
+        for row in dataset_matrix[::97]:
+            np.testing.assert_allclose(
+                compiled.predict_proba(row[None, :]),
+                sklearn_proba(pipelines[model_name], row[None, :]),
+                rtol=0, atol=1e-12
+            )
+
+    def test_split_thresholds_are_exact(self, pipelines):
+        """Test rows sitting exactly on split thresholds follow sklearn"""
+        pipeline = pipelines["random_forest"]
+        arrays = inference.export_pipeline(pipeline)
+        internal = np.isfinite(arrays["threshold"])
+        X = np.tile(np.zeros(arrays["mean"].shape), (int(internal.sum()), 1))
+        X[np.arange(len(X)), arrays["feature"][internal]] = arrays["threshold"][internal]
+
+        np.testing.assert_allclose(
+            inference.CompiledModel(arrays).predict_proba(X),
+            sklearn_proba(pipeline, X),
+            rtol=0, atol=1e-12
+        )
+
+
+# ============================================================================
+# Export format
+# ============================================================================
+
+class TestExport:
+    """Tests for export_pipeline / save_compiled / load_compiled"""
+
+    @pytest.mark.parametrize("model_name", inference.MODEL_NAMES)
+    def test_round_trip(self, pipelines, dataset_matrix, model_name, tmp_path):
+        """Test saved bundles load back to the same predictions"""
+        arrays = inference.export_pipeline(pipelines[model_name])
+        path = tmp_path / (model_name + inference.COMPILED_SUFFIX)
+        inference.save_compiled(path, arrays)
+        loaded = inference.load_compiled(path)
+
+        np.testing.assert_array_equal(
+            loaded.predict_proba(dataset_matrix),
+            inference.CompiledModel(arrays).predict_proba(dataset_matrix)
+        )
+
+    def test_load_is_memory_mapped(self, pipelines, tmp_path):
+        """Test large node tables are mapped from disk, not copied to the heap"""
+        path = tmp_path / ("random_forest" + inference.COMPILED_SUFFIX)
+        inference.save_compiled(path, inference.export_pipeline(pipelines["random_forest"]))
+        compiled = inference.load_compiled(path)
+
+        for key in ("feature", "threshold", "children", "value"):
+            assert not compiled.arrays[key].flags.owndata
+            assert not compiled.arrays[key].flags.writeable
+        assert np.shares_memory(compiled.trees["children"], compiled.arrays["children"])
+
+    def test_resave_replaces_bundle(self, pipelines, tmp_path):
+        """Test saving over an existing bundle leaves no stale arrays behind"""
+        path = tmp_path / "model.bundle"
+        inference.save_compiled(path, inference.export_pipeline(pipelines["random_forest"]))
+        inference.save_compiled(path, inference.export_pipeline(pipelines["logistic_regression"]))
+
+        assert "children.npy" not in os.listdir(path)
+        assert inference.load_compiled(path).kind == "linear"
+
+    def test_shipped_exports_are_current(self, pipelines, dataset_matrix):
+        """Test the compiled bundles in backend/models match the pickles"""
+        for model_name, pipeline in pipelines.items():
+            path = os.path.join(MODELS_DIR, model_name + inference.COMPILED_SUFFIX)
+            np.testing.assert_allclose(
+                inference.load_compiled(path).predict_proba(dataset_matrix),
+                sklearn_proba(pipeline, dataset_matrix),
+                rtol=0, atol=1e-12
+            )
+
+    def test_unsupported_classifier(self):
+        """Test exporting an unknown estimator raises ValueError"""
+        from sklearn.pipeline import Pipeline
+        from sklearn.svm import SVC
+
+        pipeline = Pipeline([("classifier", SVC().fit([[0.0], [1.0]], [0, 1]))])
+        with pytest.raises(ValueError):
+            inference.export_pipeline(pipeline)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
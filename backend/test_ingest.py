@@ -0,0 +1,175 @@
+"""
+Tests for typed CSV ingestion and snapshots (ingest.py)
+Run with: pytest backend/test_ingest.py -v
+"""
+
+import pytest
+import sys
+import os
+import io
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ingest
+from features import COLUMN_RENAME_MAP, normalize_feature_name
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "breast_cancer_wisconsin.csv")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    """The CSV as pandas reads it with inferred dtypes"""
+    return pd.read_csv(CSV_PATH)
+
+
+@pytest.fixture
+def csv_lines():
+    with open(CSV_PATH) as csv_file:
+        return csv_file.read().splitlines()
+
+
+def write_csv(path, lines):
+    with open(path, "w") as csv_file:
+        csv_file.write("\n".join(lines) + "\n")
+    return str(path)
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+class TestReadCsv:
+    def test_matches_pandas(self, reference):
+        dataset = ingest.read_csv(CSV_PATH)
+        assert dataset.feature_names == list(ingest.FEATURE_COLUMNS)
+        assert dataset.X.dtype == np.float64
+        assert dataset.y.dtype == np.int8
+        np.testing.assert_array_equal(dataset.X, reference[list(ingest.FEATURE_COLUMNS)].to_numpy())
+        np.testing.assert_array_equal(dataset.y, (reference["diagnosis"] == "M").to_numpy())
+        np.testing.assert_array_equal(dataset.ids, reference["id"].to_numpy())
+
+    def test_chunked_equals_whole(self):
+        whole = ingest.read_csv(CSV_PATH)
+        chunked = ingest.read_csv(CSV_PATH, chunk_rows=50)
+        np.testing.assert_array_equal(whole.X, chunked.X)
+        np.testing.assert_array_equal(whole.y, chunked.y)
+
+    def test_float32_schema(self, reference):
+        dataset = ingest.read_csv(CSV_PATH, dtype=np.float32)
+        assert dataset.X.dtype == np.float32
+        np.testing.assert_allclose(dataset.X, reference[list(ingest.FEATURE_COLUMNS)], rtol=1e-6)
+
+    def test_file_object_and_frame(self):
+        with open(CSV_PATH, "rb") as csv_file:
+            X, y = ingest.read_csv(io.BytesIO(csv_file.read())).frame()
+        assert X.shape == (569, 30)
+        assert list(X.columns) == list(ingest.FEATURE_COLUMNS)
+        assert y.sum() == 212
+
+    def test_sklearn_column_names(self, csv_lines):
+        sklearn_names = {
+            normalize_feature_name(column): sklearn for sklearn, column in COLUMN_RENAME_MAP.items()
+        }
+        columns = [column.strip('"') for column in csv_lines[0].split(",")]
+        header = ",".join(
+            f'"{sklearn_names.get(normalize_feature_name(column), column)}"' for column in columns
+        )
+        assert '"mean concave points"' in header and '"radius_mean"' not in header
+        dataset = ingest.read_csv(io.BytesIO("\n".join([header] + csv_lines[1:]).encode()))
+        assert len(dataset) == 569
+        np.testing.assert_array_equal(dataset.X, ingest.read_csv(io.BytesIO("\n".join(csv_lines).encode())).X)
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+class TestValidation:
+    def test_missing_column(self, csv_lines, tmp_path):
+        header = csv_lines[0].replace('"radius_mean"', '"radius"')
+        path = write_csv(tmp_path / "data.csv", [header] + csv_lines[1:])
+        with pytest.raises(ValueError, match="radius_mean"):
+            ingest.read_csv(path)
+
+    def test_missing_value_names_line(self, csv_lines, tmp_path):
+        fields = csv_lines[5].split(",")
+        fields[4] = ""
+        csv_lines[5] = ",".join(fields)
+        path = write_csv(tmp_path / "data.csv", csv_lines)
+        with pytest.raises(ValueError, match="Line 6: missing"):
+            ingest.read_csv(path, chunk_rows=2)
+
+    def test_unknown_diagnosis(self, csv_lines, tmp_path):
+        fields = csv_lines[3].split(",")
+        fields[1] = "X"
+        csv_lines[3] = ",".join(fields)
+        path = write_csv(tmp_path / "data.csv", csv_lines)
+        with pytest.raises(ValueError, match="Line 4: diagnosis"):
+            ingest.read_csv(path)
+
+    def test_unparseable_value(self, csv_lines, tmp_path):
+        fields = csv_lines[3].split(",")
+        fields[5] = "abc"
+        csv_lines[3] = ",".join(fields)
+        with pytest.raises(ValueError):
+            ingest.read_csv(write_csv(tmp_path / "data.csv", csv_lines))
+
+    def test_duplicate_across_chunks(self, csv_lines, tmp_path):
+        fields = csv_lines[2].split(",")
+        fields[0] = "999"  # different id, same measurements
+        path = write_csv(tmp_path / "data.csv", csv_lines + [",".join(fields)])
+        with pytest.raises(ValueError, match=f"Line {len(csv_lines) + 1}: duplicate"):
+            ingest.read_csv(path, chunk_rows=100)
+
+
+# ============================================================================
+# Snapshots
+# ============================================================================
+
+class TestSnapshot:
+    def test_second_load_is_memory_mapped(self, tmp_path, monkeypatch):
+        snapshot_dir = str(tmp_path / "snapshots")
+        first = ingest.load(CSV_PATH, snapshot_dir)
+        assert len(os.listdir(snapshot_dir)) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("CSV was reparsed")
+
+        monkeypatch.setattr(ingest, "read_csv", fail)
+        second = ingest.load(CSV_PATH, snapshot_dir)
+        assert isinstance(second.X, np.memmap)
+        assert not second.X.flags.writeable
+        np.testing.assert_array_equal(first.X, second.X)
+        assert second.source_sha256 == ingest.file_sha256(CSV_PATH)
+
+    def test_edited_csv_gets_new_snapshot(self, csv_lines, tmp_path):
+        snapshot_dir = str(tmp_path / "snapshots")
+        path = write_csv(tmp_path / "data.csv", csv_lines[:100])
+        assert len(ingest.load(path, snapshot_dir)) == 99
+        write_csv(tmp_path / "data.csv", csv_lines[:200])
+        assert len(ingest.load(path, snapshot_dir)) == 199
+        assert len(os.listdir(snapshot_dir)) == 1
+
+    def test_invalid_snapshot_is_rebuilt(self, tmp_path):
+        snapshot_dir = str(tmp_path / "snapshots")
+        ingest.load(CSV_PATH, snapshot_dir)
+        (snapshot,) = os.listdir(snapshot_dir)
+        np.save(os.path.join(snapshot_dir, snapshot, "y.npy"), np.zeros(3, dtype=np.int8))
+        dataset = ingest.load(CSV_PATH, snapshot_dir)
+        assert len(dataset) == 569
+        assert dataset.y.sum() == 212
+
+    def test_dtypes_have_separate_snapshots(self, tmp_path):
+        snapshot_dir = str(tmp_path / "snapshots")
+        assert ingest.load(CSV_PATH, snapshot_dir, dtype=np.float32).X.dtype == np.float32
+        assert ingest.load(CSV_PATH, snapshot_dir).X.dtype == np.float64
+        assert len(os.listdir(snapshot_dir)) == 2
+
+    def test_without_snapshot_dir(self, tmp_path):
+        dataset = ingest.load(CSV_PATH, snapshot_dir=None)
+        assert not isinstance(dataset.X, np.memmap)
+        assert dataset.source_sha256 == ingest.file_sha256(CSV_PATH)
@@ -0,0 +1,133 @@
+"""
+Unit tests for the metrics registry (metrics.py)
+Run with: pytest backend/test_metrics.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from metrics import MetricsRegistry
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestCounter:
+    """Tests for Counter"""
+
+    def test_counts_per_label(self, registry):
+        """Test each label tuple is counted separately"""
+        counter = registry.counter("requests_total", "Requests.", ("endpoint",))
+        counter.inc(("/a",))
+        counter.inc(("/a",))
+        counter.inc(("/b",), 5)
+
+        assert counter.value(("/a",)) == 2
+        assert 'requests_total{endpoint="/b"} 5' in registry.render()
+
+
+class TestHistogram:
+    """Tests for Histogram"""
+
+    def test_cumulative_buckets(self, registry):
+        """Test buckets are cumulative with +Inf, sum and count"""
+        histogram = registry.histogram("latency_seconds", "Latency.", ("model",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value, ("rf",))
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{model="rf",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{model="rf",le="1.0"} 3' in text
+        assert 'latency_seconds_bucket{model="rf",le="+Inf"} 4' in text
+        assert 'latency_seconds_sum{model="rf"} 4.05' in text
+        assert 'latency_seconds_count{model="rf"} 4' in text
+        assert "# TYPE latency_seconds histogram" in text
+
+    def test_boundary_is_inclusive(self, registry):
+        """Test a value equal to a bound lands in that bucket (le semantics)"""
+        histogram = registry.histogram("h", "H.", buckets=(1.0,))
+        histogram.observe(1.0)
+
+        assert 'h_bucket{le="1.0"} 1' in registry.render()
+
+
+class TestRegistry:
+    """Tests for MetricsRegistry"""
+
+    def test_disabled_is_noop(self):
+        """Test a disabled registry records nothing"""
+        registry = MetricsRegistry(enabled=False)
+        counter = registry.counter("c", "C.")
+        histogram = registry.histogram("h", "H.")
+        counter.inc()
+        histogram.observe(1.0)
+
+        assert counter.value() == 0
+        assert histogram.count() == 0
+
+    def test_collectors_run_at_render(self, registry):
+        """Test scrape-time collectors are rendered and None values skipped"""
+        calls = []
+
+        def collector():
+            calls.append(1)
+            return [("loaded", "gauge", "Loaded.", [({"model": "rf"}, 1), ({"model": "gb"}, None)])]
+
+        registry.add_collector(collector)
+        assert calls == []
+
+        text = registry.render()
+        assert 'loaded{model="rf"} 1' in text
+        assert 'model="gb"' not in text
+
+    def test_label_escaping(self, registry):
+        """Test quotes, backslashes and newlines are escaped"""
+        registry.counter("c", "C.", ("path",)).inc(('a"b\\c\nd',))
+
+        assert 'c{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+    def test_process_label(self):
+        """Test every series, including histogram buckets and collected gauges, carries the pid"""
+        registry = MetricsRegistry(process_label="pid")
+        registry.counter("c", "C.", ("path",)).inc(("/a",))
+        registry.counter("plain", "Plain.").inc()
+        registry.histogram("h", "H.", buckets=(1.0,)).observe(0.5)
+        registry.add_collector(lambda: [("g", "gauge", "G.", [({}, 3)])])
+        pid = f'pid="{os.getpid()}"'
+
+        text = registry.render()
+        assert f'c{{path="/a",{pid}}} 1' in text
+        assert f'plain{{{pid}}} 1' in text
+        assert f'h_bucket{{le="1.0",{pid}}} 1' in text
+        assert f'h_count{{{pid}}} 1' in text
+        assert f'g{{{pid}}} 3' in text
+
+    def test_reset(self, registry):
+        """Test reset zeroes counters and histograms (as in a freshly forked worker)"""
+        counter = registry.counter("c", "C.")
+        histogram = registry.histogram("h", "H.")
+        counter.inc()
+        histogram.observe(1.0)
+        registry.reset()
+
+        assert counter.value() == 0
+        assert histogram.count() == 0
+        assert "\nc " not in registry.render()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
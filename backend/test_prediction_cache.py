@@ -0,0 +1,97 @@
+"""
+Unit tests for the prediction result cache (prediction_cache.py)
+Run with: pytest backend/test_prediction_cache.py -v
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from prediction_cache import PredictionCache, prediction_key
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPredictionKey:
+    """Tests for prediction_key()"""
+
+    def test_float64_noise_shares_a_key(self):
+        """Test inputs equal at float32 precision map to the same key"""
+        row = np.array([[14.5, 0.1, 1000.0]])
+        noisy = row + np.array([[1e-12, 1e-15, 1e-10]])
+
+        assert prediction_key("lr", "v1", row) == prediction_key("lr", "v1", noisy)
+
+    def test_model_and_version_are_part_of_the_key(self):
+        """Test the same input under another model or version misses"""
+        row = np.array([[14.5, 0.1]])
+
+        assert prediction_key("lr", "v1", row) != prediction_key("rf", "v1", row)
+        assert prediction_key("lr", "v1", row) != prediction_key("lr", "v2", row)
+
+
+class TestPredictionCache:
+    """Tests for PredictionCache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted"""
+        cache = PredictionCache(max_entries=10)
+
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted at capacity"""
+        cache = PredictionCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after ttl_seconds"""
+        clock = FakeClock()
+        cache = PredictionCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["size"] == 0
+
+    def test_disabled_cache(self):
+        """Test a zero-size cache stores nothing"""
+        cache = PredictionCache(max_entries=0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats()["enabled"] is False
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
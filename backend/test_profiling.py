@@ -0,0 +1,101 @@
+"""
+Unit tests for the request profiler (profiling.py)
+Run with: pytest backend/test_profiling.py -v
+"""
+
+import sys
+import os
+import time
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from profiling import ProfileStore, StackProfiler
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def leaf():
+    time.sleep(0.002)
+
+
+def outer():
+    leaf()
+
+
+def profile_outer():
+    profiler = StackProfiler()
+    profiler.start()
+    outer()
+    profiler.stop()
+    return profiler
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestStackProfiler:
+    """Tests for StackProfiler"""
+
+    def test_nested_stacks(self):
+        """Test time is charged to the full stack, including C calls"""
+        profiler = profile_outer()
+        stacks = [line.rsplit(" ", 1)[0] for line in profiler.collapsed().splitlines()]
+
+        sleep_stack = next(stack for stack in stacks if stack.endswith("time.sleep"))
+        frames = sleep_stack.split(";")
+        assert frames[-4].startswith("profile_outer (")
+        assert frames[-3].startswith("outer (")
+        assert frames[-2].startswith("leaf (")
+
+    def test_weights_in_microseconds(self):
+        """Test the sleep dominates and weights are positive integers"""
+        profiler = profile_outer()
+        weights = {
+            stack: int(weight)
+            for stack, weight in (line.rsplit(" ", 1) for line in profiler.collapsed().splitlines())
+        }
+
+        assert all(weight > 0 for weight in weights.values())
+        sleep_us = sum(w for stack, w in weights.items() if stack.endswith("time.sleep"))
+        assert sleep_us >= 1500
+
+    def test_stop_uninstalls_hook(self):
+        """Test stop() restores the previous (absent) profile function"""
+        profile_outer()
+        assert sys.getprofile() is None
+
+
+class TestProfileStore:
+    """Tests for ProfileStore"""
+
+    def test_save_and_list(self, tmp_path):
+        """Test saved profiles are listed and readable by name"""
+        store = ProfileStore(str(tmp_path))
+        name = store.save(profile_outer(), "predict")
+
+        assert name.endswith("-predict.collapsed")
+        assert [entry["name"] for entry in store.list()] == [name]
+        with open(store.path(name)) as profile_file:
+            assert "time.sleep" in profile_file.read()
+
+    def test_prunes_to_keep(self, tmp_path):
+        """Test only the newest profiles are kept"""
+        store = ProfileStore(str(tmp_path), keep=2)
+        profiler = profile_outer()
+        names = []
+        for _ in range(4):
+            names.append(store.save(profiler, "predict"))
+            time.sleep(0.01)
+
+        assert sorted(entry["name"] for entry in store.list()) == sorted(names[-2:])
+
+    def test_rejects_unsafe_names(self, tmp_path):
+        """Test path() refuses traversal and unknown names"""
+        store = ProfileStore(str(tmp_path))
+
+        assert store.path("../app.py") is None
+        assert store.path("missing.collapsed") is None
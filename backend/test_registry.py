@@ -0,0 +1,163 @@
+"""
+Unit tests for the lazy model registry (registry.py)
+Run with: pytest backend/test_registry.py -v
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from registry import ModelRegistry, discover_models
+
+
+class FakeModel:
+    """Stand-in model with a fixed in-memory size"""
+
+    def __init__(self, name, nbytes):
+        self.name = name
+        self.nbytes = nbytes
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def models_dir(tmp_path):
+    """A models directory with metadata, two pickles and one compiled bundle"""
+    for filename in ["metadata.pkl", "feature_stats.pkl", "top_features.pkl",
+                     "random_forest.pkl", "variant_b.pkl"]:
+        (tmp_path / filename).write_bytes(b"x" * 10)
+    bundle = tmp_path / "logistic_regression.bundle"
+    bundle.mkdir()
+    np.save(bundle / "coef.npy", np.zeros(30))
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+@pytest.fixture
+def loads():
+    """Records every loader call"""
+    return []
+
+
+@pytest.fixture
+def make_registry(models_dir, loads):
+    def make(budget=None, on_load=None, on_evict=None):
+        def loader(directory, name):
+            loads.append(name)
+            return FakeModel(name, 100)
+        return ModelRegistry(
+            str(models_dir), loader, memory_budget_bytes=budget, on_load=on_load, on_evict=on_evict
+        )
+    return make
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestDiscovery:
+    """Tests for discover_models()"""
+
+    def test_discovers_models_only(self, models_dir):
+        """Test metadata pickles and unrelated files are skipped"""
+        assert list(discover_models(str(models_dir))) == [
+            "logistic_regression", "random_forest", "variant_b"
+        ]
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry"""
+
+    def test_models_start_cold(self, make_registry, loads):
+        """Test nothing is loaded until a model is requested"""
+        registry = make_registry()
+
+        assert len(registry) == 3
+        assert "random_forest" in registry
+        assert loads == []
+        assert {m["state"] for m in registry.status()["models"].values()} == {"cold"}
+
+    def test_loads_once_on_first_request(self, make_registry, loads):
+        """Test a model is loaded on first access and then served warm"""
+        registry = make_registry()
+
+        first = registry["random_forest"]
+        second = registry["random_forest"]
+
+        assert first is second
+        assert loads == ["random_forest"]
+        assert registry.status()["models"]["random_forest"]["state"] == "warm"
+        assert registry.status()["models"]["random_forest"]["load_ms"] is not None
+
+    def test_unknown_model(self, make_registry):
+        """Test unknown names raise KeyError like a dict"""
+        registry = make_registry()
+
+        assert "missing" not in registry
+        with pytest.raises(KeyError):
+            registry["missing"]
+
+    def test_lru_eviction_under_budget(self, make_registry, loads):
+        """Test the least recently used model is evicted when over budget"""
+        registry = make_registry(budget=250)
+
+        registry["logistic_regression"]
+        registry["random_forest"]
+        registry["logistic_regression"]  # refresh: random_forest is now LRU
+        registry["variant_b"]
+
+        states = {name: m["state"] for name, m in registry.status()["models"].items()}
+        assert states == {
+            "logistic_regression": "warm",
+            "random_forest": "cold",
+            "variant_b": "warm",
+        }
+        assert registry.status()["evictions"] == 1
+        assert registry.used_bytes() == 200
+
+        registry["random_forest"]
+        assert loads.count("random_forest") == 2
+
+    def test_on_load_hook(self, make_registry):
+        """Test the on_load hook runs once per load"""
+        seen = []
+        registry = make_registry(on_load=lambda name, model: seen.append(name))
+
+        registry["variant_b"]
+        registry["variant_b"]
+
+        assert seen == ["variant_b"]
+
+    def test_attached_bytes_count_until_eviction(self, make_registry):
+        """Test bytes attached to a model count against the budget and go with it"""
+        evicted = []
+        registry = make_registry(budget=250, on_evict=evicted.append)
+
+        registry["logistic_regression"]
+        assert registry.attach("logistic_regression", 40)
+        registry["random_forest"]
+        assert registry.used_bytes() == 240
+        assert registry.attach("random_forest", 20)
+
+        assert evicted == ["logistic_regression"]
+        assert registry.used_bytes() == 120
+        assert registry.status()["models"]["logistic_regression"]["attached_bytes"] == 0
+        assert not registry.attach("logistic_regression", 40)
+
+    def test_items_loads_all(self, make_registry, loads):
+        """Test iterating items warms every model, as predict-all does"""
+        registry = make_registry()
+
+        assert [name for name, _ in registry.items()] == list(registry.keys())
+        assert sorted(loads) == sorted(registry.keys())
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
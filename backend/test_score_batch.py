@@ -0,0 +1,122 @@
+"""
+Tests for the offline batch scoring CLI (score_batch.py)
+Run with: pytest backend/test_score_batch.py -v
+"""
+
+import pytest
+import sys
+import os
+
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import artifacts
+import score_batch
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def shards(tmp_path):
+    """The dataset split into a CSV shard and a Parquet shard"""
+    df = pd.read_csv(os.path.join(BACKEND_DIR, "data", "breast_cancer_wisconsin.csv"))
+    df = df.drop(columns=["Unnamed: 32"], errors="ignore")
+    input_dir = tmp_path / "shards"
+    input_dir.mkdir()
+    df.iloc[:200].to_csv(input_dir / "part-0.csv", index=False)
+    try:
+        df.iloc[200:].to_parquet(input_dir / "part-1.parquet")
+    except ImportError:
+        df.iloc[200:].to_csv(input_dir / "part-1.csv", index=False)
+    (input_dir / "README.txt").write_text("not a shard")
+    return input_dir, df
+
+
+@pytest.fixture
+def published_models(tmp_path):
+    """A models directory holding only CURRENT and one published version"""
+    import shutil
+    models_dir = str(tmp_path / "models")
+    staging = artifacts.staging_dir(models_dir)
+    shutil.copytree(os.path.join(BACKEND_DIR, "models"), staging, dirs_exist_ok=True)
+    artifacts.publish(models_dir, staging)
+    return models_dir
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestScoreBatch:
+    """Tests for score_batch.run()"""
+
+    def test_scores_every_shard(self, shards, tmp_path):
+        """Test each shard gets a predictions file with one row per case"""
+        input_dir, df = shards
+        output_dir = tmp_path / "out"
+
+        rows, _ = score_batch.run(str(input_dir), str(output_dir), workers=1, chunk_rows=64)
+
+        outputs = sorted(os.listdir(output_dir))
+        assert outputs == ["part-0.predictions.csv", "part-1.predictions.csv"]
+        scored = pd.concat(pd.read_csv(output_dir / name) for name in outputs)
+        assert rows == len(df)
+        assert scored["id"].tolist() == df["id"].tolist()
+        assert set(scored["random_forest_prediction"]) <= {0, 1}
+        assert (scored["gradient_boosting_benign"] + scored["gradient_boosting_malignant"]).round(9).eq(1).all()
+
+    def test_resume_skips_finished_shards(self, shards, tmp_path):
+        """Test a rerun only scores shards without finished output"""
+        input_dir, _ = shards
+        output_dir = tmp_path / "out"
+        score_batch.run(str(input_dir), str(output_dir), model_names=["logistic_regression"], workers=1)
+        os.remove(output_dir / "part-0.predictions.csv")
+
+        rows, _ = score_batch.run(str(input_dir), str(output_dir), model_names=["logistic_regression"], workers=1)
+
+        assert rows == 200
+        assert not any(name.endswith(".part") for name in os.listdir(output_dir))
+
+    def test_unknown_model(self, shards, tmp_path):
+        """Test unknown model names are rejected up front"""
+        input_dir, _ = shards
+        with pytest.raises(ValueError):
+            score_batch.run(str(input_dir), str(tmp_path / "out"), model_names=["nope"])
+
+
+    def test_scores_published_version(self, shards, tmp_path, published_models):
+        """Test models are found through CURRENT when the directory is versioned"""
+        input_dir, df = shards
+        output_dir = tmp_path / "out"
+
+        rows, _ = score_batch.run(
+            str(input_dir), str(output_dir), workers=1, models_dir=published_models
+        )
+
+        scored = pd.read_csv(output_dir / "part-0.predictions.csv")
+        assert rows == len(df)
+        for model_name in ("logistic_regression", "random_forest", "gradient_boosting"):
+            assert f"{model_name}_prediction" in scored.columns
+
+        score_batch.run(
+            str(input_dir), str(tmp_path / "lr"), model_names=["logistic_regression"],
+            workers=1, models_dir=published_models,
+        )
+        assert "logistic_regression_benign" in pd.read_csv(tmp_path / "lr" / "part-0.predictions.csv")
+
+    def test_no_models(self, shards, tmp_path):
+        """Test a directory without model artifacts is an error, not empty output"""
+        input_dir, _ = shards
+        (tmp_path / "empty").mkdir()
+        with pytest.raises(ValueError, match="No models found"):
+            score_batch.run(str(input_dir), str(tmp_path / "out"), models_dir=str(tmp_path / "empty"))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
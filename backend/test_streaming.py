@@ -0,0 +1,132 @@
+"""
+Unit tests for chunked stream readers (streaming.py)
+Run with: pytest backend/test_streaming.py -v
+"""
+
+import pytest
+import sys
+import os
+import io
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import streaming
+from features import FeatureSchema, feature_aliases
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def schema():
+    """A two-feature schema with means 1 and 2"""
+    return FeatureSchema(
+        ["radius_mean", "texture_mean"],
+        {"radius_mean": {"mean": 1.0}, "texture_mean": {"mean": 2.0}},
+        aliases=feature_aliases(),
+    )
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestNdjsonChunks:
+    """Tests for iter_ndjson_chunks()"""
+
+    def test_fixed_size_chunks(self, schema):
+        """Test rows are grouped into chunks of chunk_rows"""
+        lines = [b'{"radius_mean": %d}\n' % i for i in range(5)]
+        chunks = list(streaming.iter_ndjson_chunks(lines, schema, 2))
+
+        assert [len(matrix) for _, matrix in chunks] == [2, 2, 1]
+        assert chunks[2][1].tolist() == [[4.0, 2.0]]
+
+    def test_reads_lazily(self, schema):
+        """Test a chunk is yielded before the rest of the input is read"""
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield b'{"mean texture": 5}\n'
+
+        first_ids, first = next(streaming.iter_ndjson_chunks(lines(), schema, 10))
+
+        assert first.shape == (10, 2)
+        assert first_ids is None
+        assert len(consumed) == 10
+
+    def test_ids_are_passed_through(self, schema):
+        """Test row ids are returned alongside the matrix"""
+        lines = [b'{"id": 7, "radius_mean": 3}\n', b'\n', b'{"texture_mean": 4}\n']
+        ids, matrix = next(streaming.iter_ndjson_chunks(lines, schema, 10))
+
+        assert ids == [7, None]
+        assert matrix.tolist() == [[3.0, 2.0], [1.0, 4.0]]
+
+    def test_invalid_line_flushes_then_raises(self, schema):
+        """Test rows before a bad line are yielded before the error"""
+        chunks = streaming.iter_ndjson_chunks([b'{"radius_mean": 3}\n', b'[1, 2]\n'], schema, 10)
+
+        assert len(next(chunks)[1]) == 1
+        with pytest.raises(ValueError, match="Line 2"):
+            next(chunks)
+
+
+class TestCsvChunks:
+    """Tests for iter_csv_chunks()"""
+
+    def test_csv_chunks(self, schema):
+        """Test CSV columns are matched by name and empty cells take the mean"""
+        body = b"id,diagnosis,radius_mean,mean texture\n1,M,3,\n2,B,,6\n3,B,5,7\n"
+        chunks = list(streaming.iter_csv_chunks(io.BytesIO(body), schema, 2))
+
+        assert [ids for ids, _ in chunks] == [[1, 2], [3]]
+        np.testing.assert_array_equal(
+            np.vstack([matrix for _, matrix in chunks]),
+            [[3.0, 2.0], [1.0, 6.0], [5.0, 7.0]]
+        )
+
+    def test_non_numeric_cell(self, schema):
+        """Test non-numeric feature values raise ValueError"""
+        with pytest.raises(ValueError):
+            list(streaming.iter_csv_chunks(io.BytesIO(b"radius_mean\nabc\n"), schema, 10))
+
+
+class TestRenderNdjsonRows:
+    """Tests for render_ndjson_rows()"""
+
+    def test_single_model_is_flat(self):
+        """Test one model renders like predict-batch results"""
+        body = streaming.render_ndjson_rows(
+            5, None, {"m": (np.array([1]), np.array([[0.25, 0.75]]))}
+        )
+
+        assert body == (
+            '{"row":5,"prediction":1,"probabilities":{"benign":0.25,"malignant":0.75}}\n'
+        )
+
+    def test_several_models_are_nested(self):
+        """Test several models nest under models"""
+        import json
+        body = streaming.render_ndjson_rows(
+            0, ["a", "b"],
+            {
+                "m1": (np.array([0, 1]), np.array([[0.9, 0.1], [0.2, 0.8]])),
+                "m2": (np.array([0, 0]), np.array([[0.6, 0.4], [0.7, 0.3]])),
+            }
+        )
+        lines = [json.loads(line) for line in body.splitlines()]
+
+        assert lines[1]["id"] == "b"
+        assert lines[1]["models"]["m1"]["prediction"] == 1
+        assert lines[1]["models"]["m2"]["probabilities"]["malignant"] == 0.3
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
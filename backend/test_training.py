@@ -0,0 +1,186 @@
+"""
+Tests for the training pipeline (training.py)
+Run with: pytest backend/test_training.py -v
+"""
+
+import pytest
+import sys
+import os
+import json
+
+import joblib
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import artifacts
+import training
+from inference import COMPILED_SUFFIX, MODEL_NAMES, load_compiled
+
+SMALL_GRIDS = {
+    "logistic_regression": {"C": [0.1, 1.0]},
+    "random_forest": {"n_estimators": [10], "max_depth": [3]},
+    "gradient_boosting": {"n_estimators": [10], "learning_rate": [0.1], "max_depth": [2]},
+}
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def small_grids(monkeypatch):
+    monkeypatch.setattr(training, "PARAM_GRIDS", SMALL_GRIDS)
+
+
+@pytest.fixture
+def trained(tmp_path, small_grids):
+    """One search run into a temporary models and cache directory"""
+    models_dir = str(tmp_path / "models")
+    cache_dir = str(tmp_path / "cache")
+    report = training.run(
+        models_dir=models_dir, cache_dir=cache_dir, snapshot_dir=cache_dir, n_jobs=1, cv_folds=3
+    )
+    return report, models_dir, cache_dir
+
+
+# ============================================================================
+# Dataset and building blocks
+# ============================================================================
+
+class TestBuildingBlocks:
+    def test_load_dataset(self):
+        X, y = training.load_dataset(snapshot_dir=None)
+        assert X.shape == (569, 30)
+        assert set(y.unique()) == {0, 1}
+        assert "radius_mean" in X.columns
+
+    def test_cv_splits_are_stratified_and_disjoint(self):
+        _, y = training.load_dataset(snapshot_dir=None)
+        y = y.to_numpy()
+        splits = training.cv_splits(y, 5, 42)
+        assert len(splits) == 5
+        test_rows = np.concatenate([test for _, test in splits])
+        assert sorted(test_rows) == list(range(len(y)))
+        for train, test in splits:
+            assert not set(train) & set(test)
+            assert abs(y[test].mean() - y.mean()) < 0.05
+
+    def test_unknown_model(self):
+        with pytest.raises(ValueError):
+            training.build_pipeline("svm", {})
+
+    def test_stage_timer_accumulates(self):
+        timer = training.StageTimer()
+        with timer.stage("fit"):
+            pass
+        with timer.stage("fit"):
+            pass
+        assert list(timer.stages) == ["fit"]
+        assert timer.stages["fit"] >= 0
+
+
+# ============================================================================
+# Running statistics
+# ============================================================================
+
+class TestRunningStats:
+    def test_batches_match_whole_frame(self):
+        X, _ = training.load_dataset(snapshot_dir=None)
+        stats = training.RunningStats(X.columns)
+        for batch in np.split(X.to_numpy(), [1, 200, 201]):
+            stats.update(batch)
+        assert stats.count == len(X)
+        np.testing.assert_allclose(stats.mean, X.mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(stats.std, X.std().to_numpy(), rtol=1e-10)
+        np.testing.assert_array_equal(stats.min, X.min().to_numpy())
+        np.testing.assert_array_equal(stats.max, X.max().to_numpy())
+
+    def test_stable_with_large_offset(self):
+        values = 1e9 + np.array([[4.0], [7.0], [13.0], [16.0]])
+        stats = training.RunningStats(["x"]).update(values[:2]).update(values[2:])
+        assert stats.feature_stats()["x"]["std"] == pytest.approx(np.std(values, ddof=1))
+
+    def test_empty_and_single_row(self):
+        stats = training.RunningStats(["a", "b"]).update(np.empty((0, 2)))
+        assert stats.count == 0
+        stats.update([[1.0, 2.0]])
+        assert stats.feature_stats()["b"] == {"min": 2.0, "max": 2.0, "mean": 2.0, "std": 0.0}
+
+
+# ============================================================================
+# Full runs
+# ============================================================================
+
+class TestRun:
+    def test_writes_servable_artifacts(self, trained):
+        _, models_dir, _ = trained
+        X, _ = training.load_dataset(snapshot_dir=None)
+        for model_name in MODEL_NAMES:
+            pipeline = joblib.load(os.path.join(artifacts.resolve(models_dir)[1], f"{model_name}.pkl"))
+            compiled = load_compiled(os.path.join(artifacts.resolve(models_dir)[1], model_name + COMPILED_SUFFIX))
+            rows = X.to_numpy()[:20]
+            np.testing.assert_allclose(
+                compiled.predict_proba(rows), pipeline.predict_proba(X.iloc[:20]), atol=1e-6
+            )
+
+        metadata = joblib.load(os.path.join(artifacts.resolve(models_dir)[1], "metadata.pkl"))
+        assert metadata["n_features"] == 30
+        assert len(metadata["top_features"]) == 10
+        assert metadata["feature_labels"]["radius_mean"] == "Average Radius"
+
+        state = training.load_state(models_dir)
+        assert state["stats"].count == len(X)
+        assert state["n_train_rows"] == 455
+        assert state["source"]["offset"] == os.path.getsize(training.DEFAULT_DATA_PATH)
+        assert state["estimators_per_row"]["random_forest"] == pytest.approx(10 / 455)
+
+    def test_report_selects_best_candidate(self, trained):
+        report, models_dir, _ = trained
+        with open(os.path.join(artifacts.resolve(models_dir)[1], "training_report.json")) as report_file:
+            saved = json.load(report_file)
+        # The version is assigned after the report is sealed into it.
+        assert saved == json.loads(json.dumps({k: v for k, v in report.items() if k != "version"}))
+        manifest = artifacts.verify(artifacts.version_path(models_dir, report["version"]))
+        assert manifest["metrics"]["models"]["logistic_regression"]["test_accuracy"] == (
+            report["models"]["logistic_regression"]["test_accuracy"]
+        )
+
+        lr = report["models"]["logistic_regression"]
+        assert len(lr["candidates"]) == 2
+        assert lr["cv_score"] == max(c["cv_score"] for c in lr["candidates"])
+        assert lr["params"] == lr["candidates"][0]["params"]
+        assert set(report["stages"]) == {"load", "cv_splits", "search", "refit", "evaluate", "export"}
+        assert report["cache_hits"] == 0
+
+    def test_rerun_is_served_from_cache(self, trained):
+        report, models_dir, cache_dir = trained
+        rerun = training.run(
+            models_dir=models_dir, cache_dir=cache_dir, snapshot_dir=cache_dir, n_jobs=1, cv_folds=3
+        )
+        assert rerun["cache_hits"] == 4 * 3
+        assert artifacts.current_version(models_dir) == rerun["version"]
+        for model_name in MODEL_NAMES:
+            assert rerun["models"][model_name]["params"] == report["models"][model_name]["params"]
+            assert rerun["models"][model_name]["test_accuracy"] == report["models"][model_name]["test_accuracy"]
+
+    def test_new_candidate_reuses_cached_folds(self, trained, monkeypatch):
+        _, models_dir, cache_dir = trained
+        grids = dict(SMALL_GRIDS, logistic_regression={"C": [0.1, 1.0, 10.0]})
+        monkeypatch.setattr(training, "PARAM_GRIDS", grids)
+        rerun = training.run(
+            models_dir=models_dir, cache_dir=cache_dir, snapshot_dir=cache_dir, n_jobs=1, cv_folds=3
+        )
+        assert rerun["cache_hits"] == 4 * 3
+
+    def test_no_search_uses_default_params(self, tmp_path):
+        report = training.run(
+            models_dir=str(tmp_path / "models"), cache_dir=str(tmp_path / "cache"),
+            snapshot_dir=str(tmp_path / "cache"), n_jobs=1, search_params=False, model_names=["logistic_regression"],
+        )
+        result = report["models"]["logistic_regression"]
+        assert result["params"] == training.DEFAULT_PARAMS["logistic_regression"]
+        assert "cv_score" not in result
+        assert result["test_accuracy"] > 0.9
+        assert "search" not in report["stages"]
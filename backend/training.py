@@ -0,0 +1,429 @@
+"""
+Training pipeline for the served models.
+
+run() loads the dataset through ingest.load(), searches hyperparameters with
+stratified cross-validation, refits the best configuration of every model on
+the training split, and publishes the pickles, compiled bundles and metadata
+that app.py serves as a new artifact version (see artifacts.py).
+
+Every (model, candidate, fold) fit of the search is an independent task. All
+of them, across all models, go to one joblib process pool, so the search uses
+every core instead of fitting one model after another. Through joblib.Memory,
+the CV splits, each fold's fitted StandardScaler and every fold score and
+final fit are cached on disk. A rerun on unchanged data and grids skips
+straight to export, and adding a candidate only fits the new candidate. Wall
+time per stage is printed and saved to training_report.json.
+
+A run also saves training_state.pkl (running feature statistics and how far
+the CSV was read), from which incremental.update() folds in appended rows.
+"""
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+import artifacts
+import ingest
+from features import FEATURE_LABELS
+from inference import COMPILED_SUFFIX, MODEL_NAMES, export_pipeline, save_compiled
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.path.join(BACKEND_DIR, "data", "breast_cancer_wisconsin.csv")
+DEFAULT_MODELS_DIR = os.path.join(BACKEND_DIR, "models")
+DEFAULT_CACHE_DIR = os.path.join(BACKEND_DIR, ".training_cache")
+STATE_FILENAME = "training_state.pkl"
+REPORT_FILENAME = "training_report.json"
+RANDOM_STATE = 42
+# Bytes before the last-read offset hashed to detect a rewritten CSV.
+TAIL_BYTES = 4096
+
+# The hyperparameters the models shipped with; used as-is without a search.
+DEFAULT_PARAMS = {
+    "logistic_regression": {"C": 1.0},
+    "random_forest": {"n_estimators": 100, "max_depth": 10},
+    "gradient_boosting": {"n_estimators": 100, "learning_rate": 0.1, "max_depth": 3},
+}
+
+# Kept small and bounded in depth/size: the served models must stay cheap to
+# score and to explain (see explain.TABLE_MAX_DEPTH).
+PARAM_GRIDS = {
+    "logistic_regression": {"C": [0.01, 0.1, 1.0, 10.0, 100.0]},
+    "random_forest": {
+        "n_estimators": [100],
+        "max_depth": [6, 10],
+        "min_samples_leaf": [1, 3],
+        "max_features": ["sqrt", 0.5],
+    },
+    "gradient_boosting": {
+        "n_estimators": [100, 200],
+        "learning_rate": [0.05, 0.1],
+        "max_depth": [2, 3],
+    },
+}
+
+
+class StageTimer:
+    """Accumulates wall time per named training stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def print_report(self):
+        total = sum(self.stages.values())
+        print(f"\n{'stage':<12}{'seconds':>10}{'share':>8}")
+        for name, seconds in self.stages.items():
+            print(f"{name:<12}{seconds:>10.2f}{seconds / total:>8.0%}")
+        print(f"{'total':<12}{total:>10.2f}")
+
+
+def build_pipeline(model_name, params, memory=None):
+    """Return an unfitted pipeline for a model with the given hyperparameters.
+
+    ``memory`` caches the fitted StandardScaler of the linear pipeline, so
+    candidates that differ only in C reuse each fold's scaler.
+    """
+    if model_name == "logistic_regression":
+        return Pipeline(
+            [
+                ("scaler", StandardScaler()),
+                ("classifier", LogisticRegression(max_iter=1000, random_state=RANDOM_STATE, **params)),
+            ],
+            memory=memory,
+        )
+    if model_name == "random_forest":
+        classifier = RandomForestClassifier(random_state=RANDOM_STATE, **params)
+    elif model_name == "gradient_boosting":
+        classifier = GradientBoostingClassifier(random_state=RANDOM_STATE, **params)
+    else:
+        raise ValueError(f"Unknown model: {model_name}")
+    return Pipeline([("classifier", classifier)])
+
+
+def load_dataset(csv_path=DEFAULT_DATA_PATH, snapshot_dir=ingest.DEFAULT_SNAPSHOT_DIR):
+    """Return the CSV's training features and 0/1 target (see ingest.load)."""
+    return ingest.load(csv_path, snapshot_dir).frame()
+
+
+def tail_digest(csv_file, offset):
+    """SHA-256 of the TAIL_BYTES of an open binary file that end at ``offset``."""
+    start = max(0, offset - TAIL_BYTES)
+    csv_file.seek(start)
+    return hashlib.sha256(csv_file.read(offset - start)).hexdigest()
+
+
+def source_position(csv_path):
+    """Where a read of the CSV ended, so later updates can read only new rows."""
+    with open(csv_path, "rb") as csv_file:
+        offset = csv_file.seek(0, os.SEEK_END)
+        return {"offset": offset, "tail_sha256": tail_digest(csv_file, offset)}
+
+
+class RunningStats:
+    """Per-feature count, mean, squared-deviation sum (M2), min and max.
+
+    update() merges a batch with the pairwise form of Welford's algorithm
+    (Chan et al.), so statistics over the whole history follow from each
+    appended batch alone, without the catastrophic cancellation of
+    sum-of-squares formulas.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.count = 0
+        self.mean = np.zeros(len(self.columns))
+        self.m2 = np.zeros(len(self.columns))
+        self.min = np.full(len(self.columns), np.inf)
+        self.max = np.full(len(self.columns), -np.inf)
+
+    def update(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if not len(X):
+            return self
+        count = len(X)
+        mean = X.mean(axis=0)
+        m2 = ((X - mean) ** 2).sum(axis=0)
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta**2 * (self.count * count / total)
+        self.count = total
+        self.min = np.minimum(self.min, X.min(axis=0))
+        self.max = np.maximum(self.max, X.max(axis=0))
+        return self
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1), as pandas computes it."""
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    def feature_stats(self):
+        return {
+            column: {
+                "min": float(self.min[index]),
+                "max": float(self.max[index]),
+                "mean": float(self.mean[index]),
+                "std": float(self.std[index]),
+            }
+            for index, column in enumerate(self.columns)
+        }
+
+
+def cv_splits(y, n_splits, random_state):
+    """Stratified (train, test) index pairs for cross-validation."""
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(folds.split(np.zeros(len(y)), y))
+
+
+def fit_and_score(model_name, params, X, y, train_index, test_index, cache_dir=None):
+    """Fit one candidate on one fold; return (accuracy, fit seconds)."""
+    memory = Memory(os.path.join(cache_dir, "scalers"), verbose=0) if cache_dir else None
+    pipeline = build_pipeline(model_name, params, memory)
+    start = time.perf_counter()
+    pipeline.fit(X.iloc[train_index], y.iloc[train_index])
+    fit_seconds = time.perf_counter() - start
+    score = accuracy_score(y.iloc[test_index], pipeline.predict(X.iloc[test_index]))
+    return score, fit_seconds
+
+
+def fit_final(model_name, params, X, y):
+    """Fit the selected configuration on the whole training split."""
+    return build_pipeline(model_name, params).fit(X, y)
+
+
+def search(memory, X, y, splits, grids, n_jobs):
+    """Cross-validate every candidate of every model on one process pool.
+
+    Returns {model: {"params", "cv_score", "cv_std", "candidates"}} and the
+    number of fold fits served from the cache.
+    """
+    cached_fit = memory.cache(fit_and_score, ignore=["cache_dir"])
+    tasks = [
+        (model_name, params, fold)
+        for model_name, grid in grids.items()
+        for params in ParameterGrid(grid)
+        for fold in range(len(splits))
+    ]
+    cache_hits = sum(
+        cached_fit.check_call_in_cache(model_name, params, X, y, *splits[fold])
+        for model_name, params, fold in tasks
+    )
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(cached_fit)(model_name, params, X, y, *splits[fold], cache_dir=memory.location)
+        for model_name, params, fold in tasks
+    )
+
+    scores = {}
+    for (model_name, params, _), (score, fit_seconds) in zip(tasks, results):
+        key = json.dumps(params, sort_keys=True)
+        entry = scores.setdefault(model_name, {}).setdefault(
+            key, {"params": params, "scores": [], "fit_seconds": 0.0}
+        )
+        entry["scores"].append(score)
+        entry["fit_seconds"] += fit_seconds
+
+    best = {}
+    for model_name, candidates in scores.items():
+        ranked = sorted(
+            candidates.values(), key=lambda entry: np.mean(entry["scores"]), reverse=True
+        )
+        best[model_name] = {
+            "params": ranked[0]["params"],
+            "cv_score": float(np.mean(ranked[0]["scores"])),
+            "cv_std": float(np.std(ranked[0]["scores"])),
+            "candidates": [
+                {
+                    "params": entry["params"],
+                    "cv_score": float(np.mean(entry["scores"])),
+                    "fit_seconds": round(entry["fit_seconds"], 3),
+                }
+                for entry in ranked
+            ],
+        }
+    return best, cache_hits
+
+
+def build_metadata(feature_names, coef, class_counts):
+    """Metadata served by /api/metadata; top features rank |LR coefficient|."""
+    top_features = (
+        pd.Series(np.abs(coef), index=feature_names).sort_values(ascending=False).head(10).index.tolist()
+    )
+    benign, malignant = (int(count) for count in class_counts)
+    return {
+        "feature_names": list(feature_names),
+        "top_features": top_features,
+        "feature_labels": FEATURE_LABELS,
+        "target_mapping": {"B": 0, "M": 1},
+        "target_names": ["benign", "malignant"],
+        "n_features": len(feature_names),
+        "n_samples": benign + malignant,
+        "class_distribution": {"benign": benign, "malignant": malignant},
+    }
+
+
+def save_artifacts(models_dir, pipelines, feature_stats, metadata):
+    """Write the served artifacts into a (staging) version directory."""
+    os.makedirs(models_dir, exist_ok=True)
+    for model_name, pipeline in pipelines.items():
+        joblib.dump(pipeline, os.path.join(models_dir, f"{model_name}.pkl"))
+        save_compiled(
+            os.path.join(models_dir, model_name + COMPILED_SUFFIX), export_pipeline(pipeline)
+        )
+        print(f"Saved: {model_name}.pkl and {model_name}{COMPILED_SUFFIX}")
+
+    joblib.dump(feature_stats, os.path.join(models_dir, "feature_stats.pkl"))
+    joblib.dump(metadata, os.path.join(models_dir, "metadata.pkl"))
+    joblib.dump(metadata["top_features"], os.path.join(models_dir, "top_features.pkl"))
+    print("Saved: feature_stats.pkl, metadata.pkl, top_features.pkl")
+
+
+def save_state(models_dir, state):
+    """Persist what incremental.update() needs to continue from this run."""
+    joblib.dump(state, os.path.join(models_dir, STATE_FILENAME))
+
+
+def load_state(models_dir):
+    """Return the state saved with the current version of models_dir, if any."""
+    path = os.path.join(artifacts.resolve(models_dir)[1], STATE_FILENAME)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def save_report(models_dir, report):
+    with open(os.path.join(models_dir, REPORT_FILENAME), "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def publish(models_dir, staging, report):
+    """Save the report with the staged artifacts and publish them as a new version."""
+    save_report(staging, report)
+    metrics = {
+        "mode": report["mode"],
+        "models": {
+            name: {key: value for key, value in result.items() if key != "candidates"}
+            for name, result in report["models"].items()
+        },
+    }
+    report["version"] = artifacts.publish(models_dir, staging, metrics)
+    print(f"Published model version {report['version']}")
+    return report
+
+
+def run(
+    csv_path=DEFAULT_DATA_PATH,
+    models_dir=DEFAULT_MODELS_DIR,
+    cache_dir=DEFAULT_CACHE_DIR,
+    snapshot_dir=ingest.DEFAULT_SNAPSHOT_DIR,
+    n_jobs=-1,
+    search_params=True,
+    cv_folds=5,
+    model_names=MODEL_NAMES,
+):
+    """Train, evaluate and export every model; return the training report."""
+    timer = StageTimer()
+    memory = Memory(cache_dir, verbose=0)
+
+    with timer.stage("load"):
+        source = source_position(csv_path)
+        X, y = load_dataset(csv_path, snapshot_dir)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=RANDOM_STATE, stratify=y
+        )
+    print(f"Loaded {len(X)} rows x {X.shape[1]} features ({len(X_train)} train / {len(X_test)} test)")
+
+    if search_params:
+        with timer.stage("cv_splits"):
+            splits = memory.cache(cv_splits)(y_train.to_numpy(), cv_folds, RANDOM_STATE)
+        grids = {name: PARAM_GRIDS[name] for name in model_names}
+        n_fits = sum(len(ParameterGrid(grid)) for grid in grids.values()) * cv_folds
+        print(f"Searching {n_fits} fold fits on {joblib.effective_n_jobs(n_jobs)} processes...")
+        with timer.stage("search"):
+            selected, cache_hits = search(memory, X_train, y_train, splits, grids, n_jobs)
+        print(f"  {cache_hits} of {n_fits} fold fits served from cache")
+    else:
+        selected = {name: {"params": DEFAULT_PARAMS[name]} for name in model_names}
+        cache_hits = 0
+
+    with timer.stage("refit"):
+        cached_final = memory.cache(fit_final)
+        fitted = Parallel(n_jobs=n_jobs)(
+            delayed(cached_final)(name, selected[name]["params"], X_train, y_train)
+            for name in model_names
+        )
+        pipelines = dict(zip(model_names, fitted))
+
+    report = {"mode": "full", "models": {}}
+    with timer.stage("evaluate"):
+        for model_name, pipeline in pipelines.items():
+            report["models"][model_name] = {
+                **selected[model_name],
+                "train_accuracy": accuracy_score(y_train, pipeline.predict(X_train)),
+                "test_accuracy": accuracy_score(y_test, pipeline.predict(X_test)),
+            }
+
+    with timer.stage("export"):
+        staging = artifacts.staging_dir(models_dir)
+        if "logistic_regression" in pipelines:
+            coef = pipelines["logistic_regression"].named_steps["classifier"].coef_[0]
+        else:
+            coef = build_pipeline("logistic_regression", DEFAULT_PARAMS["logistic_regression"]).fit(
+                X_train, y_train
+            ).named_steps["classifier"].coef_[0]
+        stats = RunningStats(X.columns).update(X.to_numpy())
+        class_counts = np.bincount(y, minlength=2)
+        save_artifacts(
+            staging, pipelines, stats.feature_stats(), build_metadata(X.columns, coef, class_counts)
+        )
+        save_state(staging, {
+            "source": source,
+            "stats": stats,
+            "class_counts": class_counts,
+            "n_train_rows": len(X_train),
+            # Ensemble size per training row, kept as rows are appended.
+            "estimators_per_row": {
+                name: pipeline.named_steps["classifier"].n_estimators / len(X_train)
+                for name, pipeline in pipelines.items()
+                if hasattr(pipeline.named_steps["classifier"], "n_estimators")
+            },
+        })
+
+    for model_name, result in report["models"].items():
+        cv = f", CV {result['cv_score']:.4f} ± {result['cv_std']:.4f}" if "cv_score" in result else ""
+        print(
+            f"\n{model_name}: {result['params']}{cv}\n"
+            f"  Train Accuracy: {result['train_accuracy']:.4f}  "
+            f"Test Accuracy: {result['test_accuracy']:.4f}"
+        )
+    timer.print_report()
+
+    report.update(
+        stages={name: round(seconds, 3) for name, seconds in timer.stages.items()},
+        n_jobs=joblib.effective_n_jobs(n_jobs),
+        cv_folds=cv_folds if search_params else None,
+        cache_hits=cache_hits,
+    )
+    return publish(models_dir, staging, report)
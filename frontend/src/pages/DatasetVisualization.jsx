@@ -5,34 +5,69 @@ import './DatasetVisualization.css'
 
 function DatasetVisualization() {
   const [metadata, setMetadata] = useState(null)
-  const [dataset, setDataset] = useState(null)
+  // Feature name -> column values, for the features fetched so far.
+  const [columns, setColumns] = useState({})
+  const [target, setTarget] = useState(null)
   const [selectedFeatures, setSelectedFeatures] = useState([])
   const [xFeature, setXFeature] = useState('')
   const [yFeature, setYFeature] = useState('')
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    const fetchData = async () => {
+    const fetchMetadata = async () => {
       try {
-        const [meta, data] = await Promise.all([
-          getMetadata(),
-          getDataset()
-        ])
+        const meta = await getMetadata()
         setMetadata(meta)
-        setDataset(data)
         setSelectedFeatures(meta.feature_names.slice(0, 6))
         setXFeature(meta.feature_names[0])
         setYFeature(meta.feature_names[1])
       } catch (error) {
         console.error('Error fetching data:', error)
-      } finally {
         setLoading(false)
       }
     }
-    fetchData()
+    fetchMetadata()
   }, [])
 
-  if (loading || !metadata || !dataset) {
+  // Only the columns on screen are downloaded; newly selected ones are fetched
+  // and merged into those already held.
+  const missingFeatures = [...new Set([...selectedFeatures, xFeature, yFeature])]
+    .filter(feature => feature && !(feature in columns))
+
+  useEffect(() => {
+    if (missingFeatures.length === 0) {
+      return
+    }
+    let cancelled = false
+    const fetchColumns = async () => {
+      try {
+        const data = await getDataset({ features: missingFeatures })
+        if (cancelled) {
+          return
+        }
+        setColumns(previous => {
+          const next = { ...previous }
+          missingFeatures.forEach((feature, i) => {
+            next[feature] = data.data.map(row => row[i])
+          })
+          return next
+        })
+        setTarget(data.target)
+      } catch (error) {
+        console.error('Error fetching data:', error)
+      } finally {
+        if (!cancelled) {
+          setLoading(false)
+        }
+      }
+    }
+    fetchColumns()
+    return () => {
+      cancelled = true
+    }
+  }, [missingFeatures.join(',')])
+
+  if (loading || !metadata || !target) {
     return <div className="page-container">Loading...</div>
   }
 
@@ -42,14 +77,12 @@ function DatasetVisualization() {
   ]
 
   // Prepare histogram data
-  const prepareHistogramData = (featureIndex) => {
+  const prepareHistogramData = (feature) => {
     const benignData = []
     const malignantData = []
     
-    dataset.data.forEach((row, idx) => {
-      const value = row[featureIndex]
-      const target = dataset.target[idx]
-      if (target === 1) {
+    columns[feature].forEach((value, idx) => {
+      if (target[idx] === 1) {
         benignData.push(value)
       } else {
         malignantData.push(value)
@@ -60,15 +93,13 @@ function DatasetVisualization() {
   }
 
   // Prepare scatter plot data
-  const scatterData = dataset.data.map((row, idx) => {
-    const xIdx = metadata.feature_names.indexOf(xFeature)
-    const yIdx = metadata.feature_names.indexOf(yFeature)
-    return {
-      x: row[xIdx],
-      y: row[yIdx],
-      target: dataset.target[idx]
-    }
-  })
+  const scatterData = columns[xFeature] && columns[yFeature]
+    ? target.map((label, idx) => ({
+      x: columns[xFeature][idx],
+      y: columns[yFeature][idx],
+      target: label
+    }))
+    : []
 
   const benignScatter = scatterData.filter(d => d.target === 1)
   const malignantScatter = scatterData.filter(d => d.target === 0)
@@ -142,9 +173,8 @@ function DatasetVisualization() {
 
       {selectedFeatures.length > 0 && (
         <div className="histogram-grid">
-          {selectedFeatures.map(feature => {
-            const featureIndex = metadata.feature_names.indexOf(feature)
-            const histData = prepareHistogramData(featureIndex)
+          {selectedFeatures.filter(feature => feature in columns).map(feature => {
+            const histData = prepareHistogramData(feature)
             
             // Create bins for histogram
             const allValues = [...histData.benign, ...histData.malignant]
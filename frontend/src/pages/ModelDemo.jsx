@@ -99,7 +99,21 @@ function ModelDemo() {
 
   const predictionBoxClass = isUncertain ? 'uncertain' : (predictionClass === 'Benign' ? 'benign' : 'malignant')
 
-  const featureImportanceData = prediction?.feature_importance
+  // Per-prediction attributions explain this input; fall back to the model's
+  // global importances when the API does not return them.
+  const attributions = prediction?.attributions
+  const showAttributions = Boolean(attributions?.values)
+  const signedValues = showAttributions || selectedModel === 'logistic_regression'
+
+  const featureImportanceData = showAttributions
+    ? Object.entries(attributions.values)
+        .map(([feature, value]) => ({
+          feature: getFeatureLabel(feature),
+          coefficient: value,
+        }))
+        .sort((a, b) => Math.abs(b.coefficient) - Math.abs(a.coefficient))
+        .slice(0, 15)
+    : prediction?.feature_importance
     ? Object.entries(prediction.feature_importance)
         .map(([feature, value]) => ({
           feature: getFeatureLabel(feature),
@@ -256,7 +270,22 @@ function ModelDemo() {
             <div className="section-header">
               <h2 className="section-title">📊 Feature Influence Analysis</h2>
               <div className="legend-box">
-                {selectedModel === 'logistic_regression' ? (
+                {showAttributions ? (
+                  <>
+                    <div className="legend-item">
+                      <div className="legend-color positive"></div>
+                      <span><strong>Positive contributions</strong> → pushed this case toward <strong>Malignant</strong></span>
+                    </div>
+                    <div className="legend-item">
+                      <div className="legend-color negative"></div>
+                      <span><strong>Negative contributions</strong> → pushed this case toward <strong>Benign</strong></span>
+                    </div>
+                    <div className="legend-note">
+                      Contributions to this prediction ({attributions.output === 'probability' ? 'malignant probability' : 'log-odds'})
+                      relative to the average case; they add up to the model output.
+                    </div>
+                  </>
+                ) : selectedModel === 'logistic_regression' ? (
                   <>
                     <div className="legend-item">
                       <div className="legend-color positive"></div>
@@ -288,7 +317,9 @@ function ModelDemo() {
                     stroke="#6c757d"
                     tick={{ fill: '#6c757d' }}
                     label={{ 
-                      value: selectedModel === 'logistic_regression' ? 'Coefficient Value' : 'Importance Score', 
+                      value: showAttributions
+                        ? 'Contribution to This Prediction'
+                        : selectedModel === 'logistic_regression' ? 'Coefficient Value' : 'Importance Score', 
                       position: 'insideBottom', 
                       offset: -5,
                       style: { fill: '#6c757d', fontSize: 14 }
@@ -315,7 +346,7 @@ function ModelDemo() {
                   >
                     {featureImportanceData.map((entry, index) => {
                       let fillColor = '#667eea'
-                      if (selectedModel === 'logistic_regression') {
+                      if (signedValues) {
                         fillColor = entry.coefficient > 0 ? '#dc3545' : '#28a745'
                       }
                       return (
@@ -56,7 +56,10 @@ export const predictAll = async (features) => {
     const response = await api.post('/predict-all', {
       features,
     })
-    return response.data
+    // Models that timed out on the server come back as { error, timed_out }; show the rest
+    return Object.fromEntries(
+      Object.entries(response.data).filter(([, result]) => !result.error)
+    )
   } catch (error) {
     if (error.code === 'ECONNREFUSED' || error.message.includes('Network Error')) {
       throw new Error('Cannot connect to backend server. Make sure Flask backend is running on http://localhost:5000')
@@ -65,9 +68,14 @@ export const predictAll = async (features) => {
   }
 }
 
-export const getDataset = async () => {
+// params: { features: ['mean radius', ...], offset, limit, sample, seed }
+export const getDataset = async (params = {}) => {
   try {
-    const response = await api.get('/dataset')
+    const query = { ...params }
+    if (Array.isArray(query.features)) {
+      query.features = query.features.join(',')
+    }
+    const response = await api.get('/dataset', { params: query })
     return response.data
   } catch (error) {
     if (error.code === 'ECONNREFUSED' || error.message.includes('Network Error')) {